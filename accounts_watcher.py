@@ -0,0 +1,97 @@
+import os
+import json
+import hashlib
+import logging
+from typing import NamedTuple, List
+
+
+class AccountsDiff(NamedTuple):
+    """Änderungen an accounts.json seit dem letzten erfolgreichen Laden"""
+    accounts: List[dict]       # vollständige, validierte Account-Liste
+    added: List[dict]
+    removed: List[str]         # Usernames
+    modified: List[dict]       # z.B. geändertes Passwort oder Name
+    initial: bool              # erstes Laden - kein Vorzustand vorhanden
+
+
+class AccountsWatcher:
+    """Lädt accounts.json nur bei echten Änderungen (mtime/Größe, dann Inhalts-Hash) und liefert einen Diff"""
+
+    def __init__(self, path):
+        self.path = path
+        self.accounts = []
+        self._by_username = {}
+        self._signature = None
+        self._hash = None
+        self._loaded = False
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def has_changed(self):
+        """Günstiger Check ohne Lesen: hat sich mtime/Größe seit dem letzten Poll geändert?"""
+        return self._stat_signature() != self._signature
+
+    def poll(self):
+        """AccountsDiff falls sich der Inhalt geändert hat, sonst None"""
+        signature = self._stat_signature()
+        if signature is None or signature == self._signature:
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logging.warning(f"⚠️ '{self.path}' konnte nicht gelesen werden: {e}")
+            return None
+
+        # Datei wird gerade geschrieben - beim nächsten Poll erneut versuchen
+        if self._stat_signature() != signature:
+            logging.debug(f"'{self.path}' ändert sich noch - wird später geladen")
+            return None
+        self._signature = signature
+
+        content_hash = hashlib.sha256(data).hexdigest()
+        if content_hash == self._hash:
+            return None
+        self._hash = content_hash
+
+        try:
+            accounts = self._validate(json.loads(data))
+        except ValueError as e:
+            # Bisherige Accounts bleiben aktiv bis eine gültige Version vorliegt
+            logging.error(f"❌ '{self.path}' ist ungültig und wird ignoriert: {e}")
+            return None
+
+        return self._apply(accounts)
+
+    def _validate(self, data):
+        if not isinstance(data, list):
+            raise ValueError("Erwartet wird eine Liste von Accounts")
+
+        accounts = {}
+        for i, account in enumerate(data):
+            if not isinstance(account, dict) or not isinstance(account.get('username'), str) or not isinstance(account.get('password'), str):
+                logging.warning(f"⚠️ Eintrag {i + 1} in '{self.path}' ohne gültigen username/password - übersprungen")
+                continue
+            if account['username'] in accounts:
+                logging.warning(f"⚠️ Account '{account['username']}' mehrfach in '{self.path}' - letzter Eintrag gilt")
+            accounts[account['username']] = account
+        return list(accounts.values())
+
+    def _apply(self, accounts):
+        by_username = {account['username']: account for account in accounts}
+        added = [account for username, account in by_username.items() if username not in self._by_username]
+        removed = [username for username in self._by_username if username not in by_username]
+        modified = [account for username, account in by_username.items()
+                    if username in self._by_username and self._by_username[username] != account]
+
+        diff = AccountsDiff(accounts, added, removed, modified, initial=not self._loaded)
+        self.accounts = accounts
+        self._by_username = by_username
+        self._loaded = True
+        return diff
@@ -0,0 +1,110 @@
+"""Micro-Benchmark der Coins-Strategien von get_current_coins auf gespeicherten Fixtures
+
+Ohne Browser werden die Strategien auf dem Fixture-HTML nachgebildet: gemessen wird die
+CPU-Zeit auf Python-Seite, WebDriver-Round-Trips und übertragene Bytes werden gezählt und
+mit --rtt-ms hochgerechnet. Mit --driver laufen die echten Strategie-Methoden des Bots
+gegen die Fixtures in Chrome (file://).
+
+    python benchmarks/bench_coins.py [--iterations 2000] [--rtt-ms 2.0] [--driver]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vote_parser import parse_coins, parse_red_span_coins, parse_coins_text, html_to_text, _RED_SPAN_RE
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+STRATEGIES = ('js', 'page_source', 'xpath', 'red_span', 'body_text')
+
+
+def time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - start) / iterations, result
+
+
+def offline_strategies(page_html):
+    """(Funktion, Round-Trips, übertragene Bytes) pro Strategie - Browser-Arbeit selbst ist nicht enthalten"""
+    body_text = html_to_text(page_html)
+    coins = parse_coins(page_html)
+    red_spans = len(_RED_SPAN_RE.findall(page_html)) or 1
+    return {
+        # execute_script liefert nur den Span-Text
+        'js': (lambda: int(str(coins)), 1, len(str(coins))),
+        # page_source überträgt das komplette HTML
+        'page_source': (lambda: parse_coins(page_html), 1, len(page_html.encode())),
+        # find_elements(XPATH) + .text
+        'xpath': (lambda: int(str(coins)), 2, len(str(coins))),
+        # find_elements(CSS) + .text pro rotem Span bis zum Treffer
+        'red_span': (lambda: parse_red_span_coins(page_html), 1 + red_spans, len(str(coins)) * red_spans),
+        # find_element(body) + .text überträgt den kompletten Seitentext
+        'body_text': (lambda: parse_coins_text(body_text), 2, len(body_text.encode())),
+    }
+
+
+def bench_fixture(path, iterations, rtt_ms):
+    with open(path, 'r', encoding='utf-8') as f:
+        page_html = f.read()
+
+    # Referenz: Span direkt hinter "Current Vote-Coins:"
+    expected = parse_coins(page_html)
+    results = {}
+    for strategy, (func, round_trips, transferred) in offline_strategies(page_html).items():
+        seconds, coins = time_per_call(func, iterations)
+        results[strategy] = {
+            'coins': coins,
+            'correct': coins == expected,
+            'cpu_ms': seconds * 1000,
+            'round_trips': round_trips,
+            'transferred_bytes': transferred,
+            'estimated_ms': seconds * 1000 + round_trips * rtt_ms,
+        }
+    return {'fixture': os.path.basename(path), 'strategies': results}
+
+
+def bench_driver(path, iterations):
+    """Echte Strategie-Methoden von AlturiVoteBot gegen die Fixture in Chrome"""
+    from vote_bot import AlturiVoteBot
+
+    bot = AlturiVoteBot(headless=True)
+    bot.driver = bot._create_driver()
+    try:
+        bot.driver.get('file://' + os.path.abspath(path))
+        results = {}
+        for strategy in STRATEGIES:
+            method = getattr(bot, f'_coins_via_{strategy}')
+            seconds, coins = time_per_call(method, iterations)
+            results[strategy] = {'coins': coins, 'ms': seconds * 1000}
+        return results
+    finally:
+        bot.driver.quit()
+        bot.driver = None
+        bot.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--rtt-ms', type=float, default=2.0, help='angenommene Latenz pro WebDriver-Kommando')
+    parser.add_argument('--driver', action='store_true', help='zusätzlich gegen echten Chrome messen')
+    args = parser.parse_args()
+
+    fixtures = sorted(os.path.join(FIXTURES, name) for name in os.listdir(FIXTURES) if name.endswith('.html'))
+    report = {'iterations': args.iterations, 'rtt_ms': args.rtt_ms, 'results': []}
+    for path in fixtures:
+        result = bench_fixture(path, args.iterations, args.rtt_ms)
+        if args.driver:
+            result['driver'] = bench_driver(path, max(1, args.iterations // 100))
+        report['results'].append(result)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Seitenaufrufe mit und ohne geschätzte Next-Vote Zeiten bei unzuverlässigem Parsing
+
+Simuliert N Accounts (eine Vote-Seite, 24h Abklingzeit) über mehrere Tage in virtueller Zeit
+mit minütlichem Durchlauf. Pro Seitenaufruf schlägt das Parsen der Next-Vote Zeit mit
+--parse-failure fehl, das erneute Lesen nach einem Vote mit --reread-failure; bei --broken
+Anteil der Accounts ist die Zeile dauerhaft nicht parsebar:
+
+  baseline   fehlende Zeit -> nichts gespeichert, Account ist im nächsten Durchlauf wieder fällig
+  estimate   fehlende Zeit -> CooldownPredictor-Schätzung (wie process_account)
+
+Ausgegeben werden Seitenaufrufe und Votes pro Account und Tag, die Verzögerung zwischen
+Fälligkeit und Vote sowie die vom Predictor hochgerechnete Einsparung im Vergleich zur
+gemessenen. Kein Browser, keine Mock-Seite - nur das Entscheidungsverhalten.
+
+    python benchmarks/bench_cooldown.py [--accounts 50] [--days 7] [--parse-failure 0.2] [--reread-failure 0.3] [--broken 0.1]
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cooldown_predictor import CooldownPredictor
+
+COOLDOWN = 24 * 3600
+TICK = 60
+SITE = 'TopG'
+
+
+def simulate(mode, args):
+    rng = random.Random(args.seed)
+    predictor = CooldownPredictor(recheck=args.recheck, poll_interval=TICK) if mode == 'estimate' else None
+    start = 1_700_000_000.0
+    # Tatsächliche Next-Vote Zeit pro Account (gestaffelt über den ersten Tag) und gespeicherte Zeit (None = sofort fällig)
+    true_next = {i: start + rng.uniform(0, COOLDOWN) for i in range(args.accounts)}
+    stored = {i: None for i in range(args.accounts)}
+    broken = set(rng.sample(range(args.accounts), int(args.accounts * args.broken)))
+    page_loads = votes = 0
+    delays = []
+
+    now = start
+    end = start + args.days * 86400
+    while now < end:
+        for account in range(args.accounts):
+            if stored[account] is not None and now < stored[account] + 60:
+                continue
+
+            page_loads += 1
+            username = f'user{account}'
+            observed = seen = None
+            voted_at = None
+            if account not in broken and rng.random() >= args.parse_failure:
+                seen = true_next[account]
+                if now >= true_next[account] + 60:
+                    # Vote erfolgreich - danach ist die neue Zeit nur mit reread_failure nicht lesbar
+                    delays.append(now - (true_next[account] + 60))
+                    votes += 1
+                    voted_at = now
+                    true_next[account] = now + COOLDOWN
+                    if rng.random() >= args.reread_failure:
+                        observed = true_next[account]
+                else:
+                    observed = true_next[account]
+
+            if predictor is not None:
+                if seen is not None:
+                    predictor.observe(username, SITE, seen)
+                if voted_at is not None:
+                    predictor.record_vote(username, SITE, voted_at, observed)
+                if observed is None:
+                    observed = predictor.estimate(username, SITE, now=now, voted_at=voted_at)
+            if observed is not None:
+                stored[account] = observed
+        now += TICK
+
+    account_days = args.accounts * args.days
+    result = {
+        'page_loads': page_loads,
+        'page_loads_per_account_day': page_loads / account_days,
+        'votes_per_account_day': votes / account_days,
+        'due_to_voted_p50_minutes': statistics.median(delays) / 60 if delays else None,
+        'due_to_voted_p95_minutes': statistics.quantiles(delays, n=20)[-1] / 60 if len(delays) >= 20 else None,
+    }
+    if predictor is not None:
+        result['predictor'] = predictor.stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--parse-failure', type=float, default=0.2)
+    parser.add_argument('--reread-failure', type=float, default=0.3)
+    parser.add_argument('--broken', type=float, default=0.1)
+    parser.add_argument('--recheck', type=float, default=120)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    results = {mode: simulate(mode, args) for mode in ('baseline', 'estimate')}
+    baseline, estimate = results['baseline'], results['estimate']
+    results['page_loads_saved'] = baseline['page_loads'] - estimate['page_loads']
+    results['page_loads_saved_ratio'] = 1 - estimate['page_loads'] / baseline['page_loads']
+    print(json.dumps({'accounts': args.accounts, 'days': args.days, 'parse_failure': args.parse_failure,
+                      'reread_failure': args.reread_failure, 'broken': args.broken, 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""End-to-End-Benchmark eines Vote-Zyklus gegen die lokale Mock-Seite (ohne Zugriff auf alturi.to)
+
+Startet mock_site mit N synthetischen Accounts, lässt AlturiVoteBot alle Accounts
+verarbeiten (Login, Vote-Tabelle, Vote + Confirm, Coins, Logout, Webhook) und gibt
+Latenz pro Phase, Zyklen pro Minute und Peak-RSS (Bot + Chrome) als JSON aus.
+Benötigt Chrome/Chromium + ChromeDriver wie der Bot selbst.
+
+    python benchmarks/bench_cycle.py [--accounts 5] [--passes 1] [--workers 1] [--latency-ms 50] [--failure-rate 0.05]
+
+Zeit- und Concurrency-Werte aus bot_config lassen sich mit --set überschreiben (mehrfach möglich),
+z.B. für Sweeps über Waits: --set confirm_wait=0.5 --set vote_state_timeout=2
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bot_config import parse_overrides, ConfigError
+from mock_site import MockSiteState, start_mock_site
+from driver_pool import process_tree_rss
+
+
+class RssSampler:
+    """Peak-RSS des Prozessbaums (Python + ChromeDriver + Chrome) in festem Intervall"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss(os.getpid()) or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args):
+    accounts = [{'username': f'bench{i:03d}', 'password': f'pw{i:03d}', 'name': f'Bench {i}'} for i in range(args.accounts)]
+    state = MockSiteState(
+        {account['username']: account['password'] for account in accounts},
+        sites=[f'Site{s}' for s in range(args.sites)],
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    server = start_mock_site(state)
+
+    workdir = tempfile.mkdtemp(prefix='votebot-bench-')
+    os.chdir(workdir)
+    with open('accounts.json', 'w') as f:
+        json.dump(accounts, f)
+
+    # Bot erst im Arbeitsverzeichnis anlegen - data/, sessions/ und vote_times.json liegen relativ zum CWD
+    from vote_bot import AlturiVoteBot
+
+    bot = AlturiVoteBot(
+        headless=True,
+        use_driver_pool=args.driver_pool,
+        max_workers=args.workers,
+        use_http_fast_path=args.http_fast_path,
+        base_url=server.base_url,
+        use_session_store=args.session_store,
+        lean_browser=args.lean_browser,
+        driver_rss_limit_mb=args.driver_rss_limit_mb,
+        webhook_url=f'{server.base_url}/webhook',
+    )
+    bot.apply_settings({'politeness_delay': args.politeness, 'account_pause': args.politeness, **args.settings})
+
+    passes = []
+    try:
+        with RssSampler() as sampler:
+            for _ in range(args.passes):
+                # Jeder Durchlauf beginnt mit allen Vote-Seiten fällig
+                state.reset_votes()
+                vote_times = {}
+                start = time.perf_counter()
+                processed, voted, skipped = bot.process_batch(accounts, vote_times)
+                elapsed = time.perf_counter() - start
+                passes.append({
+                    'seconds': elapsed,
+                    'processed': processed,
+                    'voted': voted,
+                    'skipped': skipped,
+                    'cycles_per_minute': len(accounts) / elapsed * 60 if elapsed else None,
+                })
+            if bot.webhook_notifier:
+                bot.webhook_notifier.flush()
+    finally:
+        bot.shutdown()
+        server.shutdown()
+        server.server_close()
+
+    total_seconds = sum(p['seconds'] for p in passes)
+    return {
+        'revision': git_revision(),
+        'config': vars(args),
+        'passes': passes,
+        'cycles_per_minute': len(accounts) * len(passes) / total_seconds * 60 if total_seconds else None,
+        'peak_rss_mb': sampler.peak / 1024 / 1024,
+        'peak_rss_per_account_mb': dict(bot.driver_watchdog.peaks),
+        'driver_watchdog': bot.driver_watchdog.stats(),
+        'phases': bot.metrics.phase_stats(),
+        'counters': bot.metrics.counters(),
+        'mock': {
+            'logins': state.logins,
+            'votes': state.votes,
+            'page_views': state.page_views,
+            'injected_failures': state.injected_failures,
+            'webhooks': len(state.webhooks),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=5)
+    parser.add_argument('--sites', type=int, default=2)
+    parser.add_argument('--passes', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Verzögerung pro Anfrage der Mock-Seite')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='zusätzliche zufällige Verzögerung (0..jitter)')
+    parser.add_argument('--failure-rate', type=float, default=0, help='Anteil der Anfragen mit HTTP 500')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--politeness', type=float, default=0, help='Abstand zwischen Session-Starts/Accounts (Bot-Standard: 5s)')
+    parser.add_argument('--driver-pool', action='store_true')
+    parser.add_argument('--session-store', action='store_true')
+    parser.add_argument('--http-fast-path', action='store_true')
+    parser.add_argument('--lean-browser', action='store_true')
+    parser.add_argument('--driver-rss-limit-mb', type=int, default=1024)
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=WERT',
+                        help='Zeit-/Concurrency-Wert aus bot_config (z.B. confirm_wait=0.5)')
+    parser.add_argument('--output', help='JSON-Report zusätzlich in diese Datei schreiben')
+    parser.add_argument('--verbose', action='store_true', help='Bot-Logs ausgeben')
+    args = parser.parse_args()
+    try:
+        args.settings = parse_overrides(args.set)
+    except ConfigError as e:
+        parser.error('; '.join(e.errors))
+
+    output = os.path.abspath(args.output) if args.output else None
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    else:
+        # Nur Fehler ausgeben - Logging soll die Messung nicht verfälschen
+        logging.disable(logging.WARNING)
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Vote-Ledger: Schreibrate, Größe auf Platte und Abfragezeit über Monate an Daten
+
+Schreibt synthetische Sessions (N Accounts, 2 Vote-Seiten, ein Vote pro Seite und Tag plus
+Checks ohne Vote) über --months Monate in ein temporäres Ledger und misst:
+
+  - Append-Rate über VoteLedger.append (inkl. Kompaktierung)
+  - Bytes pro Zeile in den Spalten-Segmenten vs. dieselben Zeilen als JSON-Zeilen
+  - summary/daily über den gesamten Zeitraum und die letzten 30 Tage (Median aus --repeat Läufen)
+  - zum Vergleich: dieselbe Auswertung per Vollscan über die JSON-Zeilen
+
+    python benchmarks/bench_ledger.py [--accounts 50] [--months 6] [--repeat 5]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vote_ledger import VoteLedger, LedgerRow, summarize, daily, VOTED, FAILED, CHECKED, ALL_SITES
+
+SITES = ('TopG', 'Gtop100')
+
+
+def generate_rows(accounts, months, seed):
+    rng = random.Random(seed)
+    end = time.time()
+    start = end - months * 30 * 86400
+    rows = []
+    coins = {f'user{i:03d}': 100 for i in range(accounts)}
+    for day in range(months * 30):
+        for username in coins:
+            started = start + day * 86400 + rng.uniform(0, 3600)
+            driver, auth, check = rng.uniform(1, 3), rng.uniform(1, 4), rng.uniform(2, 6)
+            for site in SITES:
+                voted = rng.random() < 0.97
+                before = coins[username]
+                coins[username] += 1 if voted else 0
+                rows.append(LedgerRow(started, started + 20, username, site, VOTED if voted else FAILED, before, coins[username],
+                                      driver, auth, check, rng.uniform(3, 8), rng.uniform(12, 30)))
+            # Einige Sessions ohne fälligen Vote (z.B. nach Fehlern)
+            if rng.random() < 0.3:
+                checked = started + rng.uniform(7200, 36000)
+                rows.append(LedgerRow(checked, checked + 8, username, ALL_SITES, CHECKED, None, None, driver, auth, check, None, 8.0))
+    rows.sort(key=lambda row: row.started)
+    return rows
+
+
+def jsonl_summary(path, since):
+    """Vergleich: Erfolgsquote und Coins pro Account per Vollscan über JSON-Zeilen"""
+    report = {}
+    with open(path, 'r') as f:
+        for line in f:
+            row = LedgerRow(*json.loads(line))
+            if since is not None and row.started < since:
+                continue
+            entry = report.setdefault(row.account, [0, 0, 0])
+            if row.outcome == VOTED:
+                entry[0] += 1
+                entry[2] += row.coins_after - row.coins_before
+            elif row.outcome == FAILED:
+                entry[1] += 1
+    return report
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--months', type=int, default=6)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.accounts, args.months, args.seed)
+    with tempfile.TemporaryDirectory(prefix='votebot-ledger-') as directory:
+        ledger = VoteLedger(os.path.join(directory, 'ledger'))
+        start = time.perf_counter()
+        for row in rows:
+            ledger.append(row)
+        ledger.close()
+        append_seconds = time.perf_counter() - start
+
+        segment_bytes = sum(os.path.getsize(path) for path in ledger.segment_paths())
+        jsonl_path = os.path.join(directory, 'rows.jsonl')
+        with open(jsonl_path, 'w') as f:
+            for row in rows:
+                f.write(json.dumps(list(row)) + '\n')
+        jsonl_bytes = os.path.getsize(jsonl_path)
+
+        last_30_days = time.time() - 30 * 86400
+        ledger_dir = ledger.directory
+        queries = {
+            'summary_all_ms': timed(lambda: summarize(ledger_dir), args.repeat),
+            'summary_30d_ms': timed(lambda: summarize(ledger_dir, since=last_30_days), args.repeat),
+            'summary_one_account_ms': timed(lambda: summarize(ledger_dir, account='user000'), args.repeat),
+            'daily_all_ms': timed(lambda: daily(ledger_dir), args.repeat),
+            'jsonl_scan_all_ms': timed(lambda: jsonl_summary(jsonl_path, None), args.repeat),
+            'jsonl_scan_30d_ms': timed(lambda: jsonl_summary(jsonl_path, last_30_days), args.repeat),
+        }
+        report = summarize(ledger_dir)
+
+    print(json.dumps({
+        'accounts': args.accounts,
+        'months': args.months,
+        'rows': len(rows),
+        'appends_per_second': len(rows) / append_seconds,
+        'segment_bytes_per_row': segment_bytes / len(rows),
+        'jsonl_bytes_per_row': jsonl_bytes / len(rows),
+        'queries': queries,
+        'sample': report.get('user000'),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
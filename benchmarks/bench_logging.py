@@ -0,0 +1,135 @@
+"""Logging-Overhead pro Durchlauf: alte Konfiguration vs. Queue-Pipeline
+
+Lässt AlturiVoteBot.run_cycle() mehrfach über N nicht fällige Accounts laufen (kein Browser)
+und misst pro Konfiguration die Zeit im aufrufenden Thread sowie geschriebene Zeilen/Bytes:
+
+  legacy      FileHandler + StreamHandler synchron, Root auf DEBUG, keine Drosselung (bisheriges Verhalten)
+  queue       QueueHandler/QueueListener, INFO, gedrosselte "noch nicht fällig"-Meldungen
+  queue_json  wie queue, als JSON-Zeilen
+
+Die Konsole wird nach /dev/null geschrieben. Die bisherige mehrzeilige Zusammenfassung pro
+Durchlauf ist in legacy nicht enthalten - die Einsparung ist also eher unterschätzt.
+
+    python benchmarks/bench_logging.py [--accounts 50] [--cycles 30]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from log_setup import LogThrottle, setup_logging, DEFAULT_FORMAT
+
+CONFIGS = ('legacy', 'queue', 'queue_json')
+
+
+def prepare_workdir(workdir, accounts):
+    with open(os.path.join(workdir, 'accounts.json'), 'w') as f:
+        json.dump([{'username': f'user{i}', 'password': 'secret', 'name': f'Account {i}'} for i in range(accounts)], f)
+    next_vote = (datetime.now().astimezone() + timedelta(hours=12)).isoformat()
+    with open(os.path.join(workdir, 'vote_times.json'), 'w') as f:
+        json.dump({f'user{i}': {'Vote-Seite 1': next_vote} for i in range(accounts)}, f)
+
+
+def configure(config, log_file, devnull):
+    """Logging für eine Konfiguration aufsetzen - gibt eine Funktion zum Leeren/Abbauen zurück"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    if config == 'legacy':
+        formatter = logging.Formatter(DEFAULT_FORMAT)
+        handlers = [logging.FileHandler(log_file), logging.StreamHandler(devnull)]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            root.addHandler(handler)
+        root.setLevel(logging.DEBUG)
+
+        def teardown():
+            for handler in handlers:
+                root.removeHandler(handler)
+                handler.close()
+        return teardown
+
+    listener = setup_logging(log_file=log_file, level=logging.INFO, json_lines=config == 'queue_json', stream=devnull)
+
+    def teardown():
+        listener.stop()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+    return teardown
+
+
+def bench_config(config, accounts, cycles):
+    from vote_bot import AlturiVoteBot
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='votebot-logging-') as workdir, open(os.devnull, 'w') as devnull:
+        os.chdir(workdir)
+        try:
+            prepare_workdir(workdir, accounts)
+            log_file = os.path.join(workdir, 'vote_bot.log')
+            teardown = configure(config, log_file, devnull)
+
+            bot = AlturiVoteBot(use_async_webhook=False)
+            bot.account_pause = 0
+            if config == 'legacy':
+                bot.log_throttle = LogThrottle(interval=0)
+
+            # Erster Durchlauf (Migration, Initial-Load) zählt nicht
+            bot.run_cycle()
+            size_before = os.path.getsize(log_file)
+            with open(log_file, 'rb') as f:
+                lines_before = f.read().count(b'\n')
+
+            timings = []
+            for _ in range(cycles):
+                start = time.perf_counter()
+                bot.run_cycle()
+                timings.append(time.perf_counter() - start)
+
+            flush_start = time.perf_counter()
+            teardown()
+            flush_seconds = time.perf_counter() - flush_start
+            bot.shutdown()
+
+            with open(log_file, 'rb') as f:
+                data = f.read()
+            return {
+                'cycle_ms_avg': sum(timings) / len(timings) * 1000,
+                'cycle_ms_max': max(timings) * 1000,
+                'flush_ms': flush_seconds * 1000,
+                'lines_per_cycle': (data.count(b'\n') - lines_before) / cycles,
+                'bytes_per_cycle': (len(data) - size_before) / cycles,
+                'suppressed': bot.log_throttle.suppressed,
+            }
+        finally:
+            os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--cycles', type=int, default=30)
+    args = parser.parse_args()
+
+    results = {config: bench_config(config, args.accounts, args.cycles) for config in CONFIGS}
+    legacy = results['legacy']
+    for config in CONFIGS[1:]:
+        result = results[config]
+        result['cycle_time_saved'] = 1 - result['cycle_ms_avg'] / legacy['cycle_ms_avg']
+        result['bytes_saved'] = 1 - result['bytes_per_cycle'] / legacy['bytes_per_cycle'] if legacy['bytes_per_cycle'] else None
+
+    print(json.dumps({'accounts': args.accounts, 'cycles': args.cycles, 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
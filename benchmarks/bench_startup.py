@@ -0,0 +1,116 @@
+"""Kaltstart-Benchmark: Zeit vom Prozessstart bis zur ersten Scheduler-Entscheidung
+
+Startet vote_bot.py mehrfach als eigenen Prozess in einem temporären Arbeitsverzeichnis
+(N Accounts, keiner fällig - es wird also kein Browser gestartet) und misst die Zeit bis
+zur Log-Zeile "Erste Scheduler-Entscheidung". Ein zusätzlicher Lauf mit -X importtime
+prüft, ob Selenium/requests beim Start importiert werden.
+
+    python benchmarks/bench_startup.py [--runs 5] [--accounts 50] [--mode scheduler|loop] [--script pfad/zu/vote_bot.py]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MARKER = 'Erste Scheduler-Entscheidung'
+# Ältere Stände ohne Marker: erste Log-Zeile nach der Entscheidung (Scheduler- bzw. Loop-Modus)
+FALLBACK_MARKERS = ('Nächste Fälligkeit um', 'Durchlauf abgeschlossen')
+HEAVY_MODULES = ('selenium', 'requests', 'urllib3', 'cryptography')
+
+
+def prepare_workdir(workdir, accounts):
+    with open(os.path.join(workdir, 'accounts.json'), 'w') as f:
+        json.dump([{'username': f'user{i}', 'password': 'secret', 'name': f'Account {i}'} for i in range(accounts)], f)
+    # Alle Accounts erst in 12 Stunden fällig
+    next_vote = (datetime.now().astimezone() + timedelta(hours=12)).isoformat()
+    with open(os.path.join(workdir, 'vote_times.json'), 'w') as f:
+        json.dump({f'user{i}': {'Vote-Seite 1': next_vote} for i in range(accounts)}, f)
+
+
+def run_once(script, workdir, env, timeout, extra_args=()):
+    """(Sekunden bis zur Marker-Zeile von außen gemessen, vom Bot gemeldete Zeit oder None, stderr-Zeilen)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, *extra_args, script], cwd=workdir, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    lines = []
+    try:
+        deadline = start + timeout
+        for line in proc.stderr:
+            lines.append(line)
+            if MARKER in line:
+                elapsed = time.perf_counter() - start
+                reported = float(line.split(MARKER, 1)[1].split('s', 1)[0])
+                return elapsed, reported, lines
+            if any(marker in line for marker in FALLBACK_MARKERS):
+                return time.perf_counter() - start, None, lines
+            if time.perf_counter() > deadline:
+                break
+        raise RuntimeError(f"Keine Scheduler-Entscheidung innerhalb von {timeout}s:\n{''.join(lines[-20:])}")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def heavy_imports(lines):
+    """Top-Level-Pakete aus HEAVY_MODULES, die laut -X importtime vor der Entscheidung importiert wurden"""
+    imported = set()
+    for line in lines:
+        if line.startswith('import time:'):
+            module = line.rsplit('|', 1)[1].strip()
+            if module.split('.')[0] in HEAVY_MODULES:
+                imported.add(module.split('.')[0])
+    return sorted(imported)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--mode', choices=('scheduler', 'loop'), default='scheduler')
+    parser.add_argument('--script', default=os.path.join(ROOT, 'vote_bot.py'), help='z.B. vote_bot.py eines älteren Stands zum Vergleich')
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONUNBUFFERED='1', VOTEBOT_SCHEDULER='1' if args.mode == 'scheduler' else '0')
+    script = os.path.abspath(args.script)
+
+    with tempfile.TemporaryDirectory(prefix='votebot-startup-') as workdir:
+        prepare_workdir(workdir, args.accounts)
+
+        # Erster Start migriert vote_times.json nach SQLite - getrennt ausweisen
+        first_elapsed, first_reported, _ = run_once(script, workdir, env, args.timeout)
+
+        elapsed, reported = [], []
+        for _ in range(args.runs):
+            run_elapsed, run_reported, _ = run_once(script, workdir, env, args.timeout)
+            elapsed.append(run_elapsed)
+            reported.append(run_reported)
+
+        _, _, lines = run_once(script, workdir, env, args.timeout, extra_args=('-X', 'importtime'))
+
+    report = {
+        'mode': args.mode,
+        'accounts': args.accounts,
+        'runs': args.runs,
+        'first_start_seconds': first_elapsed,
+        'first_start_reported_seconds': first_reported,
+        'to_first_decision_seconds': {
+            'min': min(elapsed),
+            'median': statistics.median(elapsed),
+            'max': max(elapsed),
+        },
+        'reported_by_bot_median_seconds': statistics.median(reported) if None not in reported else None,
+        'heavy_modules_imported': heavy_imports(lines),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
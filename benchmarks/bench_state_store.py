@@ -0,0 +1,97 @@
+"""Write-Throughput-Benchmark der State-Backends (JSON vs. SQLite/WAL)
+
+Simuliert den Bot-Betrieb: nach jedem verarbeiteten Account wird dessen neue
+Next-Vote Zeit gespeichert. Misst Schreibzugriffe pro Sekunde, die einmalige
+Migration aus vote_times.json und die "nächste Fälligkeit"-Abfrage.
+
+    python benchmarks/bench_state_store.py [--accounts 10000] [--sites 3] [--writes 500]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytz
+from state_store import JsonStateStore, SqliteStateStore
+
+GERMANY_TZ = pytz.timezone('Europe/Berlin')
+
+
+def synthetic_vote_times(accounts, sites):
+    now = datetime.now(GERMANY_TZ).replace(second=0, microsecond=0)
+    return {
+        f'user{i:05d}': {
+            f'Site{s}': (now + timedelta(minutes=random.randint(-60, 24 * 60))).isoformat()
+            for s in range(sites)
+        }
+        for i in range(accounts)
+    }
+
+
+def bench_writes(store, vote_times, writes):
+    """Pro Schreibzugriff ein Account mit neuer Zeit auf allen Vote-Seiten - wie _process_account_tracked"""
+    usernames = random.sample(sorted(vote_times), min(writes, len(vote_times)))
+    later = (datetime.now(GERMANY_TZ) + timedelta(days=1)).replace(microsecond=0)
+
+    start = time.perf_counter()
+    for username in usernames:
+        vote_times[username] = {site: later.isoformat() for site in vote_times[username]}
+        store.save(vote_times, [username])
+    elapsed = time.perf_counter() - start
+    return {'writes': len(usernames), 'seconds': elapsed, 'writes_per_second': len(usernames) / elapsed}
+
+
+def bench_next_due(store, repeats=20):
+    now_ts = time.time()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        due = store.next_due(now_ts, limit=100)
+    return {'ms': (time.perf_counter() - start) / repeats * 1000, 'due_entries': len(due)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=10000)
+    parser.add_argument('--sites', type=int, default=3)
+    parser.add_argument('--writes', type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(42)
+    report = {'accounts': args.accounts, 'sites': args.sites}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'vote_times.json')
+        vote_times = synthetic_vote_times(args.accounts, args.sites)
+        with open(json_path, 'w') as f:
+            json.dump(vote_times, f, indent=4)
+        report['json_file_bytes'] = os.path.getsize(json_path)
+
+        # === JSON (vollständiges atomares Neuschreiben pro Account) ===
+        json_store = JsonStateStore(json_path)
+        report['json'] = {
+            'writes': bench_writes(json_store, json_store.load(), args.writes),
+            'next_due': bench_next_due(json_store, repeats=3),
+        }
+
+        # === SQLite/WAL (inkrementelle Upserts pro Account) ===
+        sqlite_store = SqliteStateStore(os.path.join(tmp, 'vote_state.db'))
+        start = time.perf_counter()
+        migrated = sqlite_store.migrate_from_json(json_path)
+        report['sqlite'] = {'migration': {'accounts': migrated, 'seconds': time.perf_counter() - start}}
+        report['sqlite']['writes'] = bench_writes(sqlite_store, sqlite_store.load(), args.writes)
+        report['sqlite']['next_due'] = bench_next_due(sqlite_store)
+        sqlite_store.close()
+
+    report['write_speedup'] = report['sqlite']['writes']['writes_per_second'] / report['json']['writes']['writes_per_second']
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Micro-Benchmark: Single-Pass-Parser der Vote-Tabelle vs. bisheriger Per-Element-Ansatz
+
+Ohne Browser wird der Per-Element-Ansatz auf den gespeicherten Fixtures nachgebildet.
+Getrennt ausgegeben werden:
+  measured - reine Parse-Zeit (CPU) beider Varianten; der Single-Pass-Parser darf hier langsamer sein
+  modelled - gezählte WebDriver-Round-Trips, mit --rtt-ms (Latenz eines ChromeDriver-Kommandos) hochgerechnet
+Mit --driver laufen beide Varianten zusätzlich gegen die Fixture in einem echten Chrome (gemessen).
+
+    python benchmarks/bench_vote_parser.py [--iterations 2000] [--rtt-ms 2.0] [--driver]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from html.parser import HTMLParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytz
+from vote_parser import DateTimeParser, parse_vote_rows, html_to_text, _TABLE_RE
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+GERMANY_TZ = pytz.timezone('Europe/Berlin')
+
+LEGACY_PATTERNS = [
+    ("Next vote:", "Next vote:"),
+    ("Nächster vote:", "Nächster vote:"),
+    ("Next Vote:", "Next Vote:"),
+    ("Nächster Vote:", "Nächster Vote:")
+]
+LEGACY_FORMATS = ['%d.%m.%Y %H:%M', '%d.%m.%Y %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S']
+
+
+class _RowCollector(HTMLParser):
+    """Baut aus der Fixture die Zellen so auf, wie Selenium sie über .text liefern würde"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._in_tbody = False
+        self._cell = None
+        self._href = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tbody':
+            self._in_tbody = True
+        elif self._in_tbody and tag == 'tr':
+            self.rows.append([])
+        elif self._in_tbody and tag == 'td':
+            self._cell = {'html': '', 'href': None}
+        elif self._cell is not None:
+            if tag == 'a':
+                self._cell['href'] = dict(attrs).get('href')
+            if tag == 'br':
+                self._cell['html'] += '<br>'
+
+    def handle_endtag(self, tag):
+        if tag == 'tbody':
+            self._in_tbody = False
+        elif tag == 'td' and self._cell is not None:
+            self._cell['text'] = html_to_text(self._cell.pop('html'))
+            self.rows[-1].append(self._cell)
+            self._cell = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell['html'] += data
+
+
+def legacy_parse_datetime(date_str):
+    """Bisheriges parse_datetime: bis zu vier strptime-Versuche pro Aufruf"""
+    date_str = date_str.strip().replace(' Uhr', '').replace(' Clock', '').strip()
+    for fmt in LEGACY_FORMATS:
+        try:
+            return GERMANY_TZ.localize(datetime.strptime(date_str, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_parse(rows):
+    """Bisherige Logik aus check_and_vote (CPU-Anteil) - liefert (Ergebnisse, WebDriver-Round-Trips)"""
+    round_trips = 2  # find table.table, find_elements tbody tr
+    results = []
+    for cells in rows:
+        round_trips += 1  # find_elements td
+        if len(cells) < 2:
+            continue
+        round_trips += 4  # find_element a, a.text, get_attribute href, td.text
+        cell_text = cells[1]['text']
+        next_vote_time = None
+        for pattern_text, split_text in LEGACY_PATTERNS:
+            if pattern_text in cell_text:
+                time_part = cell_text.split(split_text)[1].strip().split('\n')[0].strip()
+                next_vote_time = legacy_parse_datetime(time_part)
+                break
+        results.append((cells[0]['text'], cells[0]['href'], next_vote_time))
+    return results, round_trips
+
+
+def single_pass_parse(table_html, parser):
+    """Neuer Pfad: ein outerHTML-Round-Trip, ein Regex-Durchlauf, gecachtes Datumsformat"""
+    results = []
+    for row in parse_vote_rows(table_html):
+        results.append((row.site, row.url, parser.parse(row.next_vote_text) if row.next_vote_text else None))
+    return results, 2  # find table.table, get_attribute outerHTML
+
+
+def time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - start) / iterations, result
+
+
+def bench_fixture(path, iterations, rtt_ms):
+    with open(path, 'r', encoding='utf-8') as f:
+        page_html = f.read()
+    table_html = _TABLE_RE.search(page_html).group(0)
+
+    collector = _RowCollector()
+    collector.feed(page_html)
+    rows = collector.rows
+
+    legacy_seconds, (legacy_results, legacy_round_trips) = time_per_call(lambda: legacy_parse(rows), iterations)
+    parser = DateTimeParser(GERMANY_TZ)
+    new_seconds, (new_results, new_round_trips) = time_per_call(lambda: single_pass_parse(table_html, parser), iterations)
+
+    if [r[2] for r in legacy_results] != [r[2] for r in new_results]:
+        raise AssertionError(f"Ergebnisse weichen ab: {legacy_results} vs. {new_results}")
+
+    round_trips_saved = legacy_round_trips - new_round_trips
+    return {
+        'fixture': os.path.basename(path),
+        'rows': len(new_results),
+        'measured': {
+            'legacy_parse_ms': legacy_seconds * 1000,
+            'single_pass_parse_ms': new_seconds * 1000,
+            # > 0: Single-Pass braucht mehr CPU als der Per-Element-Ansatz
+            'parse_delta_ms': (new_seconds - legacy_seconds) * 1000,
+        },
+        'modelled': {
+            'legacy_round_trips': legacy_round_trips,
+            'single_pass_round_trips': new_round_trips,
+            'round_trip_savings_ms': round_trips_saved * rtt_ms,
+        },
+    }
+
+
+def bench_driver(path, iterations):
+    """Beide Varianten gegen die Fixture in einem echten Chrome (file://)"""
+    from selenium.webdriver.common.by import By
+    from vote_bot import AlturiVoteBot
+
+    bot = AlturiVoteBot(headless=True)
+    driver = bot._create_driver()
+    try:
+        driver.get('file://' + os.path.abspath(path))
+
+        def legacy():
+            table = driver.find_element(By.CSS_SELECTOR, "table.table")
+            for row in table.find_elements(By.CSS_SELECTOR, "tbody tr"):
+                cells = row.find_elements(By.TAG_NAME, "td")
+                if len(cells) >= 2:
+                    link = cells[0].find_element(By.TAG_NAME, "a")
+                    _ = (link.text, link.get_attribute("href"), cells[1].text)
+
+        def single_pass():
+            table = driver.find_element(By.CSS_SELECTOR, "table.table")
+            parse_vote_rows(table.get_attribute('outerHTML'))
+
+        legacy_seconds, _ = time_per_call(legacy, iterations)
+        new_seconds, _ = time_per_call(single_pass, iterations)
+        return {'legacy_ms': legacy_seconds * 1000, 'single_pass_ms': new_seconds * 1000,
+                'measured_speedup': legacy_seconds / new_seconds if new_seconds else None}
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--rtt-ms', type=float, default=2.0, help='angenommene Latenz pro WebDriver-Kommando')
+    parser.add_argument('--driver', action='store_true', help='zusätzlich gegen echten Chrome messen')
+    args = parser.parse_args()
+
+    fixtures = sorted(os.path.join(FIXTURES, name) for name in os.listdir(FIXTURES) if name.startswith('vote_page'))
+    report = {'iterations': args.iterations, 'rtt_ms': args.rtt_ms, 'results': []}
+    for path in fixtures:
+        result = bench_fixture(path, args.iterations, args.rtt_ms)
+        if args.driver:
+            result['driver'] = bench_driver(path, max(1, args.iterations // 100))
+        report['results'].append(result)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Konfiguration des Vote-Bots: Datei + VOTEBOT_*-Umgebungsvariablen, beim Start vollständig validiert
+
+Reihenfolge: Standardwert < config/votebot.json (Pfad: VOTEBOT_CONFIG) < Umgebungsvariable. Unbekannte
+Schlüssel, falsche Typen und unzulässige Werte brechen den Start mit einer Liste aller Fehler ab.
+
+Zeit- und Concurrency-Werte (RELOADABLE) werden bei Änderungen der Datei im laufenden Betrieb
+übernommen - jeweils zwischen zwei Durchläufen. Eine ungültige Datei wird dabei verworfen und die
+bisherige Konfiguration behalten; geänderte übrige Werte (URLs, Browser, Backends) werden erst nach
+einem Neustart wirksam.
+
+    python bot_config.py [Pfad]    # wirksame Konfiguration anzeigen (Secrets maskiert) bzw. Fehler melden
+"""
+import os
+import sys
+import json
+import shlex
+import logging
+from typing import NamedTuple, Optional, Tuple, Union, get_args, get_origin
+
+DEFAULT_CONFIG_PATH = os.path.join('config', 'votebot.json')
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36'
+
+# Basis-Flags für jeden Chrome-Start (Headless, Lean-Profil und User-Agent kommen eigene Werte hinzu)
+DEFAULT_CHROME_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--allow-running-insecure-content',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-images',
+    '--disable-javascript-harmony-promises',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--window-size=1920,1080',
+)
+
+# Zusätzliche Flags im Lean-Modus (lean_browser): weniger Renderer, kleine Caches, keine Hintergrund-Dienste
+DEFAULT_LEAN_CHROME_ARGS = (
+    '--renderer-process-limit=1',
+    '--disk-cache-size=1048576',
+    '--media-cache-size=1048576',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--mute-audio',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+    '--js-flags=--max-old-space-size=256',
+)
+
+# Im Lean-Modus per CDP blockierte Requests: Schriften, Medien und bekannte Tracker
+DEFAULT_LEAN_BLOCKED_URLS = (
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*hotjar.com*', '*cloudflareinsights.com*', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+)
+
+
+class ConfigError(ValueError):
+    """Ungültige Konfiguration - errors enthält eine Meldung pro fehlerhaftem Wert"""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = list(errors)
+
+
+class BotConfig(NamedTuple):
+    """Wirksame Konfiguration des Bots (Zeiten in Sekunden)"""
+    # Seite und Benachrichtigungen
+    base_url: str = 'https://alturi.to'
+    webhook_url: Optional[str] = None
+    user_agent: str = DEFAULT_USER_AGENT
+    # Browser
+    headless: bool = True
+    lean_browser: bool = False
+    lean_chrome_args: Tuple[str, ...] = DEFAULT_LEAN_CHROME_ARGS
+    lean_blocked_urls: Tuple[str, ...] = DEFAULT_LEAN_BLOCKED_URLS
+    chrome_args: Tuple[str, ...] = DEFAULT_CHROME_ARGS
+    chrome_extra_args: Tuple[str, ...] = ()
+    use_driver_pool: bool = False
+    pool_max_uses: int = 20
+    pool_max_rss_mb: int = 1024
+    # Betriebsmodi und State
+    use_scheduler: bool = False
+    use_http_fast_path: bool = False
+    use_session_store: bool = False
+    state_backend: str = 'sqlite'
+    use_async_webhook: bool = True
+    use_ledger: bool = True
+    record_dir: Optional[str] = None
+    metrics_port: Optional[int] = None
+    metrics_host: str = '127.0.0.1'
+    sharded: bool = False
+    worker_id: Optional[str] = None
+    # Concurrency und Lastbudget
+    max_workers: int = 1
+    dispatch_jitter: float = 0
+    max_load_per_cpu: Optional[float] = None
+    min_available_mb: Optional[int] = None
+    driver_rss_limit_mb: int = 1024
+    # Pausen und Intervalle
+    loop_interval: float = 60
+    error_pause: float = 60
+    no_accounts_pause: float = 300
+    account_pause: float = 5
+    politeness_delay: float = 5
+    retry_interval: float = 60
+    file_poll_interval: float = 5
+    estimate_recheck: float = 120
+    log_throttle_seconds: float = 900
+    # WebDriver-Waits und Webhook-Timeout
+    wait_timeout: float = 10
+    wait_cap: Optional[float] = None
+    confirm_wait: float = 2
+    vote_tab_timeout: float = 5
+    confirm_timeout: float = 5
+    vote_state_timeout: float = 5
+    webhook_timeout: float = 10
+
+    def startup(self):
+        """Werte, die nur beim Start gelten (Konstruktor-Argumente von AlturiVoteBot)"""
+        return {name: getattr(self, name) for name in self._fields if not SETTINGS[name].reloadable}
+
+    def reloadable(self):
+        """Zeit- und Concurrency-Werte (AlturiVoteBot.apply_settings, auch im laufenden Betrieb)"""
+        return {name: getattr(self, name) for name in RELOADABLE}
+
+    def describe(self):
+        """Lesbare Übersicht, Secrets maskiert"""
+        lines = []
+        for name in self._fields:
+            value = getattr(self, name)
+            if SETTINGS[name].secret and value:
+                value = '***'
+            lines.append(f"{name} = {value!r}")
+        return '\n'.join(lines)
+
+
+class Setting(NamedTuple):
+    """Metadaten eines BotConfig-Felds"""
+    env: Optional[str] = None
+    reloadable: bool = False
+    minimum: Optional[float] = None
+    choices: Optional[tuple] = None
+    url: bool = False
+    secret: bool = False
+
+
+SETTINGS = {
+    'base_url': Setting('VOTEBOT_BASE_URL', url=True),
+    'webhook_url': Setting('VOTEBOT_WEBHOOK_URL', url=True, secret=True),  # Discord-Webhook; ohne Wert keine Benachrichtigungen
+    'user_agent': Setting('VOTEBOT_USER_AGENT'),
+    'headless': Setting('VOTEBOT_HEADLESS'),
+    'lean_browser': Setting('VOTEBOT_LEAN_BROWSER'),  # sparsames Profil (1 Renderer, kleine Caches, Fonts/Medien/Tracker blockiert)
+    'lean_chrome_args': Setting('VOTEBOT_LEAN_CHROME_ARGS'),  # ersetzt DEFAULT_LEAN_CHROME_ARGS (nur mit lean_browser)
+    'lean_blocked_urls': Setting('VOTEBOT_LEAN_BLOCKED_URLS'),  # ersetzt DEFAULT_LEAN_BLOCKED_URLS (URL-Muster, nur mit lean_browser)
+    'chrome_args': Setting('VOTEBOT_CHROME_ARGS'),  # ersetzt DEFAULT_CHROME_ARGS (Umgebung: shell-artig getrennt)
+    'chrome_extra_args': Setting('VOTEBOT_CHROME_EXTRA_ARGS'),  # zusätzlich zu chrome_args
+    'use_driver_pool': Setting('VOTEBOT_DRIVER_POOL'),  # Browser zwischen Accounts warm halten
+    'pool_max_uses': Setting('VOTEBOT_POOL_MAX_USES', minimum=1),
+    'pool_max_rss_mb': Setting('VOTEBOT_POOL_MAX_RSS_MB', minimum=64),
+    'use_scheduler': Setting('VOTEBOT_SCHEDULER'),  # schlafen bis zur nächsten Fälligkeit statt minütlichem Durchlauf
+    'use_http_fast_path': Setting('VOTEBOT_HTTP_FAST_PATH'),  # Vote-Status per HTTP prüfen, Browser nur zum Voten
+    'use_session_store': Setting('VOTEBOT_SESSION_STORE'),  # Sessions verschlüsselt speichern (Schlüssel: VOTEBOT_SESSION_KEY)
+    'state_backend': Setting('VOTEBOT_STATE_BACKEND', choices=('sqlite', 'json')),  # json = weiterhin vote_times.json statt data/vote_state.db
+    'use_async_webhook': Setting('VOTEBOT_ASYNC_WEBHOOK'),  # 0 = Webhooks blockierend im Vote-Ablauf senden
+    'use_ledger': Setting('VOTEBOT_LEDGER'),  # Vote-Ledger unter data/ledger (python vote_ledger.py summary --since 30d)
+    'record_dir': Setting('VOTEBOT_RECORD_DIR'),  # Browser-Sessions für den Replay aufnehmen (python session_replay.py check recordings)
+    'metrics_port': Setting('VOTEBOT_METRICS_PORT', minimum=1),  # Prometheus-Metriken unter http://<metrics_host>:<port>/metrics
+    'metrics_host': Setting('VOTEBOT_METRICS_HOST'),  # Bind-Adresse; im Docker-Image 0.0.0.0, damit Prometheus von außen scrapen kann
+    'sharded': Setting('VOTEBOT_SHARDED'),  # Accounts per Lease zwischen Containern aufteilen (gemeinsames data/-Volume)
+    'worker_id': Setting('VOTEBOT_WORKER_ID'),
+    'max_workers': Setting('VOTEBOT_MAX_WORKERS', reloadable=True, minimum=1),  # fällige Accounts parallel (empfohlen 2-4)
+    'dispatch_jitter': Setting('VOTEBOT_DISPATCH_JITTER', reloadable=True, minimum=0),  # gleichzeitig fällige Accounts über bis zu n Sekunden verteilen
+    'max_load_per_cpu': Setting('VOTEBOT_MAX_LOAD_PER_CPU', reloadable=True, minimum=0),  # neue Browser erst unterhalb dieser Last ...
+    'min_available_mb': Setting('VOTEBOT_MIN_AVAILABLE_MB', reloadable=True, minimum=0),  # ... bzw. ab so viel freiem Speicher starten
+    'driver_rss_limit_mb': Setting('VOTEBOT_DRIVER_RSS_LIMIT_MB', reloadable=True, minimum=64),  # Driver darüber beendet der Watchdog
+    'loop_interval': Setting('VOTEBOT_LOOP_INTERVAL', reloadable=True, minimum=1),  # Abstand der Durchläufe ohne Scheduler
+    'error_pause': Setting('VOTEBOT_ERROR_PAUSE', reloadable=True, minimum=0),  # nach unerwartetem Fehler in der Hauptschleife
+    'no_accounts_pause': Setting('VOTEBOT_NO_ACCOUNTS_PAUSE', reloadable=True, minimum=1),
+    'account_pause': Setting('VOTEBOT_ACCOUNT_PAUSE', reloadable=True, minimum=0),
+    'politeness_delay': Setting('VOTEBOT_POLITENESS_DELAY', reloadable=True, minimum=0),
+    'retry_interval': Setting('VOTEBOT_RETRY_INTERVAL', reloadable=True, minimum=1),  # Scheduler: erneuter Versuch ohne neue Next-Vote Zeit
+    'file_poll_interval': Setting('VOTEBOT_FILE_POLL_INTERVAL', reloadable=True, minimum=0.1),  # Scheduler: Prüfintervall für Datei- und Konfigurationsänderungen
+    'estimate_recheck': Setting('VOTEBOT_ESTIMATE_RECHECK', reloadable=True, minimum=1),  # Seiten ohne lesbare Zeit erneut prüfen (verdoppelt sich pro Fehlschlag bis 24h)
+    'log_throttle_seconds': Setting('VOTEBOT_LOG_THROTTLE', reloadable=True, minimum=0),  # "noch nicht fällig"-Meldungen pro Account höchstens so oft
+    'wait_timeout': Setting('VOTEBOT_WAIT_TIMEOUT', reloadable=True, minimum=0),
+    'wait_cap': Setting('VOTEBOT_WAIT_CAP', reloadable=True, minimum=0),  # Obergrenze für alle Waits (Replay gegen lokale Aufnahmen)
+    'confirm_wait': Setting('VOTEBOT_CONFIRM_WAIT', reloadable=True, minimum=0),  # Confirm-Button ohne Reload abwarten
+    'vote_tab_timeout': Setting('VOTEBOT_VOTE_TAB_TIMEOUT', reloadable=True, minimum=0),
+    'confirm_timeout': Setting('VOTEBOT_CONFIRM_TIMEOUT', reloadable=True, minimum=0),
+    'vote_state_timeout': Setting('VOTEBOT_VOTE_STATE_TIMEOUT', reloadable=True, minimum=0),
+    'webhook_timeout': Setting('VOTEBOT_WEBHOOK_TIMEOUT', reloadable=True, minimum=1),
+}
+assert set(SETTINGS) == set(BotConfig._fields)
+
+RELOADABLE = tuple(name for name in BotConfig._fields if SETTINGS[name].reloadable)
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+def _field_type(name):
+    """(Basistyp, None erlaubt) aus der Annotation eines BotConfig-Felds"""
+    annotation = BotConfig.__annotations__[name]
+    if get_origin(annotation) is Union:
+        return next(arg for arg in get_args(annotation) if arg is not type(None)), True
+    if get_origin(annotation) is tuple:
+        return tuple, False
+    return annotation, False
+
+
+def convert(name, value, from_env=False):
+    """Rohwert (JSON-Wert bzw. String aus der Umgebung) in den Typ des Felds umwandeln und prüfen"""
+    kind, optional = _field_type(name)
+    setting = SETTINGS[name]
+    if from_env and isinstance(value, str):
+        value = value.strip()
+        if kind is bool:
+            if value.lower() not in _TRUE + _FALSE:
+                raise ValueError(f"erwartet 1/0, true/false - nicht '{value}'")
+            value = value.lower() in _TRUE
+        elif kind is tuple:
+            value = shlex.split(value)
+        elif kind in (int, float):
+            try:
+                value = kind(value)
+            except ValueError:
+                raise ValueError(f"erwartet {kind.__name__} - nicht '{value}'") from None
+
+    if value is None:
+        if optional:
+            return None
+        raise ValueError("darf nicht leer sein")
+    if kind is tuple:
+        if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+            raise ValueError("erwartet eine Liste von Strings")
+        return tuple(value)
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+    if not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+        raise ValueError(f"erwartet {kind.__name__} - nicht {type(value).__name__} {value!r}")
+
+    if setting.minimum is not None and value < setting.minimum:
+        raise ValueError(f"mindestens {setting.minimum:g} - nicht {value}")
+    if setting.choices and value not in setting.choices:
+        raise ValueError(f"erlaubt: {', '.join(setting.choices)} - nicht '{value}'")
+    if setting.url and not value.startswith(('http://', 'https://')):
+        raise ValueError("erwartet eine http(s)-URL")
+    if name == 'metrics_port' and value > 65535:
+        raise ValueError(f"ungültiger Port {value}")
+    return value
+
+
+def read_config_file(path):
+    """Inhalt der Konfigurationsdatei als dict - fehlende Datei = keine Werte"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        raise ConfigError([f"{path}: {e}"]) from None
+    if not isinstance(data, dict):
+        raise ConfigError([f"{path}: erwartet ein JSON-Objekt"])
+    return data
+
+
+def load_config(path=DEFAULT_CONFIG_PATH, environ=None):
+    """BotConfig aus Standardwerten, Datei und Umgebung - ConfigError mit allen Fehlern"""
+    environ = os.environ if environ is None else environ
+    values = {}
+    errors = []
+    for key, value in read_config_file(path).items():
+        if key not in SETTINGS:
+            errors.append(f"{path}: unbekannter Schlüssel '{key}'")
+            continue
+        try:
+            values[key] = convert(key, value)
+        except ValueError as e:
+            errors.append(f"{path}: {key}: {e}")
+
+    for name, setting in SETTINGS.items():
+        # Leere Variablen zählen als nicht gesetzt (docker-compose: VAR=${VAR:-})
+        if setting.env and environ.get(setting.env):
+            try:
+                values[name] = convert(name, environ[setting.env], from_env=True)
+            except ValueError as e:
+                errors.append(f"{setting.env}: {e}")
+    if errors:
+        raise ConfigError(errors)
+    return BotConfig(**values)
+
+
+def parse_overrides(items):
+    """'name=wert' Paare (z.B. --set in Benchmarks) wie Umgebungsvariablen umwandeln - nur RELOADABLE-Werte"""
+    values = {}
+    errors = []
+    for item in items:
+        name, _, raw = item.partition('=')
+        if name not in RELOADABLE:
+            errors.append(f"'{name}' ist kein im Betrieb änderbarer Wert ({', '.join(RELOADABLE)})")
+            continue
+        try:
+            values[name] = convert(name, raw, from_env=True)
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+    if errors:
+        raise ConfigError(errors)
+    return values
+
+
+class ConfigWatcher:
+    """Lädt die Konfigurationsdatei nach Änderungen (mtime/Größe) neu und liefert geänderte RELOADABLE-Werte"""
+
+    def __init__(self, path, config, environ=None):
+        self.path = path
+        self.config = config
+        self.environ = environ
+        self._signature = self._stat_signature()
+
+        # Metriken
+        self.reloads = 0
+        self.rejected = 0
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def has_changed(self):
+        return self._stat_signature() != self._signature
+
+    def poll(self):
+        """{Name: neuer Wert} der geänderten RELOADABLE-Werte, None ohne (gültige) Änderung"""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return None
+        try:
+            config = load_config(self.path, self.environ)
+        except ConfigError as e:
+            # Halb geschriebene Datei: beim nächsten Poll erneut versuchen
+            if self._stat_signature() != signature:
+                return None
+            self._signature = signature
+            self.rejected += 1
+            logging.error(f"⚙️  Geänderte Konfiguration '{self.path}' ungültig - bisherige bleibt aktiv: {e}")
+            return None
+        if self._stat_signature() != signature:
+            return None
+        self._signature = signature
+
+        pending = [name for name in self.config._fields
+                   if name not in RELOADABLE and getattr(config, name) != getattr(self.config, name)]
+        if pending:
+            logging.warning(f"⚙️  Erst nach Neustart wirksam: {', '.join(pending)}")
+        changes = {name: getattr(config, name) for name in RELOADABLE if getattr(config, name) != getattr(self.config, name)}
+        self.config = self.config._replace(**changes)
+        if changes:
+            self.reloads += 1
+        return changes or None
+
+    def stats(self):
+        return {'reloads': self.reloads, 'rejected': self.rejected}
+
+
+if __name__ == "__main__":
+    try:
+        config = load_config(sys.argv[1] if len(sys.argv) > 1 else os.environ.get('VOTEBOT_CONFIG', DEFAULT_CONFIG_PATH))
+    except ConfigError as e:
+        print("❌ Ungültige Konfiguration:\n  " + '\n  '.join(e.errors))
+        sys.exit(1)
+    print(config.describe())
@@ -0,0 +1,179 @@
+import time
+import logging
+import threading
+from collections import deque
+
+# Laut Seite ist alle 24h + 1 Minute ein Vote möglich - gilt bis genug eigene Beobachtungen vorliegen
+DEFAULT_COOLDOWN = 24 * 3600
+
+# Beobachtungen außerhalb dieses Bereichs sind Parse-/Zeitzonenfehler und werden verworfen
+MIN_PLAUSIBLE_COOLDOWN = 60
+MAX_PLAUSIBLE_COOLDOWN = 7 * 24 * 3600
+
+
+def _quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CooldownPredictor:
+    """Lernt die Abklingzeit pro Vote-Seite und schätzt fehlende Next-Vote Zeiten konservativ
+
+    Gelernt wird aus (Zeitpunkt des erfolgreichen Votes, danach angezeigte Next-Vote Zeit). Fehlt
+    die beobachtete Zeit (Tabelle nach dem Vote nicht lesbar, Zeile nicht parsebar), wird eine
+    Schätzung gespeichert statt den Account jede Minute erneut einzuloggen:
+
+      - gevotete Seite: Vote-Zeitpunkt + unteres Quantil der gelernten Abklingzeiten (eher zu früh als zu spät)
+      - nicht parsebare Zeile: letzter bekannter Vote + Abklingzeit, sonst erneuter Check nach recheck
+        Sekunden (verdoppelt pro weiterer Schätzung in Folge, höchstens eine Abklingzeit) - einzelne
+        Aussetzer kosten so kaum Latenz, dauerhaft kaputte Zeilen nur noch wenige Logins pro Tag
+
+    Geschätzte Einträge werden markiert; sobald wieder eine echte Zeit gelesen wird, fließt die
+    Abweichung in die Trefferquote ein. Gesparte Seitenaufrufe werden über die beobachtete
+    Lesequote pro Account und Vote-Seite hochgerechnet (ohne Schätzung: erneuter Aufruf pro
+    poll_interval, bis das Lesen klappt).
+    """
+
+    def __init__(self, store=None, default_cooldown=DEFAULT_COOLDOWN, quantile=0.1, min_samples=3, window=50,
+                 recheck=120, poll_interval=60):
+        self.store = store
+        self.default_cooldown = default_cooldown
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self.recheck = recheck
+        # Abstand, in dem ein Account ohne gespeicherte Zeit sonst erneut geladen würde (Loop- bzw. Retry-Intervall)
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._samples = {}      # Vote-Seite -> deque[Sekunden]
+        self._last_voted = {}   # (username, Vote-Seite) -> Unix-Timestamp
+        self._estimates = {}    # (username, Vote-Seite) -> (geschätzter Timestamp, Schätzungen in Folge, aus Vote-Zeitpunkt)
+        self._reads = {}        # (username, Vote-Seite) -> [gelesene Zeiten, fehlende Zeiten]
+
+        # Metriken
+        self.estimates_written = 0
+        self.page_loads_saved = 0.0
+        self.confirmed = 0
+        self.confirmed_late = 0
+        self._early_seconds = 0.0
+
+        if store is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            state = self.store.load_cooldown_state() or {}
+        except Exception as e:
+            logging.error(f"Fehler beim Laden der Abklingzeiten: {e}")
+            return
+        for site, samples in state.get('samples', {}).items():
+            self._samples[site] = deque(samples, maxlen=self.window)
+        for username, sites in state.get('last_voted', {}).items():
+            for site, voted_at in sites.items():
+                self._last_voted[(username, site)] = voted_at
+        for username, sites in state.get('estimates', {}).items():
+            for site, estimate in sites.items():
+                self._estimates[(username, site)] = tuple(estimate)
+        if self._samples:
+            logging.info(f"🔮 Abklingzeiten für {len(self._samples)} Vote-Seite(n) geladen")
+
+    def _persist(self, username, site, sample=None):
+        # Nur die geänderte Zeile schreiben - Kosten pro Vote unabhängig von der Anzahl der Accounts
+        if self.store is None:
+            return
+        with self._lock:
+            last_voted = self._last_voted.get((username, site))
+            estimate = self._estimates.get((username, site))
+        try:
+            if sample is not None:
+                self.store.add_cooldown_sample(site, last_voted, sample, self.window)
+            self.store.save_cooldown_entry(username, site, last_voted, estimate)
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern der Abklingzeiten: {e}")
+
+    def cooldown(self, site):
+        """Konservative Abklingzeit einer Vote-Seite in Sekunden"""
+        with self._lock:
+            samples = self._samples.get(site)
+            if not samples or len(samples) < self.min_samples:
+                return self.default_cooldown
+            return _quantile(samples, self.quantile)
+
+    def is_estimated(self, username, site):
+        with self._lock:
+            return (username, site) in self._estimates
+
+    def record_vote(self, username, site, voted_at, next_vote_ts=None):
+        """Erfolgreichen Vote merken - mit beobachteter Next-Vote Zeit auch als Stichprobe der Abklingzeit"""
+        sample = None
+        with self._lock:
+            self._last_voted[(username, site)] = voted_at
+            if next_vote_ts is not None:
+                seconds = next_vote_ts - voted_at
+                if MIN_PLAUSIBLE_COOLDOWN <= seconds <= MAX_PLAUSIBLE_COOLDOWN:
+                    sample = round(seconds)
+                    self._samples.setdefault(site, deque(maxlen=self.window)).append(sample)
+                else:
+                    logging.debug(f"🔮 Unplausible Abklingzeit für {site} verworfen: {seconds:.0f}s")
+        self._persist(username, site, sample)
+
+    def observe(self, username, site, next_vote_ts):
+        """Beobachtete Next-Vote Zeit - ersetzt eine Schätzung und zählt deren Abweichung"""
+        early = None
+        with self._lock:
+            self._reads.setdefault((username, site), [0, 0])[0] += 1
+            estimate = self._estimates.pop((username, site), None)
+            if estimate is None:
+                return
+            # Nur aus einem Vote-Zeitpunkt abgeleitete Schätzungen sagen etwas über die Trefferquote aus
+            if estimate[2]:
+                early = next_vote_ts - estimate[0]
+                self.confirmed += 1
+                self._early_seconds += early
+                if early < 0:
+                    self.confirmed_late += 1
+        if early is not None and early < 0:
+            logging.warning(f"🔮 {username}: Schätzung für {site} lag {-early:.0f}s nach der tatsächlichen Zeit")
+        self._persist(username, site)
+
+    def estimate(self, username, site, now=None, voted_at=None):
+        """Geschätzter Next-Vote Timestamp für eine Seite ohne beobachtete Zeit (wird als geschätzt markiert)"""
+        now = time.time() if now is None else now
+        cooldown = self.cooldown(site)
+        with self._lock:
+            if voted_at is None:
+                voted_at = self._last_voted.get((username, site))
+            streak = self._estimates.get((username, site), (None, 0))[1] + 1
+
+            reads = self._reads.setdefault((username, site), [0, 0])
+            reads[1] += 1
+
+            estimated_ts = voted_at + cooldown if voted_at is not None else None
+            anchored = estimated_ts is not None and estimated_ts > now
+            if not anchored:
+                # Kein Anhaltspunkt: zunehmend seltener nachsehen, aber nie länger als eine Abklingzeit
+                estimated_ts = now + min(cooldown, self.recheck * 2 ** (streak - 1))
+
+            self._estimates[(username, site)] = (estimated_ts, streak, anchored)
+            self.estimates_written += 1
+
+            # Ohne Schätzung: Aufruf pro poll_interval, bis die Zeit gelesen wird (im Mittel 1 / Lesequote)
+            baseline_loads = (estimated_ts - now) / self.poll_interval
+            if reads[0]:
+                baseline_loads = min(baseline_loads, sum(reads) / reads[0])
+            # Die Schätzung selbst kostet einen Aufruf zum geschätzten Zeitpunkt, außer dieser ist ohnehin die echte Fälligkeit
+            self.page_loads_saved += max(0.0, baseline_loads - (0 if anchored else 1))
+        self._persist(username, site)
+        return estimated_ts
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sites_learned': sum(1 for samples in self._samples.values() if len(samples) >= self.min_samples),
+                'estimates': self.estimates_written,
+                'estimates_pending': len(self._estimates),
+                'page_loads_saved': round(self.page_loads_saved),
+                'confirmed': self.confirmed,
+                'confirmed_late': self.confirmed_late,
+                'early_avg_seconds': self._early_seconds / self.confirmed if self.confirmed else 0.0,
+            }
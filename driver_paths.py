@@ -0,0 +1,96 @@
+"""ChromeDriver- und Browser-Pfade einmalig auflösen und cachen
+
+Beim Image-Build aufgerufen (python driver_paths.py), damit der Bot beim Start weder Selenium
+Manager noch einen fehlschlagenden ersten Chrome-Start durchlaufen muss.
+
+    python driver_paths.py [--cache driver_paths.json]
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import subprocess
+
+DEFAULT_CACHE_PATH = 'driver_paths.json'
+DRIVER_CANDIDATES = ('chromedriver',)
+BROWSER_CANDIDATES = ('chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable')
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _which(candidates):
+    for name in candidates:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+def _version(path):
+    try:
+        return subprocess.run([path, '--version'], capture_output=True, text=True, timeout=30).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def resolve_driver_paths():
+    """{'chromedriver': Pfad, 'browser': Pfad oder None} - zuerst im PATH, sonst über Selenium Manager"""
+    driver = _which(DRIVER_CANDIDATES)
+    browser = _which(BROWSER_CANDIDATES)
+    if driver is None:
+        # Kein Systempaket: Selenium Manager lädt passende Binaries herunter (nur beim Build, nie zur Laufzeit)
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        output = SeleniumManager().binary_paths(['--browser', 'chrome'])
+        driver = output.get('driver_path') or None
+        browser = browser or output.get('browser_path') or None
+    if not _is_executable(driver):
+        raise RuntimeError("Kein ausführbarer ChromeDriver gefunden")
+    return {
+        'chromedriver': driver,
+        'browser': browser if _is_executable(browser) else None,
+        'chromedriver_version': _version(driver),
+        'browser_version': _version(browser) if _is_executable(browser) else None,
+    }
+
+
+def load_driver_paths(cache_path=DEFAULT_CACHE_PATH):
+    """Gecachte Pfade oder None (fehlender Cache oder Binaries nicht mehr vorhanden)"""
+    try:
+        with open(cache_path, 'r') as f:
+            paths = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _is_executable(paths.get('chromedriver')):
+        logging.warning(f"⚠️ Driver-Cache '{cache_path}' veraltet - ChromeDriver fehlt")
+        return None
+    if paths.get('browser') and not _is_executable(paths['browser']):
+        paths['browser'] = None
+    return paths
+
+
+def save_driver_paths(paths, cache_path=DEFAULT_CACHE_PATH):
+    with open(cache_path, 'w') as f:
+        json.dump(paths, f, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    args = parser.parse_args()
+
+    try:
+        paths = resolve_driver_paths()
+    except Exception as e:
+        print(f"❌ Driver-Pfade konnten nicht aufgelöst werden: {e}", file=sys.stderr)
+        return 1
+    save_driver_paths(paths, args.cache)
+    print(f"✅ Driver-Pfade in '{args.cache}' gespeichert: {json.dumps(paths)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
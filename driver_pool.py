@@ -0,0 +1,316 @@
+import os
+import time
+import signal
+import threading
+import logging
+
+
+def _children_map():
+    """{ppid: [pid, ...]} aller Prozesse (Linux /proc) oder None"""
+    children = {}
+    try:
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', 'r') as f:
+                    # Format: pid (comm) state ppid ... - comm kann Leerzeichen enthalten
+                    fields = f.read().rsplit(')', 1)[1].split()
+                children.setdefault(int(fields[1]), []).append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    except OSError:
+        return None
+    return children
+
+
+def _process_tree(pid, children):
+    tree = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def process_tree_rss(pid):
+    """Summe des RSS (Bytes) eines Prozesses und aller Kindprozesse (Linux /proc)"""
+    children = _children_map()
+    if children is None:
+        return None
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    for current in _process_tree(pid, children):
+        try:
+            with open(f'/proc/{current}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+    return total
+
+
+def kill_process_tree(pid):
+    """Prozess samt Kindprozessen hart beenden (SIGKILL) - Kinder zuerst"""
+    children = _children_map() or {}
+    for current in reversed(_process_tree(pid, children)):
+        try:
+            os.kill(current, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def driver_rss(driver):
+    """RSS (Bytes) von ChromeDriver inkl. Browser-Prozessen oder None falls unbekannt"""
+    try:
+        return process_tree_rss(driver.service.process.pid)
+    except Exception:
+        return None
+
+
+class DriverPool:
+    """Pool warmer WebDriver-Instanzen, die zwischen Accounts isoliert wiederverwendet werden"""
+
+    def __init__(self, factory, max_idle=1, max_uses=20, max_rss_mb=1024, origins=None):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.origins = origins or []
+
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+
+        # Metriken
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.isolation_failures = 0
+        # Anzahl und Summe statt Liste - der Pool läuft unbegrenzt lange
+        self.startups = 0
+        self.startup_total_seconds = 0.0
+
+    def acquire(self):
+        """Hole einen warmen Driver aus dem Pool oder starte einen neuen"""
+        with self._lock:
+            if self._idle:
+                self.hits += 1
+                driver = self._idle.pop()
+                logging.info(f"♻️  Warmer WebDriver aus Pool wiederverwendet (Nutzung {self._uses.get(id(driver), 0) + 1})")
+                return driver
+            self.misses += 1
+
+        start = time.monotonic()
+        driver = self.factory()
+        elapsed = time.monotonic() - start
+
+        with self._lock:
+            self.startups += 1
+            self.startup_total_seconds += elapsed
+            self._uses[id(driver)] = 0
+        logging.info(f"🆕 Neuer WebDriver für Pool gestartet in {elapsed:.2f}s")
+        return driver
+
+    def release(self, driver):
+        """Gib einen Driver zurück - wird isoliert und wiederverwendet oder recycelt"""
+        if driver is None:
+            return
+
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        reason = None
+        isolation_failed = False
+        if uses >= self.max_uses:
+            reason = f"{uses} Nutzungen erreicht"
+        else:
+            rss = driver_rss(driver)
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                reason = f"Speicher {rss / 1024 / 1024:.0f} MB > {self.max_rss_mb} MB"
+            elif not self._reset(driver):
+                isolation_failed = True
+                reason = "Isolation konnte nicht bestätigt werden"
+
+        with self._lock:
+            if reason is None and len(self._idle) < self.max_idle:
+                self._idle.append(driver)
+                return
+            if reason:
+                self.recycled += 1
+                if isolation_failed:
+                    self.isolation_failures += 1
+
+        if reason:
+            logging.info(f"🔁 WebDriver wird recycelt: {reason}")
+        self._quit(driver)
+
+    def discard(self, driver, reason):
+        """Driver nicht zurück in den Pool legen (z.B. vom Watchdog beendet)"""
+        if driver is None:
+            return
+        logging.info(f"🔁 WebDriver wird verworfen: {reason}")
+        with self._lock:
+            self.recycled += 1
+        self._quit(driver)
+
+    def _reset(self, driver):
+        """Cookies, Storage und zusätzliche Fenster entfernen und Ergebnis prüfen"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Storage der aktuell geladenen Seite leeren, bevor sie verlassen wird
+            try:
+                driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            except Exception:
+                pass
+
+            driver.delete_all_cookies()
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            for origin in self.origins:
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+
+            driver.get('about:blank')
+
+            # Isolation bestätigen: keine Cookies über alle Domains hinweg
+            remaining = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            if remaining:
+                logging.warning(f"⚠️ {len(remaining)} Cookie(s) nach Reset noch vorhanden")
+                return False
+            return True
+
+        except Exception as e:
+            logging.warning(f"⚠️ Reset des WebDrivers fehlgeschlagen: {e}")
+            return False
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.debug(f"Fehler beim Beenden des WebDrivers: {e}")
+
+    def close_all(self):
+        """Alle wartenden Driver beenden"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    def stats(self):
+        """Pool-Metriken: Hit-Rate und Startzeiten"""
+        with self._lock:
+            hits, misses, startups, startup_total = self.hits, self.misses, self.startups, self.startup_total_seconds
+            recycled, isolation_failures = self.recycled, self.isolation_failures
+        requests_total = hits + misses
+        startup_avg = startup_total / startups if startups else 0.0
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / requests_total if requests_total else 0.0,
+            'recycled': recycled,
+            'isolation_failures': isolation_failures,
+            'startups': startups,
+            'startup_avg_seconds': startup_avg,
+            'startup_total_seconds': startup_total,
+            # Geschätzte eingesparte Startzeit: jeder Hit hätte sonst einen Start gekostet
+            'startup_saved_seconds': hits * startup_avg,
+        }
+
+
+class DriverWatchdog:
+    """Überwacht das RSS laufender Driver, beendet Ausreißer und merkt sich den Peak pro Account"""
+
+    def __init__(self, max_rss_mb=1024, interval=2):
+        self.max_rss_mb = max_rss_mb
+        self.interval = interval
+
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Metriken
+        self.kills = 0
+        self.peaks = {}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='driver-watchdog', daemon=True)
+            self._thread.start()
+
+    def watch(self, driver, label):
+        """Driver für die Dauer eines Accounts überwachen"""
+        with self._lock:
+            self._active[id(driver)] = {'driver': driver, 'label': label, 'peak': 0, 'killed': False}
+        self._sample(self._active[id(driver)])
+
+    def unwatch(self, driver):
+        """Überwachung beenden - liefert (Peak-RSS in MB, vom Watchdog beendet)"""
+        with self._lock:
+            entry = self._active.pop(id(driver), None)
+        if entry is None:
+            return 0.0, False
+        if not entry['killed']:
+            self._sample(entry)
+        peak_mb = entry['peak'] / 1024 / 1024
+        with self._lock:
+            self.peaks[entry['label']] = peak_mb
+        logging.info(f"🧠 {entry['label']}: Peak-RSS des WebDrivers {peak_mb:.0f} MB")
+        return peak_mb, entry['killed']
+
+    def _sample(self, entry):
+        rss = driver_rss(entry['driver'])
+        if rss is None:
+            return None
+        entry['peak'] = max(entry['peak'], rss)
+        return rss
+
+    def killed(self, driver):
+        """Hat der Watchdog diesen (noch überwachten) Driver beendet?"""
+        with self._lock:
+            entry = self._active.get(id(driver))
+        return entry is not None and entry['killed']
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._check()
+
+    def _check(self):
+        with self._lock:
+            entries = list(self._active.values())
+        for entry in entries:
+            if entry['killed']:
+                continue
+            rss = self._sample(entry)
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                logging.warning(f"🐕 {entry['label']}: WebDriver bei {rss / 1024 / 1024:.0f} MB > {self.max_rss_mb} MB - wird beendet")
+                entry['killed'] = True
+                self.kills += 1
+                try:
+                    kill_process_tree(entry['driver'].service.process.pid)
+                except Exception as e:
+                    logging.debug(f"Fehler beim Beenden des WebDrivers: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def stats(self):
+        with self._lock:
+            peaks = list(self.peaks.values())
+        return {
+            'kills': self.kills,
+            'active': len(self._active),
+            'peak_rss_max_mb': max(peaks) if peaks else 0.0,
+            'peak_rss_avg_mb': sum(peaks) / len(peaks) if peaks else 0.0,
+        }
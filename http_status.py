@@ -0,0 +1,105 @@
+import time
+import logging
+import requests
+from urllib.parse import urljoin
+
+from vote_parser import parse_vote_rows, parse_coins, parse_login_form
+from session_store import cookies_to_jar, cookies_from_jar
+
+
+class HttpStatusClient:
+    """Schneller Vote-Status-Check per requests.Session - ohne Browser"""
+
+    def __init__(self, base_url, user_agent=None, timeout=10, session_store=None):
+        self.base_url = base_url.rstrip('/')
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.session_store = session_store
+
+        # Eine Session pro Account, bleibt über Durchläufe hinweg erhalten
+        self.sessions = {}
+        self._restored = set()
+
+    def get_session(self, username):
+        session = self.sessions.get(username)
+        if session is None:
+            session = requests.Session()
+            if self.user_agent:
+                session.headers['User-Agent'] = self.user_agent
+            if self.session_store:
+                cookies = self.session_store.load(username)
+                if cookies:
+                    cookies_to_jar(cookies, session.cookies)
+                    self._restored.add(username)
+            self.sessions[username] = session
+        return session
+
+    def _is_vote_page(self, response):
+        return response.ok and '/vote' in response.url
+
+    def login(self, username, password):
+        """Login per POST mit den Formularfeldern user/pass/goingin"""
+        session = self.get_session(username)
+        login_url = f'{self.base_url}/login'
+        start = time.monotonic()
+
+        response = session.get(login_url, timeout=self.timeout)
+        action, hidden_fields = parse_login_form(response.text)
+
+        form = dict(hidden_fields)
+        form.update({'user': username, 'pass': password, 'goingin': ''})
+        session.post(urljoin(response.url, action) if action else login_url, data=form, timeout=self.timeout)
+
+        # Wie im Browser-Flow: Login gilt erst als erfolgreich wenn /vote erreichbar ist
+        response = session.get(f'{self.base_url}/vote', timeout=self.timeout)
+        if self._is_vote_page(response):
+            logging.info(f"🌐 {username}: HTTP-Login erfolgreich")
+            if self.session_store:
+                self.session_store.record_login(time.monotonic() - start)
+                self.session_store.save(username, cookies_from_jar(session.cookies))
+            return response
+        logging.warning(f"🌐 {username}: HTTP-Login fehlgeschlagen (URL: {response.url})")
+        return None
+
+    def fetch_vote_page(self, username, password):
+        """Hole /vote - mit bestehender Session, sonst nach erneutem Login"""
+        session = self.get_session(username)
+        start = time.monotonic()
+        response = session.get(f'{self.base_url}/vote', timeout=self.timeout)
+        valid = self._is_vote_page(response)
+
+        # Von Platte wiederhergestellte Session: Ergebnis des einzelnen /vote-Requests erfassen
+        if username in self._restored:
+            self._restored.discard(username)
+            self.session_store.record_restore(valid, time.monotonic() - start)
+            if not valid:
+                self.session_store.delete(username)
+
+        if valid:
+            return response
+        return self.login(username, password)
+
+    def get_vote_rows(self, username, password):
+        """Zeilen der Vote-Tabelle oder None falls /vote nicht erreichbar"""
+        response = self.fetch_vote_page(username, password)
+        if response is None:
+            return None
+        return parse_vote_rows(response.text)
+
+    def get_coins(self, username):
+        """Vote-Coins von /ucp ("Current Vote-Coins") oder None - setzt eine eingeloggte Session voraus"""
+        session = self.get_session(username)
+        try:
+            response = session.get(f'{self.base_url}/ucp', timeout=self.timeout)
+        except requests.RequestException as e:
+            logging.warning(f"🌐 {username}: /ucp per HTTP nicht erreichbar: {e}")
+            return None
+        if not response.ok:
+            return None
+        return parse_coins(response.text)
+
+    def drop_session(self, username):
+        """HTTP-Session eines Accounts schließen (z.B. nach Entfernen aus accounts.json)"""
+        session = self.sessions.pop(username, None)
+        if session is not None:
+            session.close()
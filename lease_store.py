@@ -0,0 +1,145 @@
+import os
+import time
+import socket
+import sqlite3
+import hashlib
+import logging
+import threading
+
+
+class LeaseManager:
+    """Zeitlich begrenzte Account-Leases in einer geteilten SQLite-Datei - mehrere Worker teilen sich die Accounts
+
+    Zuständig ist per Rendezvous-Hashing der Worker mit dem höchsten Hash unter allen lebenden
+    Workern; ausgeschlossen wird doppelte Verarbeitung durch die Lease. Stirbt ein Worker, fällt er
+    nach ttl aus der Liste der lebenden Worker und seine Leases laufen ab.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS leases (
+            username   TEXT PRIMARY KEY,
+            owner      TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS workers (
+            worker_id  TEXT PRIMARY KEY,
+            last_seen  REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path, worker_id=None, ttl=300):
+        self.path = path
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.ttl = ttl
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA busy_timeout=30000')
+        self._conn.executescript(self.SCHEMA)
+
+        self._held = set()
+        self._live_workers = [self.worker_id]
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Metriken
+        self.acquired = 0
+        self.contended = 0
+        self.lost = 0
+
+    def start(self):
+        """Worker registrieren und Heartbeat starten (erneuert Leases alle ttl/3 Sekunden)"""
+        self.heartbeat()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='lease-heartbeat', daemon=True)
+            self._thread.start()
+        logging.info(f"🧩 Sharding aktiv: Worker '{self.worker_id}', {len(self._live_workers)} Worker aktiv")
+
+    def _run(self):
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                self.heartbeat()
+            except sqlite3.Error as e:
+                logging.warning(f"⚠️ Lease-Heartbeat fehlgeschlagen: {e}")
+
+    def heartbeat(self):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT INTO workers (worker_id, last_seen) VALUES (?, ?) '
+                               'ON CONFLICT (worker_id) DO UPDATE SET last_seen = excluded.last_seen', (self.worker_id, now))
+
+            held = list(self._held)
+            if held:
+                self._conn.executemany('UPDATE leases SET expires_at = ? WHERE username = ? AND owner = ?',
+                                       [(now + self.ttl, username, self.worker_id) for username in held])
+
+            # Aufräumen: abgelaufene Leases und lange tote Worker
+            self._conn.execute('DELETE FROM leases WHERE expires_at < ?', (now - self.ttl,))
+            self._conn.execute('DELETE FROM workers WHERE last_seen < ?', (now - 10 * self.ttl,))
+
+            live = [row[0] for row in self._conn.execute('SELECT worker_id FROM workers WHERE last_seen >= ? ORDER BY worker_id',
+                                                         (now - self.ttl,))]
+        if set(live) != set(self._live_workers):
+            logging.info(f"🧩 Aktive Worker: {', '.join(live)}")
+        self._live_workers = live or [self.worker_id]
+
+    def is_mine(self, username):
+        """Rendezvous-Hashing: zuständig ist der lebende Worker mit dem höchsten Hash für diesen Account"""
+        def score(worker_id):
+            return hashlib.sha1(f'{worker_id}|{username}'.encode()).digest()
+        return max(self._live_workers, key=score) == self.worker_id
+
+    def acquire(self, username):
+        """Lease atomar übernehmen - nur wenn frei, abgelaufen oder bereits eigene"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute("""
+                INSERT INTO leases (username, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (username) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.expires_at < ? OR leases.owner = excluded.owner
+            """, (username, self.worker_id, now + self.ttl, now))
+            if cursor.rowcount != 1:
+                self.contended += 1
+                return False
+            self._held.add(username)
+            self.acquired += 1
+            return True
+
+    def release(self, username):
+        with self._lock:
+            self._held.discard(username)
+            self._conn.execute('DELETE FROM leases WHERE username = ? AND owner = ?', (username, self.worker_id))
+
+    def still_owned(self, username):
+        """Prüfen ob die Lease noch diesem Worker gehört (z.B. vor dem Speichern)"""
+        with self._lock:
+            row = self._conn.execute('SELECT owner, expires_at FROM leases WHERE username = ?', (username,)).fetchone()
+        owned = row is not None and row[0] == self.worker_id and row[1] >= time.time()
+        if not owned and username in self._held:
+            self.lost += 1
+        return owned
+
+    def close(self):
+        """Heartbeat stoppen, eigene Leases freigeben und Worker abmelden"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        with self._lock:
+            self._conn.execute('DELETE FROM leases WHERE owner = ?', (self.worker_id,))
+            self._conn.execute('DELETE FROM workers WHERE worker_id = ?', (self.worker_id,))
+            self._held.clear()
+            self._conn.close()
+
+    def stats(self):
+        return {
+            'live_workers': len(self._live_workers),
+            'held': len(self._held),
+            'acquired': self.acquired,
+            'contended': self.contended,
+            'lost': self.lost,
+        }
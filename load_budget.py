@@ -0,0 +1,127 @@
+import os
+import time
+import zlib
+import logging
+import threading
+from contextlib import contextmanager
+
+
+def stable_jitter(key, max_seconds):
+    """Deterministischer Versatz in [0, max_seconds) - gleich für denselben Schlüssel, verschieden zwischen Accounts"""
+    if not max_seconds:
+        return 0.0
+    return zlib.crc32(str(key).encode()) % 10000 / 10000 * max_seconds
+
+
+def available_memory_mb():
+    """MemAvailable aus /proc/meminfo in MB oder None"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class LoadBudget:
+    """Hält neue Browser-Sessions zurück, solange CPU-Last oder freier Speicher außerhalb des Budgets liegen
+
+    Ein gerade startender Chrome taucht erst nach Sekunden in Loadavg und MemAvailable auf. Zugelassene,
+    aber noch nicht gestartete Sessions werden deshalb mit session_load (CPUs) bzw. session_mb
+    vorab angerechnet - sonst passieren alle parallelen Worker die Prüfung, bevor der erste Browser läuft.
+    """
+
+    def __init__(self, max_load_per_cpu=None, min_available_mb=None, poll_interval=1, max_wait=120,
+                 session_load=1.0, session_mb=300):
+        self.max_load_per_cpu = max_load_per_cpu
+        self.min_available_mb = min_available_mb
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.session_load = session_load
+        self.session_mb = session_mb
+        self._lock = threading.Lock()
+        self._admission = threading.Condition()
+        self.starting = 0   # zugelassen, Browser noch nicht gestartet
+
+        # Metriken
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self.timeouts = 0
+
+    @property
+    def enabled(self):
+        return self.max_load_per_cpu is not None or self.min_available_mb is not None
+
+    def over_budget(self, starting=0):
+        """Grund als Text wenn das Budget (inkl. starting noch startender Sessions) überschritten ist, sonst None"""
+        if self.max_load_per_cpu is not None:
+            cpus = os.cpu_count() or 1
+            try:
+                load_per_cpu = (os.getloadavg()[0] + starting * self.session_load) / cpus
+            except OSError:
+                load_per_cpu = None
+            if load_per_cpu is not None and load_per_cpu > self.max_load_per_cpu:
+                return f"Last {load_per_cpu:.2f}/CPU > {self.max_load_per_cpu} ({starting} Session(s) im Start)"
+
+        if self.min_available_mb is not None:
+            available = available_memory_mb()
+            if available is not None:
+                available -= starting * self.session_mb
+                if available < self.min_available_mb:
+                    return f"freier Speicher {available:.0f} MB < {self.min_available_mb} MB ({starting} Session(s) im Start)"
+        return None
+
+    def wait(self):
+        """Warten bis wieder Kapazität frei ist (höchstens max_wait Sekunden) und einen Startplatz reservieren
+
+        Prüfung und Reservierung passieren unter einem Lock; die Reservierung gibt release() frei,
+        sobald der Browser läuft (oder sein Start fehlgeschlagen ist). Gibt die Wartezeit zurück.
+        """
+        start = time.monotonic()
+        logged = False
+        with self._admission:
+            reason = self.over_budget(self.starting) if self.enabled else None
+            while reason is not None:
+                if not logged:
+                    logging.info(f"🚦 Lastbudget überschritten ({reason}) - neue Session wird zurückgehalten")
+                    logged = True
+                if time.monotonic() - start >= self.max_wait:
+                    logging.warning(f"🚦 Lastbudget nach {self.max_wait}s noch überschritten ({reason}) - Session startet trotzdem")
+                    with self._lock:
+                        self.timeouts += 1
+                    break
+                # Wartet auf release() anderer Worker oder das nächste Poll-Intervall
+                self._admission.wait(self.poll_interval)
+                reason = self.over_budget(self.starting)
+            self.starting += 1
+
+        waited = time.monotonic() - start
+        if logged:
+            with self._lock:
+                self.waits += 1
+                self.waited_seconds += waited
+        return waited
+
+    def release(self):
+        """Reservierung aus wait() freigeben - der Browser läuft und zählt jetzt in Last/Speicher"""
+        with self._admission:
+            self.starting = max(0, self.starting - 1)
+            self._admission.notify_all()
+
+    @contextmanager
+    def admit(self):
+        """wait() + release() um den Start einer Browser-Session"""
+        self.wait()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        return {
+            'waits': self.waits,
+            'waited_seconds': self.waited_seconds,
+            'timeouts': self.timeouts,
+        }
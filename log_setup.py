@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Fremde Bibliotheken loggen auf DEBUG jeden WebDriver-/HTTP-Request - nur auf Wunsch anzeigen
+DEFAULT_MODULE_LEVELS = {
+    'selenium': logging.WARNING,
+    'urllib3': logging.WARNING,
+}
+
+
+def parse_level(value):
+    """'DEBUG', 'info' oder '10' -> Level-Nummer"""
+    if isinstance(value, int):
+        return value
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unbekanntes Log-Level: {value}")
+    return level
+
+
+def parse_module_levels(spec):
+    """'vote_bot=DEBUG,selenium=WARNING' -> {Modul: Level}"""
+    levels = {}
+    for entry in (spec or '').split(','):
+        if not entry.strip():
+            continue
+        module, _, level = entry.partition('=')
+        if not level:
+            raise ValueError(f"Erwartet Modul=Level, erhalten: '{entry}'")
+        levels[module.strip()] = parse_level(level)
+    return levels
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Eine kompakte JSON-Zeile pro Eintrag"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'module': record.module,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """Level pro Modul für Einträge des Root-Loggers (alle Module hier loggen über logging.info & Co.)"""
+
+    def __init__(self, default_level, module_levels):
+        super().__init__()
+        self.default_level = default_level
+        self.module_levels = module_levels
+
+    def filter(self, record):
+        # Eigene Module über den Dateinamen, fremde Bibliotheken (selenium, urllib3, ...) über das Paket des Loggers
+        key = record.module if record.name == 'root' else record.name.split('.')[0]
+        return record.levelno >= self.module_levels.get(key, self.default_level)
+
+
+class RotatingLogFile(RotatingFileHandler):
+    """Rotation nach Größe und zusätzlich einmal täglich um Mitternacht (vote_bot.log.1 ist die jüngste)"""
+
+    def __init__(self, filename, max_bytes, backup_count, rotate_daily=True, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.rotate_daily = rotate_daily
+        self.next_rollover = self._next_midnight() if rotate_daily else None
+
+    @staticmethod
+    def _next_midnight():
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record):
+        if self.next_rollover is not None and time.time() >= self.next_rollover:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.rotate_daily:
+            self.next_rollover = self._next_midnight()
+
+
+class LogThrottle:
+    """Gleichartige Meldungen pro Schlüssel höchstens alle interval Sekunden - dazwischen nur auf DEBUG"""
+
+    def __init__(self, interval=900, max_keys=10000):
+        self.interval = interval
+        self.max_keys = max_keys
+        self._last = {}
+        self._suppressed = {}
+        self._lock = threading.Lock()
+
+        # Metriken
+        self.suppressed = 0
+
+    def log(self, key, level, msg):
+        """Meldung loggen oder unterdrücken - True wenn sie auf dem gewünschten Level ausgegeben wurde"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self.suppressed += 1
+                allowed = False
+            else:
+                if len(self._last) >= self.max_keys:
+                    self._prune(now)
+                self._last[key] = now
+                count = self._suppressed.pop(key, 0)
+                allowed = True
+
+        # stacklevel=2: Modul/Zeile des Aufrufers statt log_setup
+        if not allowed:
+            logging.log(logging.DEBUG, msg, stacklevel=2)
+            return False
+        if count:
+            msg = f"{msg} ({count}x seit der letzten Meldung unterdrückt)"
+        logging.log(level, msg, stacklevel=2)
+        return True
+
+    def _prune(self, now):
+        for key in [key for key, last in self._last.items() if now - last >= self.interval]:
+            del self._last[key]
+            self._suppressed.pop(key, None)
+
+
+class LogListener(QueueListener):
+    """QueueListener, der mehrfach gestoppt werden darf (atexit und expliziter Aufruf)"""
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+
+
+def setup_logging(log_file='vote_bot.log', level=logging.INFO, module_levels=None, json_lines=False,
+                  max_bytes=10 * 1024 * 1024, backup_count=5, rotate_daily=True, stream=sys.stderr):
+    """Root-Logger auf eine Queue umstellen - Datei und Konsole schreibt ein QueueListener-Thread
+
+    Gibt den gestarteten Listener zurück; beim Beenden des Prozesses wird er per atexit geleert.
+    """
+    level = parse_level(level)
+    module_levels = dict(DEFAULT_MODULE_LEVELS, **(module_levels or {}))
+    formatter = JsonLinesFormatter() if json_lines else logging.Formatter(DEFAULT_FORMAT)
+
+    handlers = []
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = RotatingLogFile(log_file, max_bytes=max_bytes, backup_count=backup_count, rotate_daily=rotate_daily)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if stream is not None:
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ModuleLevelFilter(level, module_levels))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    # Root muss das niedrigste Modul-Level durchlassen, den Rest filtert ModuleLevelFilter
+    root.setLevel(min([level, *module_levels.values()]))
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    listener = LogListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,217 @@
+import os
+import time
+import logging
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bucket-Grenzen (Sekunden) der Phasen-Histogramme - vom schnellen Parse bis zum kompletten Browser-Zyklus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Latenzen über ganze Durchläufe bzw. bis zum Vote (Sekunden bis Stunden) - eigene Metrik statt phase_duration_seconds
+LATENCY_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200, 14400, 28800, 86400)
+LATENCY_METRICS = {
+    # Phase: (Metrikname ohne Präfix, Beschreibung)
+    'cycle': ('account_cycle_seconds', 'Dauer eines Account-Durchlaufs mit Browser'),
+    'due_to_voted': ('due_to_voted_seconds', 'Zeit von der Fälligkeit bis zum erfolgreichen Vote'),
+}
+
+
+class Histogram:
+    """Kumulatives Histogramm im Prometheus-Format plus die letzten Messwerte für Quantile in der Zusammenfassung"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, recent=1000):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=recent)
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class Metrics:
+    """Timing-Spans, Zähler und Histogramme des Bots - thread-sicher, Ausgabe als Prometheus-Text oder Log-Zusammenfassung"""
+
+    def __init__(self, prefix='votebot', latency_metrics=LATENCY_METRICS):
+        self.prefix = prefix
+        self.latency_metrics = latency_metrics
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = {}
+
+    @contextmanager
+    def span(self, phase):
+        """Dauer einer Phase messen - auch wenn sie mit einer Exception endet"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('phase_errors_total', phase=phase)
+            raise
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                buckets = LATENCY_BUCKETS if phase in self.latency_metrics else DEFAULT_BUCKETS
+                histogram = self._histograms[phase] = Histogram(buckets)
+            histogram.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def add_collector(self, name, func):
+        """Zusätzliche Gauges beim Export: func() liefert ein Dict wie DriverPool.stats()"""
+        self._collectors[name] = func
+
+    def phase_stats(self):
+        """{Phase: {'count', 'avg_seconds', 'p50_seconds', 'p95_seconds'}}"""
+        with self._lock:
+            return {
+                phase: {
+                    'count': histogram.count,
+                    'avg_seconds': histogram.sum / histogram.count if histogram.count else 0.0,
+                    'p50_seconds': histogram.quantile(0.5),
+                    'p95_seconds': histogram.quantile(0.95),
+                }
+                for phase, histogram in self._histograms.items()
+            }
+
+    def counters(self):
+        """{Name: Summe über alle Labels} für die Log-Zusammenfassung"""
+        totals = {}
+        with self._lock:
+            for (name, _), value in self._counters.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def render(self):
+        """Alle Metriken im Prometheus/OpenMetrics-Textformat"""
+        lines = []
+        name = f'{self.prefix}_phase_duration_seconds'
+        with self._lock:
+            lines.append(f'# HELP {name} Dauer der einzelnen Bot-Phasen')
+            lines.append(f'# TYPE {name} histogram')
+            for phase, histogram in sorted(self._histograms.items()):
+                if phase not in self.latency_metrics:
+                    _render_histogram(lines, name, histogram, f'phase="{phase}"')
+
+            for phase, (metric, description) in sorted(self.latency_metrics.items()):
+                histogram = self._histograms.get(phase)
+                if histogram is None:
+                    continue
+                full_name = f'{self.prefix}_{metric}'
+                lines.append(f'# HELP {full_name} {description}')
+                lines.append(f'# TYPE {full_name} histogram')
+                _render_histogram(lines, full_name, histogram)
+
+            seen = set()
+            for (counter, labels), value in sorted(self._counters.items()):
+                full_name = f'{self.prefix}_{counter}'
+                if full_name not in seen:
+                    lines.append(f'# TYPE {full_name} counter')
+                    seen.add(full_name)
+                lines.append(f'{full_name}{_format_labels(labels)} {value}')
+
+        for collector, func in sorted(self._collectors.items()):
+            try:
+                stats = func()
+            except Exception as e:
+                logging.debug(f"Metrik-Collector '{collector}' fehlgeschlagen: {e}")
+                continue
+            for key, value in sorted(stats.items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                gauge = f'{self.prefix}_{collector}_{key}'
+                lines.append(f'# TYPE {gauge} gauge')
+                lines.append(f'{gauge} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _render_histogram(lines, name, histogram, labels=''):
+    prefix = f'{labels},' if labels else ''
+    suffix = f'{{{labels}}}' if labels else ''
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    lines.append(f'{name}_sum{suffix} {histogram.sum}')
+    lines.append(f'{name}_count{suffix} {histogram.count}')
+
+
+def process_uptime():
+    """Sekunden seit Start des Prozesses (Linux: /proc/self/stat), sonst None"""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def timed(phase):
+    """Methoden-Decorator: Laufzeit als Span in self.metrics erfassen"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(metrics, port, host='127.0.0.1'):
+    """/metrics-Endpoint in einem Daemon-Thread starten (host 0.0.0.0: auch von außerhalb des Containers erreichbar)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    logging.info(f"📈 Metriken unter http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,293 @@
+import html
+import json
+import time
+import random
+import secrets
+import threading
+import logging
+import pytz
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+GERMANY_TZ = pytz.timezone('Europe/Berlin')
+
+
+class MockSiteState:
+    """Zustand der Mock-Seite: Accounts, Sessions, Coins und Next-Vote Zeiten pro Vote-Seite"""
+
+    def __init__(self, accounts=None, sites=('TopG', 'Gtop100'), coins_per_vote=1, cooldown=timedelta(hours=24),
+                 latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        self.lock = threading.Lock()
+        self.passwords = dict(accounts or {})
+        self.sites = list(sites)
+        self.coins_per_vote = coins_per_vote
+        self.cooldown = cooldown
+
+        self.sessions = {}
+        self.coins = {username: 100 for username in self.passwords}
+        self.next_vote = {}
+        self.pending_votes = {}
+        # Verstecktes Formularfeld, das beim Login mitgeschickt werden muss (wie das Token der echten Seite)
+        self.login_token = 'mock'
+        # (username, Vote-Seite) mit nicht parsebarer Next-Vote Zeit
+        self.unparseable = set()
+
+        # Fehlerinjektion: Verzögerung (+ gleichverteilter Jitter) pro Anfrage und Anteil der Seiten mit HTTP 500
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+        # Webhook-Empfänger: empfangene Payloads, jede n-te Anfrage mit 429 beantworten
+        self.webhooks = []
+        self.webhook_429_every = 0
+        self.webhook_retry_after = 0.1
+        self._webhook_requests = 0
+
+        # Zähler für Auswertungen
+        self.logins = 0
+        self.votes = 0
+        self.page_views = 0
+        self.injected_failures = 0
+
+    def add_account(self, username, password, coins=100):
+        with self.lock:
+            self.passwords[username] = password
+            self.coins[username] = coins
+
+    def set_next_vote(self, username, site, when):
+        with self.lock:
+            self.next_vote[(username, site)] = when
+
+    def get_next_vote(self, username, site):
+        # Ohne Eintrag: Vote war zuletzt vor über 24h möglich
+        return self.next_vote.get((username, site)) or (datetime.now(GERMANY_TZ) - timedelta(minutes=5))
+
+    def reset_votes(self):
+        """Alle Vote-Seiten wieder fällig machen (z.B. zwischen Benchmark-Durchläufen)"""
+        with self.lock:
+            self.next_vote.clear()
+            self.pending_votes.clear()
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    """Bildet /login, /home, /vote, /ucp und /auth/logout der echten Seite nach"""
+
+    server_version = 'MockAlturi/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logging.debug(f"Mock-Site: {format % args}")
+
+    # === Hilfsfunktionen ===
+
+    def _current_user(self):
+        cookies = self.headers.get('Cookie', '')
+        for part in cookies.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == 'session':
+                return self.state.sessions.get(value)
+        return None
+
+    def _send_html(self, body, status=200, headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _page(self, title, content, username=None):
+        nav = ''
+        if username:
+            nav = (f'<div class="navbar">Current Vote-Coins: <span style="color:red">{self.state.coins.get(username, 0)}</span>'
+                   f' <a href="/ucp">UCP</a></div>')
+        return f'<!DOCTYPE html><html><head><title>{title}</title></head><body>{nav}{content}</body></html>'
+
+    def _inject(self):
+        """Konfigurierte Latenz anwenden; True wenn stattdessen ein Fehler gesendet wurde"""
+        with self.state.lock:
+            delay = self.state.latency + self.state.random.uniform(0, self.state.jitter) if self.state.jitter else self.state.latency
+            fail = self.state.failure_rate and self.state.random.random() < self.state.failure_rate
+            if fail:
+                self.state.injected_failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send_html(self._page('Error', '<h1>500 Internal Server Error</h1>'), status=500)
+        return fail
+
+    def _read_form(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        return {key: values[0] for key, values in parse_qs(body, keep_blank_values=True).items()}
+
+    # === Routing ===
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        with self.state.lock:
+            self.state.page_views += 1
+        if self._inject():
+            return
+
+        if path == '/login':
+            return self._send_html(self._page('Login', (
+                '<form method="post" action="/login">'
+                f'<input type="hidden" name="token" value="{self.state.login_token}">'
+                '<input type="text" name="user"><input type="password" name="pass">'
+                '<button type="submit" name="goingin">Login</button>'
+                '</form>')))
+
+        if path in ('/', '/home'):
+            return self._send_html(self._page('Home', '<h1>Home</h1>', self._current_user()))
+
+        username = self._current_user()
+        if username is None:
+            return self._redirect('/home')
+
+        if path == '/vote':
+            return self._send_html(self._page('Vote', self._vote_content(username), username))
+
+        if path.startswith('/vote/out/'):
+            site = path.rsplit('/', 1)[1]
+            with self.state.lock:
+                self.state.pending_votes[username] = site
+            return self._send_html(f'<html><body><h1>{html.escape(site)}</h1></body></html>')
+
+        if path == '/ucp':
+            logout = f'<a href="{self.server.base_url}/auth/logout">Logout</a>'
+            return self._send_html(self._page('UCP', f'<h1>UCP</h1>{logout}', username))
+
+        if path == '/auth/logout':
+            self._drop_session()
+            return self._redirect('/home')
+
+        self._send_html(self._page('Not Found', '<h1>404</h1>'), status=404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == '/webhook':
+            return self._receive_webhook()
+        form = self._read_form()
+        if self._inject():
+            return
+
+        if path == '/login':
+            username = form.get('user', '')
+            if ('goingin' in form and form.get('token') == self.state.login_token
+                    and self.state.passwords.get(username) == form.get('pass')):
+                token = secrets.token_hex(16)
+                with self.state.lock:
+                    self.state.sessions[token] = username
+                    self.state.logins += 1
+                return self._redirect('/home', {'Set-Cookie': f'session={token}; Path=/; HttpOnly'})
+            return self._redirect('/login')
+
+        username = self._current_user()
+        if path == '/vote/confirm' and username:
+            self._confirm_vote(username)
+            return self._redirect('/vote')
+
+        self._redirect('/home')
+
+    def _receive_webhook(self):
+        """Discord-Webhook-Stub: 204 bzw. 429 mit retry_after"""
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+
+        with self.state.lock:
+            self.state._webhook_requests += 1
+            rate_limited = self.state.webhook_429_every and self.state._webhook_requests % self.state.webhook_429_every == 0
+            if not rate_limited:
+                self.state.webhooks.append(payload)
+
+        if rate_limited:
+            body = json.dumps({'message': 'You are being rate limited.', 'retry_after': self.state.webhook_retry_after}).encode()
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _drop_session(self):
+        cookies = self.headers.get('Cookie', '')
+        for part in cookies.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == 'session':
+                with self.state.lock:
+                    self.state.sessions.pop(value, None)
+
+    def _confirm_vote(self, username):
+        with self.state.lock:
+            site = self.state.pending_votes.pop(username, None)
+            if site is None:
+                return
+            now = datetime.now(GERMANY_TZ)
+            if self.state.get_next_vote(username, site) + timedelta(minutes=1) <= now:
+                self.state.coins[username] = self.state.coins.get(username, 0) + self.state.coins_per_vote
+                self.state.next_vote[(username, site)] = now + self.state.cooldown
+                self.state.votes += 1
+
+    def _vote_content(self, username):
+        rows = []
+        for site in self.state.sites:
+            next_vote = self.state.get_next_vote(username, site).strftime('%d.%m.%Y %H:%M')
+            if (username, site) in self.state.unparseable:
+                next_vote = 'demnächst'
+            rows.append(
+                f'<tr><td><a href="/vote/out/{site}" target="_blank">{html.escape(site)}</a></td>'
+                f'<td>Vote-Coins: {self.state.coins_per_vote}<br>Next vote: {next_vote} Uhr</td></tr>'
+            )
+
+        confirm = ''
+        if username in self.state.pending_votes:
+            confirm = ('<form method="post" action="/vote/confirm">'
+                       '<button type="submit" id="confirm-vote">Confirm Vote</button></form>')
+
+        return (f'{confirm}<table class="table"><thead><tr><th>Site</th><th>Status</th></tr></thead>'
+                f'<tbody>{"".join(rows)}</tbody></table>')
+
+
+class MockSiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, state, host='127.0.0.1', port=0):
+        super().__init__((host, port), MockSiteHandler)
+        self.state = state
+        self.base_url = f'http://{host}:{self.server_address[1]}'
+
+
+def start_mock_site(state=None, host='127.0.0.1', port=0):
+    """Starte Mock-Seite in einem Hintergrund-Thread und gib den Server zurück (base_url, shutdown())"""
+    server = MockSiteServer(state or MockSiteState(), host, port)
+    thread = threading.Thread(target=server.serve_forever, name='mock-site', daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = MockSiteServer(MockSiteState({'test': 'test'}), port=8080)
+    logging.info(f"Mock-Site läuft auf {server.base_url} (Login: test/test)")
+    server.serve_forever()
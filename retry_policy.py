@@ -0,0 +1,210 @@
+import time
+import random
+import logging
+import threading
+from datetime import timedelta
+from typing import NamedTuple, Optional
+
+# Fehlerklassen
+BAD_CREDENTIALS = 'bad_credentials'
+TIMEOUT = 'timeout'
+SELECTOR_MISSING = 'selector_missing'
+PARSE_FAILURE = 'parse_failure'
+BROWSER_CRASH = 'browser_crash'
+VOTE_REJECTED = 'vote_rejected'
+UNKNOWN = 'unknown'
+
+# Geltungsbereiche der Circuit-Breaker
+ACCOUNT = 'account'
+SITE = 'site'
+
+
+class RetryPolicy(NamedTuple):
+    """Backoff pro Fehlerklasse: base * 2^(n-1) bis max_delay, ab threshold Fehlern in Folge ist der Breaker cooldown lang offen"""
+    base: float
+    max_delay: float
+    threshold: int
+    cooldown: float
+
+
+class RetryState(NamedTuple):
+    kind: str
+    failures: int              # Fehler in Folge (über alle Klassen)
+    retry_at: float            # Unix-Timestamp des nächsten erlaubten Versuchs
+    last_error: Optional[str]
+
+
+DEFAULT_POLICIES = {
+    # Falsches Passwort behebt sich nicht von selbst - früh abschalten statt stündlich Browser zu starten
+    BAD_CREDENTIALS: RetryPolicy(base=3600, max_delay=6 * 3600, threshold=3, cooldown=24 * 3600),
+    TIMEOUT: RetryPolicy(base=120, max_delay=1800, threshold=6, cooldown=3600),
+    SELECTOR_MISSING: RetryPolicy(base=600, max_delay=3 * 3600, threshold=4, cooldown=6 * 3600),
+    PARSE_FAILURE: RetryPolicy(base=300, max_delay=2 * 3600, threshold=4, cooldown=6 * 3600),
+    BROWSER_CRASH: RetryPolicy(base=60, max_delay=900, threshold=5, cooldown=1800),
+    VOTE_REJECTED: RetryPolicy(base=600, max_delay=2 * 3600, threshold=3, cooldown=6 * 3600),
+    UNKNOWN: RetryPolicy(base=120, max_delay=3600, threshold=5, cooldown=3600),
+}
+
+# Klassifizierung über Klassennamen - Selenium/requests müssen dafür nicht importiert sein
+_TIMEOUT_NAMES = {'TimeoutException', 'Timeout', 'ReadTimeout', 'ConnectTimeout', 'TimeoutError', 'timeout'}
+_SELECTOR_NAMES = {'NoSuchElementException', 'StaleElementReferenceException', 'ElementNotInteractableException',
+                   'ElementClickInterceptedException', 'InvalidSelectorException'}
+_CRASH_NAMES = {'InvalidSessionIdException', 'SessionNotCreatedException', 'NoSuchWindowException', 'MaxRetryError',
+                'ConnectionRefusedError', 'NewConnectionError'}
+_CRASH_MESSAGES = ('chrome not reachable', 'session deleted', 'disconnected', 'crashed', 'no such session',
+                   'cannot connect to chrome', 'connection refused', 'max retries exceeded')
+_PARSE_NAMES = {'ValueError', 'KeyError', 'IndexError', 'TypeError'}
+
+
+def classify_exception(exc):
+    """Fehlerklasse einer Exception"""
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if names & _CRASH_NAMES:
+        return BROWSER_CRASH
+    if 'WebDriverException' in names and any(message in str(exc).lower() for message in _CRASH_MESSAGES):
+        return BROWSER_CRASH
+    if names & _TIMEOUT_NAMES:
+        return TIMEOUT
+    if names & _SELECTOR_NAMES:
+        return SELECTOR_MISSING
+    if names & _PARSE_NAMES:
+        return PARSE_FAILURE
+    return UNKNOWN
+
+
+class RetryManager:
+    """Exponentielles Backoff mit Jitter und Circuit-Breaker pro Account und pro Vote-Seite
+
+    Accounts pausieren ab dem ersten Fehler; Vote-Seiten werden erst gesperrt wenn der Breaker
+    offen ist (threshold Fehler in Folge über alle Accounts), damit ein einzelner Account-Fehler
+    nicht alle anderen Accounts blockiert. Nach Ablauf ist genau ein Versuch erlaubt (half-open):
+    Erfolg schließt den Breaker, ein weiterer Fehler öffnet ihn erneut.
+    """
+
+    def __init__(self, store=None, policies=None, jitter=0.2):
+        self.store = store
+        self.policies = dict(DEFAULT_POLICIES, **(policies or {}))
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._states = {}
+
+        # Metriken
+        self.failures_by_kind = {}
+        self.breakers_opened = 0
+
+        if store is not None:
+            self.refresh()
+            if self._states:
+                logging.info(f"🧯 {len(self._states)} Backoff-/Breaker-Einträge geladen")
+
+    def refresh(self):
+        """Zustände neu aus dem Store lesen - andere Worker auf derselben Datenbank (Sharding) schreiben mit"""
+        if self.store is None:
+            return
+        states = {(scope, key): RetryState(kind, failures, retry_at, last_error)
+                  for scope, key, kind, failures, retry_at, last_error in self.store.load_retry_state()}
+        with self._lock:
+            self._states = states
+
+    def policy(self, kind):
+        return self.policies.get(kind, self.policies[UNKNOWN])
+
+    def _is_open(self, state):
+        return state.failures >= self.policy(state.kind).threshold
+
+    def state(self, scope, key):
+        with self._lock:
+            return self._states.get((scope, key))
+
+    def _blocked(self, scope, key, now):
+        state = self._states.get((scope, key))
+        if state is None or state.retry_at <= now:
+            return None
+        if scope == SITE and not self._is_open(state):
+            return None
+        return state
+
+    def blocked_until(self, username, sites=(), now=None):
+        """(Timestamp, Grund) bis zu dem der Account nicht verarbeitet werden soll, sonst None
+
+        Gesperrt ist ein Account durch sein eigenes Backoff oder wenn alle fälligen Vote-Seiten
+        einen offenen Breaker haben.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._blocked(ACCOUNT, username, now)
+            if state is not None:
+                return state.retry_at, f"{state.kind}, {state.failures} Fehler in Folge"
+
+            sites = list(sites)
+            site_states = [self._blocked(SITE, site, now) for site in sites]
+            if sites and all(site_states):
+                return min(state.retry_at for state in site_states), f"Breaker offen für {', '.join(sites)}"
+        return None
+
+    def site_blocked_until(self, site, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._blocked(SITE, site, now)
+        return state.retry_at if state else None
+
+    def record_failure(self, scope, key, kind, error=None):
+        """Fehler zählen, nächsten Versuch festlegen und persistieren - liefert den neuen RetryState"""
+        policy = self.policy(kind)
+        now = time.time()
+        with self._lock:
+            previous = self._states.get((scope, key))
+            failures = (previous.failures if previous else 0) + 1
+
+            if failures >= policy.threshold:
+                delay = policy.cooldown
+            else:
+                delay = min(policy.max_delay, policy.base * 2 ** (failures - 1))
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+            state = RetryState(kind, failures, now + delay, str(error)[:500] if error else None)
+            self._states[(scope, key)] = state
+            self.failures_by_kind[kind] = self.failures_by_kind.get(kind, 0) + 1
+            opened = failures == policy.threshold
+            if opened:
+                self.breakers_opened += 1
+
+        label = 'Account' if scope == ACCOUNT else 'Vote-Seite'
+        if opened:
+            logging.error(f"🧯 Circuit-Breaker offen für {label} '{key}' ({kind}, {failures} Fehler in Folge) - "
+                          f"nächster Versuch in {timedelta(seconds=round(delay))}")
+        elif scope == ACCOUNT or self._is_open(state):
+            logging.warning(f"🧯 {label} '{key}': {kind} ({failures}. Fehler in Folge) - nächster Versuch in {timedelta(seconds=round(delay))}")
+        else:
+            logging.info(f"🧯 {label} '{key}': {kind} ({failures}/{policy.threshold} bis zum Breaker)")
+        self._persist(scope, key, state)
+        return state
+
+    def record_success(self, scope, key):
+        """Erfolg schließt den Breaker und setzt das Backoff zurück"""
+        with self._lock:
+            previous = self._states.pop((scope, key), None)
+        if previous is None:
+            return
+        if self._is_open(previous):
+            logging.info(f"🧯 Circuit-Breaker für '{key}' wieder geschlossen")
+        self._persist(scope, key, None)
+
+    def _persist(self, scope, key, state):
+        if self.store is None:
+            return
+        try:
+            self.store.save_retry_state(scope, key, state)
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern des Retry-Zustands für '{key}': {e}")
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            states = list(self._states.items())
+        return {
+            'accounts_backoff': sum(1 for (scope, _), state in states if scope == ACCOUNT and state.retry_at > now),
+            'breakers_open': sum(1 for _, state in states if state.retry_at > now and self._is_open(state)),
+            'breakers_opened': self.breakers_opened,
+            'failures': sum(self.failures_by_kind.values()),
+        }
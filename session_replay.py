@@ -0,0 +1,405 @@
+"""Record/Replay von Browser-Sessions: Parser- und Ablaufänderungen offline gegen echte Seiten prüfen
+
+Recording (VOTEBOT_RECORD_DIR=recordings): Der Bot speichert pro verarbeitetem Account URL und
+HTML an jedem Schritt (Login, Vote-Seite, Confirm, ...) sowie das Ergebnis von check_and_vote
+unter recordings/<Zeit>-<Account>/. Zu jeder Seite werden die Parser-Ergebnisse (Vote-Zeilen,
+Next-Vote Zeiten, Coins) als Erwartung abgelegt. Aufnahmen enthalten Account-Daten (Name, Coins),
+aber weder Passwörter noch Cookies.
+
+Replay:
+
+    python session_replay.py check recordings/ [--update]     Parser über alle Seiten, Abweichungen zur Erwartung (ohne Browser)
+    python session_replay.py run recordings/<Aufnahme> [--repeat 3]   Bot gegen lokalen Replay-Server (Chrome nötig)
+    python session_replay.py serve recordings/<Aufnahme> [--port 8080]
+
+Der Replay-Server liefert die Seiten in aufgenommener Reihenfolge aus (pro Pfad die nächste
+Aufnahme, danach die zuletzt gelieferte), beantwortet Formular-POSTs mit einer Weiterleitung
+auf den nächsten aufgenommenen Schritt und schreibt absolute Links auf sich selbst um. Beim
+Replay läuft der Bot mit eingefrorener Uhr (Aufnahmezeitpunkt), ohne Pausen und mit kurzen
+Wait-Obergrenzen - also mit voller Geschwindigkeit.
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytz
+
+from vote_parser import DateTimeParser, parse_vote_rows, parse_coins, parse_red_span_coins
+
+GERMANY_TZ = pytz.timezone('Europe/Berlin')
+SESSION_FILE = 'session.json'
+EXTERNAL_PREFIX = '/_external/'
+
+_SCRIPT_RE = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.S | re.I)
+_ABSOLUTE_URL_RE = re.compile(r'''((?:href|src|action)\s*=\s*["'])(https?://[^"'/?#]+)''', re.I)
+
+
+def page_expectations(page_html, datetime_parser=None):
+    """Was die Parser aus einer Seite lesen: Vote-Zeilen mit Next-Vote Zeit und Coins"""
+    datetime_parser = datetime_parser or DateTimeParser(GERMANY_TZ)
+    rows = []
+    for row in parse_vote_rows(page_html):
+        parsed = datetime_parser.parse(row.next_vote_text) if row.next_vote_text else None
+        rows.append([row.site, row.next_vote_text, parsed.isoformat() if parsed else None])
+    coins = parse_coins(page_html)
+    if coins is None:
+        coins = parse_red_span_coins(page_html)
+    return {'rows': rows, 'coins': coins}
+
+
+def _safe_name(value):
+    return re.sub(r'[^\w.-]', '_', value)
+
+
+class SessionRecorder:
+    """Nimmt die Schritte einer Browser-Session eines Accounts auf"""
+
+    def __init__(self, root, username, base_url):
+        self.base_url = base_url.rstrip('/')
+        stamp = datetime.now(GERMANY_TZ).strftime('%Y%m%d-%H%M%S')
+        self.directory = os.path.join(root, f'{stamp}-{_safe_name(username)}')
+        suffix = 1
+        while os.path.exists(self.directory):
+            suffix += 1
+            self.directory = os.path.join(root, f'{stamp}-{_safe_name(username)}-{suffix}')
+        os.makedirs(self.directory)
+        self.session = {
+            'username': username,
+            'base_url': self.base_url,
+            'recorded_at': datetime.now(GERMANY_TZ).isoformat(),
+            'steps': [],
+            'result': None,
+        }
+        self._datetime_parser = DateTimeParser(GERMANY_TZ)
+
+    def snapshot(self, step, url, page_html=None):
+        """Schritt speichern - HTML nur für Seiten unter base_url (Vote-Tabs fremder Seiten nur als URL)"""
+        entry = {'step': step, 'url': url, 'ts': time.time(), 'page': None}
+        if page_html is not None and url.startswith(self.base_url):
+            entry['page'] = f"{len(self.session['steps']):03d}-{_safe_name(step)}.html"
+            with open(os.path.join(self.directory, entry['page']), 'w', encoding='utf-8') as f:
+                f.write(page_html)
+            entry['expect'] = page_expectations(page_html, self._datetime_parser)
+        self.session['steps'].append(entry)
+        self._save()
+
+    def finish(self, result):
+        """Ergebnis von check_and_vote (None = Fehler) als Referenz für den Replay speichern"""
+        if result is not None:
+            result = {
+                'voted': result['voted'],
+                'failed': result['failed'],
+                'skipped': result['skipped'],
+                'unparsed': result.get('unparsed', []),
+                'estimated': result.get('estimated', []),
+                'next_votes': {site: next_vote.isoformat() for site, next_vote in result['next_votes'].items()},
+            }
+        self.session['result'] = result
+        self._save()
+        logging.info(f"🎞️  Session mit {len(self.session['steps'])} Schritt(en) aufgenommen: {self.directory}")
+
+    def _save(self):
+        with open(os.path.join(self.directory, SESSION_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.session, f, indent=2, ensure_ascii=False)
+
+
+def load_recording(directory):
+    with open(os.path.join(directory, SESSION_FILE), 'r', encoding='utf-8') as f:
+        session = json.load(f)
+    session['directory'] = directory
+    for step in session['steps']:
+        step['path'] = replay_path(step['url'], session['base_url'])
+    return session
+
+
+def find_recordings(paths):
+    """Alle Aufnahme-Verzeichnisse (mit session.json) unter den angegebenen Pfaden"""
+    found = []
+    for path in paths:
+        for root, _, files in os.walk(path):
+            if SESSION_FILE in files:
+                found.append(root)
+    return sorted(found)
+
+
+def replay_path(url, base_url):
+    """Pfad, unter dem der Replay-Server eine aufgenommene URL ausliefert"""
+    parsed = urlparse(url)
+    if url.startswith(base_url):
+        return parsed.path or '/'
+    return f'{EXTERNAL_PREFIX}{parsed.netloc}{parsed.path or "/"}'
+
+
+def rewrite_html(page_html, recorded_base, replay_base, strip_scripts=True):
+    """Absolute Links auf den Replay-Server umschreiben, Skripte optional entfernen (kein Nachladen/Umleiten)"""
+    if strip_scripts:
+        page_html = _SCRIPT_RE.sub('', page_html)
+    recorded_origin = urlparse(recorded_base).netloc
+
+    def replace(match):
+        prefix, origin = match.groups()
+        host = urlparse(origin).netloc
+        if host == recorded_origin:
+            return prefix + replay_base
+        return f'{prefix}{replay_base}{EXTERNAL_PREFIX.rstrip("/")}/{host}'
+    return _ABSOLUTE_URL_RE.sub(replace, page_html)
+
+
+class ReplayState:
+    """Cursor über die aufgenommenen Schritte"""
+
+    def __init__(self, recording, strip_scripts=True):
+        self.recording = recording
+        self.steps = recording['steps']
+        self.strip_scripts = strip_scripts
+        self.lock = threading.Lock()
+        self.cursor = 0
+        self._pages = {}
+
+        # Metriken
+        self.served = 0
+        self.misses = 0
+
+    def reset(self):
+        with self.lock:
+            self.cursor = 0
+
+    def next_step(self, path):
+        """Nächster aufgenommener Schritt für den Pfad, sonst der zuletzt gelieferte, sonst None"""
+        with self.lock:
+            for i in range(self.cursor, len(self.steps)):
+                if self.steps[i]['path'] == path:
+                    self.cursor = i + 1
+                    self.served += 1
+                    return self.steps[i]
+            for i in range(min(self.cursor, len(self.steps)) - 1, -1, -1):
+                if self.steps[i]['path'] == path:
+                    self.served += 1
+                    return self.steps[i]
+            self.misses += 1
+            return None
+
+    def pending_path(self):
+        """Pfad des nächsten erwarteten Schritts (Ziel der Weiterleitung nach einem POST)"""
+        with self.lock:
+            return self.steps[self.cursor]['path'] if self.cursor < len(self.steps) else '/'
+
+    def page(self, step, replay_base):
+        if not step.get('page'):
+            return f'<!DOCTYPE html><html><head><title>Replay</title></head><body>{step["url"]}</body></html>'
+        page_html = self._pages.get(step['page'])
+        if page_html is None:
+            with open(os.path.join(self.recording['directory'], step['page']), 'r', encoding='utf-8') as f:
+                page_html = rewrite_html(f.read(), self.recording['base_url'], replay_base, self.strip_scripts)
+            self._pages[step['page']] = page_html
+        return page_html
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server_version = 'VoteBotReplay/1.0'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logging.debug(f"Replay: {format % args}")
+
+    def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        step = self.state.next_step(urlparse(self.path).path)
+        if step is None:
+            return self._send(404)
+        self._send(200, self.state.page(step, self.server.base_url).encode('utf-8'))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        if length:
+            self.rfile.read(length)
+        if urlparse(self.path).path == '/webhook':
+            return self._send(204)
+        # Formular (Login, Confirm): weiter zum nächsten aufgenommenen Seitenstand
+        self._send(303, headers={'Location': self.state.pending_path()})
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, state, host='127.0.0.1', port=0):
+        super().__init__((host, port), ReplayHandler)
+        self.state = state
+        self.base_url = f'http://{host}:{self.server_address[1]}'
+
+
+def start_replay_server(recording, strip_scripts=True, host='127.0.0.1', port=0):
+    """Replay-Server für eine geladene Aufnahme in einem Hintergrund-Thread starten"""
+    server = ReplayServer(ReplayState(recording, strip_scripts), host, port)
+    thread = threading.Thread(target=server.serve_forever, name='replay-server', daemon=True)
+    thread.start()
+    return server
+
+
+def check_recordings(directories, update=False):
+    """Aktuelle Parser über alle aufgenommenen Seiten - Abweichungen zur gespeicherten Erwartung"""
+    datetime_parser = DateTimeParser(GERMANY_TZ)
+    report = {'recordings': 0, 'pages': 0, 'mismatches': [], 'unparsed_times': 0, 'parse_ms_per_page': None}
+    parse_seconds = 0.0
+    for directory in directories:
+        recording = load_recording(directory)
+        report['recordings'] += 1
+        changed = False
+        for step in recording['steps']:
+            if not step.get('page'):
+                continue
+            with open(os.path.join(directory, step['page']), 'r', encoding='utf-8') as f:
+                page_html = f.read()
+            start = time.perf_counter()
+            actual = page_expectations(page_html, datetime_parser)
+            parse_seconds += time.perf_counter() - start
+            report['pages'] += 1
+            report['unparsed_times'] += sum(1 for row in actual['rows'] if row[2] is None)
+
+            if actual != step.get('expect'):
+                report['mismatches'].append({'recording': directory, 'step': step['step'], 'page': step['page'],
+                                             'expected': step.get('expect'), 'actual': actual})
+                if update:
+                    step['expect'] = actual
+                    changed = True
+        if changed:
+            recording.pop('directory')
+            for step in recording['steps']:
+                step.pop('path', None)
+            with open(os.path.join(directory, SESSION_FILE), 'w', encoding='utf-8') as f:
+                json.dump(recording, f, indent=2, ensure_ascii=False)
+    if report['pages']:
+        report['parse_ms_per_page'] = parse_seconds / report['pages'] * 1000
+    return report
+
+
+def _recording_clock(recording):
+    """Zeitpunkt, zu dem check_and_vote die Vote-Seite gelesen hat - Uhr des Bots beim Replay"""
+    for step in recording['steps']:
+        if step['step'] == 'vote_page':
+            return datetime.fromtimestamp(step['ts'], GERMANY_TZ)
+    return datetime.fromisoformat(recording['recorded_at'])
+
+
+def _compare_result(expected, result):
+    if expected is None or result is None:
+        return [] if expected == result else [f"Ergebnis: erwartet {expected}, erhalten {result}"]
+    differences = []
+    for key in ('voted', 'failed', 'skipped', 'unparsed'):
+        if sorted(expected.get(key, [])) != sorted(result.get(key, [])):
+            differences.append(f"{key}: erwartet {expected.get(key)}, erhalten {result.get(key)}")
+    # Geschätzte Zeiten entstehen erst nach check_and_vote
+    expected_times = {site: when for site, when in expected['next_votes'].items() if site not in expected.get('estimated', [])}
+    actual_times = {site: when.isoformat() for site, when in result['next_votes'].items()}
+    if expected_times != actual_times:
+        differences.append(f"next_votes: erwartet {expected_times}, erhalten {actual_times}")
+    return differences
+
+
+def run_replay(directory, repeat=1, strip_scripts=True, headless=True):
+    """Bot (Login + check_and_vote) gegen den Replay-Server - Ergebnis-Abweichungen und Dauer pro Durchlauf"""
+    recording = load_recording(directory)
+    server = start_replay_server(recording, strip_scripts)
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='votebot-replay-')
+    os.chdir(workdir)
+    try:
+        from vote_bot import AlturiVoteBot
+
+        bot = AlturiVoteBot(headless=headless, base_url=server.base_url, state_backend='json', use_async_webhook=False, use_ledger=False,
+                            webhook_url=f'{server.base_url}/webhook')
+        # Volle Geschwindigkeit: keine Pausen, kurze Waits (Seiten kommen lokal und ändern sich nicht von selbst)
+        bot.apply_settings({'politeness_delay': 0, 'account_pause': 0, 'confirm_wait': 0, 'wait_cap': 1.0})
+        clock = _recording_clock(recording)
+        bot.get_current_time = lambda: clock
+
+        username = recording['username']
+        account = {'username': username, 'password': 'replay', 'name': username}
+        runs = []
+        try:
+            for _ in range(repeat):
+                server.state.reset()
+                start = time.perf_counter()
+                bot.setup_driver()
+                try:
+                    result = bot.check_and_vote(username, account) if bot.login(username, 'replay') else None
+                finally:
+                    bot.close_driver()
+                runs.append({'seconds': time.perf_counter() - start, 'differences': _compare_result(recording['result'], result)})
+        finally:
+            bot.shutdown()
+        return {
+            'recording': directory,
+            'runs': len(runs),
+            'seconds_median': statistics.median(run['seconds'] for run in runs),
+            'differences': runs[-1]['differences'],
+            'pages_served': server.state.served,
+            'pages_missing': server.state.misses,
+            'phases': bot.metrics.phase_stats(),
+        }
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    check = subparsers.add_parser('check', help='Parser über alle aufgenommenen Seiten (ohne Browser)')
+    check.add_argument('paths', nargs='+')
+    check.add_argument('--update', action='store_true', help='aktuelle Parser-Ergebnisse als neue Erwartung speichern')
+    run = subparsers.add_parser('run', help='Bot gegen den Replay-Server laufen lassen (Chrome nötig)')
+    run.add_argument('paths', nargs='+')
+    run.add_argument('--repeat', type=int, default=1)
+    run.add_argument('--keep-scripts', action='store_true')
+    run.add_argument('--show-browser', action='store_true')
+    serve = subparsers.add_parser('serve', help='Replay-Server für eine Aufnahme starten')
+    serve.add_argument('path')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--keep-scripts', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'check':
+        report = check_recordings(find_recordings(args.paths), update=args.update)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 1 if report['mismatches'] and not args.update else 0
+
+    if args.command == 'run':
+        reports = [run_replay(directory, args.repeat, not args.keep_scripts, not args.show_browser) for directory in find_recordings(args.paths)]
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        return 1 if any(report['differences'] for report in reports) else 0
+
+    server = ReplayServer(ReplayState(load_recording(args.path), not args.keep_scripts), port=args.port)
+    print(f"🎞️  Replay von '{args.path}' auf {server.base_url} (Strg+C beendet)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
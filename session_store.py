@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+
+
+class SessionStore:
+    """Verschlüsselter Cookie-Speicher pro Account (Fernet), damit Logins übersprungen werden können"""
+
+    def __init__(self, directory='sessions', key=None):
+        try:
+            from cryptography.fernet import Fernet, InvalidToken
+        except ImportError as e:
+            raise RuntimeError("Session-Store benötigt das Paket 'cryptography' (pip install cryptography)") from e
+
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._fernet = Fernet(key or os.environ.get('VOTEBOT_SESSION_KEY') or self._load_or_create_key(Fernet))
+        self._invalid_token = InvalidToken
+        self._lock = threading.Lock()
+
+        # Metriken
+        self.saved_logins = 0
+        self.expired_sessions = 0
+        # Anzahl und Summe statt Listen - Speicher bleibt bei langer Laufzeit konstant
+        self.full_logins = 0
+        self.login_seconds_total = 0.0
+        self.restore_seconds_total = 0.0
+
+    def _load_or_create_key(self, fernet_cls, timeout=5):
+        key_file = os.path.join(self.directory, '.key')
+        if os.path.exists(key_file):
+            return self._read_key(key_file, timeout)
+
+        key = fernet_cls.generate_key()
+        try:
+            fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # Ein anderer Container (gleiches sessions/-Volume) war schneller - dessen Schlüssel verwenden
+            return self._read_key(key_file, timeout)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        logging.warning(f"🔑 Neuer Session-Schlüssel in '{key_file}' erstellt (VOTEBOT_SESSION_KEY setzen um ihn vorzugeben)")
+        return key
+
+    @staticmethod
+    def _read_key(key_file, timeout):
+        # Zwischen O_EXCL-Create und write() des anderen Containers ist die Datei noch leer
+        deadline = time.monotonic() + timeout
+        while True:
+            with open(key_file, 'rb') as f:
+                key = f.read().strip()
+            if key:
+                return key
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Session-Schlüssel '{key_file}' ist nach {timeout}s noch leer - Datei löschen oder VOTEBOT_SESSION_KEY setzen")
+            time.sleep(0.05)
+
+    def _path(self, username):
+        digest = hashlib.sha256(username.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f'{digest}.session')
+
+    def load(self, username):
+        """Gespeicherte Cookies (Liste von Selenium-Cookie-Dicts) oder None"""
+        path = self._path(username)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = json.loads(self._fernet.decrypt(f.read()))
+            if data.get('username') != username:
+                return None
+            return data.get('cookies') or None
+        except (self._invalid_token, ValueError, OSError) as e:
+            logging.warning(f"⚠️ Gespeicherte Session für {username} unlesbar - wird verworfen: {e}")
+            self.delete(username)
+            return None
+
+    def save(self, username, cookies):
+        """Cookies verschlüsselt und atomar speichern"""
+        if not cookies:
+            return
+        token = self._fernet.encrypt(json.dumps({
+            'username': username,
+            'saved_at': time.time(),
+            'cookies': cookies,
+        }).encode('utf-8'))
+
+        path = self._path(username)
+        tmp_path = f'{path}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(token)
+        os.replace(tmp_path, path)
+
+    def delete(self, username):
+        try:
+            os.remove(self._path(username))
+        except OSError:
+            pass
+
+    def record_login(self, seconds):
+        """Dauer eines vollständigen Logins erfassen"""
+        with self._lock:
+            self.full_logins += 1
+            self.login_seconds_total += seconds
+
+    def record_restore(self, valid, seconds):
+        """Ergebnis einer Session-Wiederherstellung erfassen"""
+        with self._lock:
+            if valid:
+                self.saved_logins += 1
+                self.restore_seconds_total += seconds
+            else:
+                self.expired_sessions += 1
+
+    def stats(self):
+        """Gesparte Logins und dadurch vermiedene Round-Trip-Zeit"""
+        with self._lock:
+            login_avg = self.login_seconds_total / self.full_logins if self.full_logins else 0.0
+            restore_avg = self.restore_seconds_total / self.saved_logins if self.saved_logins else 0.0
+        return {
+            'saved_logins': self.saved_logins,
+            'expired_sessions': self.expired_sessions,
+            'full_logins': self.full_logins,
+            'login_avg_seconds': login_avg,
+            'restore_avg_seconds': restore_avg,
+            'saved_seconds': max(0.0, login_avg - restore_avg) * self.saved_logins,
+        }
+
+
+def cookies_to_jar(cookies, jar):
+    """Selenium-Cookie-Dicts in ein requests CookieJar übernehmen"""
+    for cookie in cookies:
+        jar.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+
+def cookies_from_jar(jar):
+    """requests CookieJar als Selenium-Cookie-Dicts"""
+    cookies = []
+    for cookie in jar:
+        entry = {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path, 'secure': cookie.secure}
+        if cookie.expires:
+            entry['expiry'] = cookie.expires
+        cookies.append(entry)
+    return cookies
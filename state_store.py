@@ -0,0 +1,409 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+
+# Vote-Seite für Einträge im alten Format (eine Zeit pro Account)
+LEGACY_SITE = '*'
+
+
+def _site_times(value):
+    """{Vote-Seite: ISO-Zeit} aus einem vote_times-Eintrag (auch altes Format)"""
+    if isinstance(value, dict):
+        return value
+    return {LEGACY_SITE: value} if value else {}
+
+
+def _timestamp(iso_time):
+    try:
+        return datetime.fromisoformat(iso_time).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class JsonStateStore:
+    """vote_times.json als Kompatibilitätsmodus - atomar über Temp-Datei, fsync und os.replace"""
+
+    def __init__(self, path, retry_path='data/retry_state.json', cooldown_path='data/cooldowns.json'):
+        self.path = path
+        self.retry_path = retry_path
+        self.cooldown_path = cooldown_path
+        # Externe Änderungen an dieser Datei sollen den Scheduler wecken
+        self.watch_path = path
+        self._lock = threading.Lock()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def save(self, vote_times, usernames=None):
+        """Ganze Datei atomar neu schreiben (usernames wird hier ignoriert)"""
+        with self._lock:
+            self._write_atomic(self.path, vote_times)
+
+    def _write_atomic(self, path, data):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Bind-Mount einer einzelnen Datei (docker-compose) lässt kein Ersetzen zu
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.remove(tmp_path)
+
+    def record_results(self, username, results):
+        """Ergebnisse pro Vote-Seite - im JSON-Format nicht vorgesehen"""
+
+    def load_retry_state(self):
+        """(scope, key, kind, failures, retry_at, last_error) aller Backoff-/Breaker-Zustände"""
+        if not os.path.exists(self.retry_path):
+            return []
+        with open(self.retry_path, 'r') as f:
+            return [tuple(entry) for entry in json.load(f)]
+
+    def save_retry_state(self, scope, key, state):
+        """Zustand eines Accounts bzw. einer Vote-Seite setzen (None = löschen)"""
+        with self._lock:
+            entries = {(entry[0], entry[1]): entry for entry in self.load_retry_state()}
+            if state is None:
+                entries.pop((scope, key), None)
+            else:
+                entries[(scope, key)] = (scope, key, state.kind, state.failures, state.retry_at, state.last_error)
+            directory = os.path.dirname(self.retry_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._write_atomic(self.retry_path, list(entries.values()))
+
+    def load_cooldown_state(self):
+        """Gelernte Abklingzeiten und Schätzungen (siehe CooldownPredictor) oder None"""
+        if not os.path.exists(self.cooldown_path):
+            return None
+        with open(self.cooldown_path, 'r') as f:
+            return json.load(f)
+
+    def _update_cooldown_state(self, update):
+        with self._lock:
+            state = self.load_cooldown_state() or {}
+            for key in ('samples', 'last_voted', 'estimates'):
+                state.setdefault(key, {})
+            update(state)
+            directory = os.path.dirname(self.cooldown_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._write_atomic(self.cooldown_path, state)
+
+    def add_cooldown_sample(self, site, voted_at, seconds, keep):
+        """Beobachtete Abklingzeit einer Vote-Seite anhängen, nur die letzten keep behalten"""
+        def update(state):
+            samples = state['samples'].setdefault(site, [])
+            samples.append(seconds)
+            del samples[:-keep]
+        self._update_cooldown_state(update)
+
+    def save_cooldown_entry(self, username, site, last_voted, estimate):
+        """Letzten Vote und Schätzung (Timestamp, Folge, verankert) eines Accounts für eine Vote-Seite setzen (None = löschen)"""
+        def update(state):
+            for key, value in (('last_voted', last_voted), ('estimates', list(estimate) if estimate else None)):
+                sites = state[key].setdefault(username, {})
+                if value is None:
+                    sites.pop(site, None)
+                else:
+                    sites[site] = value
+                if not sites:
+                    del state[key][username]
+        self._update_cooldown_state(update)
+
+    def next_due(self, now_ts, limit=100):
+        """(username, vote_site, next_vote_ts) aller fälligen Einträge - hier per Vollscan"""
+        due = []
+        for username, value in self.load().items():
+            for site, iso_time in _site_times(value).items():
+                ts = _timestamp(iso_time)
+                if ts is not None and ts <= now_ts:
+                    due.append((username, site, ts))
+        return sorted(due, key=lambda entry: entry[2])[:limit]
+
+    def close(self):
+        pass
+
+
+class SqliteStateStore:
+    """SQLite/WAL-Backend: ein Eintrag pro (username, vote_site), inkrementelle Upserts"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vote_state (
+            username     TEXT NOT NULL,
+            vote_site    TEXT NOT NULL,
+            next_vote_at TEXT,
+            next_vote_ts REAL,
+            last_result  TEXT,
+            coins_before INTEGER,
+            coins_after  INTEGER,
+            updated_at   REAL NOT NULL,
+            PRIMARY KEY (username, vote_site)
+        );
+        CREATE INDEX IF NOT EXISTS idx_vote_state_next_vote_ts ON vote_state (next_vote_ts);
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS retry_state (
+            scope      TEXT NOT NULL,
+            key        TEXT NOT NULL,
+            kind       TEXT NOT NULL,
+            failures   INTEGER NOT NULL,
+            retry_at   REAL NOT NULL,
+            last_error TEXT,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (scope, key)
+        );
+        CREATE TABLE IF NOT EXISTS cooldown_samples (
+            vote_site TEXT NOT NULL,
+            voted_at  REAL NOT NULL,
+            seconds   REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cooldown_samples_site ON cooldown_samples (vote_site, voted_at);
+        CREATE TABLE IF NOT EXISTS cooldown_state (
+            username          TEXT NOT NULL,
+            vote_site         TEXT NOT NULL,
+            last_voted        REAL,
+            estimate_ts       REAL,
+            estimate_streak   INTEGER,
+            estimate_anchored INTEGER,
+            updated_at        REAL NOT NULL,
+            PRIMARY KEY (username, vote_site)
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Der Zustand ändert sich nur über diesen Prozess - keine Dateiüberwachung nötig
+        self.watch_path = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        # Mehrere Worker-Prozesse können dieselbe Datei beschreiben (Sharding)
+        self._conn.execute('PRAGMA busy_timeout=30000')
+        self._conn.executescript(self.SCHEMA)
+
+        # Zuletzt persistierter Stand - Basis für inkrementelle Schreibzugriffe
+        self._snapshot = {}
+
+    def load(self):
+        vote_times = {}
+        with self._lock:
+            rows = self._conn.execute('SELECT username, vote_site, next_vote_at FROM vote_state WHERE next_vote_at IS NOT NULL').fetchall()
+            for username, site, next_vote_at in rows:
+                vote_times.setdefault(username, {})[site] = next_vote_at
+            self._snapshot = {username: dict(sites) for username, sites in vote_times.items()}
+        return vote_times
+
+    def load_user(self, username):
+        """Aktuelle Zeiten eines Accounts aus der Datenbank (z.B. von einem anderen Worker geschrieben)"""
+        with self._lock:
+            rows = self._conn.execute('SELECT vote_site, next_vote_at FROM vote_state WHERE username = ? AND next_vote_at IS NOT NULL',
+                                      (username,)).fetchall()
+            sites = {site: next_vote_at for site, next_vote_at in rows}
+            if sites:
+                self._snapshot[username] = dict(sites)
+            else:
+                self._snapshot.pop(username, None)
+        return sites
+
+    def save(self, vote_times, usernames=None):
+        """Nur geänderte (username, vote_site)-Einträge upserten bzw. löschen"""
+        # Diff, Schreibzugriff und Snapshot unter einem Lock - parallele Worker-Threads sehen nie einen halben Stand
+        with self._lock:
+            if usernames is None:
+                usernames = set(vote_times) | set(self._snapshot)
+
+            upserts = []
+            deletes = []
+            snapshot_updates = {}
+            now = time.time()
+            for username in usernames:
+                new_sites = dict(_site_times(vote_times.get(username)))
+                old_sites = self._snapshot.get(username, {})
+
+                for site, iso_time in new_sites.items():
+                    if old_sites.get(site) != iso_time:
+                        upserts.append((username, site, iso_time, _timestamp(iso_time), now))
+                for site in old_sites.keys() - new_sites.keys():
+                    deletes.append((username, site))
+                snapshot_updates[username] = new_sites
+
+            if not upserts and not deletes:
+                return
+
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany("""
+                    INSERT INTO vote_state (username, vote_site, next_vote_at, next_vote_ts, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (username, vote_site) DO UPDATE SET
+                        next_vote_at = excluded.next_vote_at,
+                        next_vote_ts = excluded.next_vote_ts,
+                        updated_at = excluded.updated_at
+                """, upserts)
+                self._conn.executemany('DELETE FROM vote_state WHERE username = ? AND vote_site = ?', deletes)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+            for username, new_sites in snapshot_updates.items():
+                if new_sites:
+                    self._snapshot[username] = new_sites
+                else:
+                    self._snapshot.pop(username, None)
+
+    def record_results(self, username, results):
+        """Ergebnis und Coins pro Vote-Seite speichern: {site: (last_result, coins_before, coins_after)}"""
+        if not results:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO vote_state (username, vote_site, last_result, coins_before, coins_after, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (username, vote_site) DO UPDATE SET
+                    last_result = excluded.last_result,
+                    coins_before = COALESCE(excluded.coins_before, coins_before),
+                    coins_after = COALESCE(excluded.coins_after, coins_after),
+                    updated_at = excluded.updated_at
+            """, [(username, site, result, before, after, now) for site, (result, before, after) in results.items()])
+
+    def next_due(self, now_ts, limit=100):
+        """(username, vote_site, next_vote_ts) aller fälligen Einträge - über den Index auf next_vote_ts"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT username, vote_site, next_vote_ts FROM vote_state WHERE next_vote_ts <= ? ORDER BY next_vote_ts LIMIT ?',
+                (now_ts, limit)
+            ).fetchall()
+
+    def load_retry_state(self):
+        """(scope, key, kind, failures, retry_at, last_error) aller Backoff-/Breaker-Zustände"""
+        with self._lock:
+            return self._conn.execute('SELECT scope, key, kind, failures, retry_at, last_error FROM retry_state').fetchall()
+
+    def save_retry_state(self, scope, key, state):
+        """Zustand eines Accounts bzw. einer Vote-Seite setzen (None = löschen)"""
+        with self._lock:
+            if state is None:
+                self._conn.execute('DELETE FROM retry_state WHERE scope = ? AND key = ?', (scope, key))
+                return
+            self._conn.execute("""
+                INSERT INTO retry_state (scope, key, kind, failures, retry_at, last_error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (scope, key) DO UPDATE SET
+                    kind = excluded.kind,
+                    failures = excluded.failures,
+                    retry_at = excluded.retry_at,
+                    last_error = excluded.last_error,
+                    updated_at = excluded.updated_at
+            """, (scope, key, state.kind, state.failures, state.retry_at, state.last_error, time.time()))
+
+    def load_cooldown_state(self):
+        """Gelernte Abklingzeiten und Schätzungen (siehe CooldownPredictor) oder None"""
+        state = {'samples': {}, 'last_voted': {}, 'estimates': {}}
+        with self._lock:
+            samples = self._conn.execute('SELECT vote_site, seconds FROM cooldown_samples ORDER BY vote_site, voted_at, rowid').fetchall()
+            entries = self._conn.execute(
+                'SELECT username, vote_site, last_voted, estimate_ts, estimate_streak, estimate_anchored FROM cooldown_state'
+            ).fetchall()
+        for site, seconds in samples:
+            state['samples'].setdefault(site, []).append(seconds)
+        for username, site, last_voted, estimate_ts, streak, anchored in entries:
+            if last_voted is not None:
+                state['last_voted'].setdefault(username, {})[site] = last_voted
+            if estimate_ts is not None:
+                state['estimates'].setdefault(username, {})[site] = [estimate_ts, streak, bool(anchored)]
+        return state if samples or entries else None
+
+    def add_cooldown_sample(self, site, voted_at, seconds, keep):
+        """Beobachtete Abklingzeit einer Vote-Seite anhängen, nur die letzten keep behalten (Worker schreiben eigene Zeilen)"""
+        with self._lock:
+            self._conn.execute('INSERT INTO cooldown_samples (vote_site, voted_at, seconds) VALUES (?, ?, ?)', (site, voted_at, seconds))
+            self._conn.execute("""
+                DELETE FROM cooldown_samples WHERE vote_site = ? AND rowid NOT IN (
+                    SELECT rowid FROM cooldown_samples WHERE vote_site = ? ORDER BY voted_at DESC LIMIT ?)
+            """, (site, site, keep))
+
+    def save_cooldown_entry(self, username, site, last_voted, estimate):
+        """Letzten Vote und Schätzung (Timestamp, Folge, verankert) eines Accounts für eine Vote-Seite setzen (None = löschen)"""
+        with self._lock:
+            if last_voted is None and estimate is None:
+                self._conn.execute('DELETE FROM cooldown_state WHERE username = ? AND vote_site = ?', (username, site))
+                return
+            estimate_ts, streak, anchored = estimate or (None, None, None)
+            self._conn.execute("""
+                INSERT INTO cooldown_state (username, vote_site, last_voted, estimate_ts, estimate_streak, estimate_anchored, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (username, vote_site) DO UPDATE SET
+                    last_voted = excluded.last_voted,
+                    estimate_ts = excluded.estimate_ts,
+                    estimate_streak = excluded.estimate_streak,
+                    estimate_anchored = excluded.estimate_anchored,
+                    updated_at = excluded.updated_at
+            """, (username, site, last_voted, estimate_ts, streak, None if anchored is None else int(anchored), time.time()))
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM vote_state LIMIT 1').fetchone() is None
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute('INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value', (key, value))
+
+    def migrate_from_json(self, json_path):
+        """Einmalige Übernahme von vote_times.json - nur wenn die Datenbank noch leer ist"""
+        if self.get_meta('migrated_from_json') or not os.path.exists(json_path):
+            return 0
+        if not self.is_empty():
+            self.set_meta('migrated_from_json', 'skipped')
+            return 0
+
+        with open(json_path, 'r') as f:
+            vote_times = json.load(f)
+        self._snapshot = {}
+        self.save(vote_times)
+        self.set_meta('migrated_from_json', datetime.now().isoformat())
+        logging.info(f"📦 {len(vote_times)} Account(s) aus '{json_path}' nach '{self.path}' migriert")
+        return len(vote_times)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_state_store(backend, json_path='vote_times.json', sqlite_path='data/vote_state.db'):
+    """State-Backend erzeugen: 'sqlite' (Standard, inkl. einmaliger JSON-Migration) oder 'json'"""
+    if backend == 'json':
+        return JsonStateStore(json_path)
+    if backend == 'sqlite':
+        store = SqliteStateStore(sqlite_path)
+        store.migrate_from_json(json_path)
+        return store
+    raise ValueError(f"Unbekanntes State-Backend: {backend}")
@@ -0,0 +1,82 @@
+"""AccountsWatcher: Diff nur bei echten Inhaltsänderungen, ungültige Dateien werden ignoriert"""
+import json
+import os
+
+import pytest
+
+from accounts_watcher import AccountsWatcher
+
+
+def write(path, data):
+    path.write_text(data if isinstance(data, str) else json.dumps(data))
+    # mtime-Auflösung des Dateisystems umgehen - jede Änderung bekommt eine neue Signatur
+    write.counter = getattr(write, 'counter', 0) + 1
+    os.utime(path, ns=(write.counter * 10 ** 9, write.counter * 10 ** 9))
+
+
+@pytest.fixture
+def accounts_file(tmp_path):
+    path = tmp_path / 'accounts.json'
+    write(path, [{'username': 'alice', 'password': 'a'}, {'username': 'bob', 'password': 'b'}])
+    return path
+
+
+def test_initial_load(accounts_file):
+    watcher = AccountsWatcher(str(accounts_file))
+    diff = watcher.poll()
+    assert diff.initial
+    assert [account['username'] for account in diff.added] == ['alice', 'bob']
+    assert watcher.poll() is None
+    assert not watcher.has_changed()
+
+
+def test_added_removed_and_modified_accounts(accounts_file):
+    watcher = AccountsWatcher(str(accounts_file))
+    watcher.poll()
+
+    write(accounts_file, [{'username': 'bob', 'password': 'neu'}, {'username': 'carol', 'password': 'c'}])
+    assert watcher.has_changed()
+    diff = watcher.poll()
+    assert not diff.initial
+    assert diff.added == [{'username': 'carol', 'password': 'c'}]
+    assert diff.removed == ['alice']
+    assert diff.modified == [{'username': 'bob', 'password': 'neu'}]
+    assert [account['username'] for account in watcher.accounts] == ['bob', 'carol']
+
+
+def test_mtime_change_with_same_content_is_ignored(accounts_file):
+    watcher = AccountsWatcher(str(accounts_file))
+    watcher.poll()
+    write(accounts_file, accounts_file.read_text())
+    assert watcher.has_changed()
+    assert watcher.poll() is None
+    assert not watcher.has_changed()
+
+
+def test_invalid_json_keeps_last_good_accounts(accounts_file):
+    watcher = AccountsWatcher(str(accounts_file))
+    good = watcher.poll().accounts
+
+    write(accounts_file, '[{"username": "alice",')
+    assert watcher.poll() is None
+    write(accounts_file, {'username': 'alice'})
+    assert watcher.poll() is None
+    assert watcher.accounts == good
+
+    # Nächste gültige Version wird gegen den letzten gültigen Stand verglichen
+    write(accounts_file, [{'username': 'alice', 'password': 'a'}])
+    diff = watcher.poll()
+    assert diff.removed == ['bob'] and not diff.added and not diff.modified
+
+
+def test_invalid_entries_are_skipped(accounts_file):
+    write(accounts_file, [{'username': 'alice', 'password': 'a'}, {'username': 'ohne-passwort'}, 'kaputt',
+                          {'username': 'alice', 'password': 'zweiter'}])
+    diff = AccountsWatcher(str(accounts_file)).poll()
+    assert diff.accounts == [{'username': 'alice', 'password': 'zweiter'}]
+
+
+def test_missing_file(tmp_path):
+    watcher = AccountsWatcher(str(tmp_path / 'fehlt.json'))
+    assert watcher.poll() is None
+    assert watcher.accounts == []
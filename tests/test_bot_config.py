@@ -0,0 +1,193 @@
+"""bot_config: Typumwandlung, Vorrang Umgebung vor Datei, Validierung und Hot Reload"""
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from bot_config import (BotConfig, ConfigError, ConfigWatcher, load_config, parse_overrides,
+                        DEFAULT_CHROME_ARGS, DEFAULT_LEAN_CHROME_ARGS, DEFAULT_LEAN_BLOCKED_URLS)
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+    # mtime-Auflösung des Dateisystems umgehen - jede Änderung bekommt eine neue Signatur
+    write.counter = getattr(write, 'counter', 0) + 1
+    os.utime(path, ns=(write.counter * 10 ** 9, write.counter * 10 ** 9))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    return tmp_path / 'votebot.json'
+
+
+def test_defaults_without_file(config_file):
+    assert load_config(str(config_file), environ={}) == BotConfig()
+
+
+def test_env_values_are_converted(config_file):
+    config = load_config(str(config_file), environ={
+        'VOTEBOT_SCHEDULER': 'yes',
+        'VOTEBOT_HEADLESS': '0',
+        'VOTEBOT_MAX_WORKERS': ' 3 ',
+        'VOTEBOT_POLITENESS_DELAY': '1.5',
+        'VOTEBOT_MIN_AVAILABLE_MB': '512',
+        'VOTEBOT_CHROME_EXTRA_ARGS': '--lang=de "--proxy-server=http://proxy:3128"',
+        'VOTEBOT_WORKER_ID': 'node-1',
+    })
+    assert config.use_scheduler is True
+    assert config.headless is False
+    assert config.max_workers == 3
+    assert config.politeness_delay == 1.5
+    assert config.min_available_mb == 512
+    assert config.chrome_extra_args == ('--lang=de', '--proxy-server=http://proxy:3128')
+    assert config.worker_id == 'node-1'
+
+
+def test_file_values_are_converted(config_file):
+    write(config_file, {'loop_interval': 30, 'chrome_args': ['--no-sandbox'], 'max_load_per_cpu': None, 'use_ledger': False})
+    config = load_config(str(config_file), environ={})
+    assert config.loop_interval == 30.0 and isinstance(config.loop_interval, float)
+    assert config.chrome_args == ('--no-sandbox',)
+    assert config.max_load_per_cpu is None
+    assert config.use_ledger is False
+
+
+def test_env_overrides_file(config_file):
+    write(config_file, {'max_workers': 2, 'account_pause': 7})
+    config = load_config(str(config_file), environ={'VOTEBOT_MAX_WORKERS': '4', 'VOTEBOT_ACCOUNT_PAUSE': ''})
+    assert config.max_workers == 4
+    # Leere Variable zählt als nicht gesetzt
+    assert config.account_pause == 7
+
+
+@pytest.mark.parametrize('data, env, message', [
+    ({'max_wrkers': 2}, {}, "unbekannter Schlüssel 'max_wrkers'"),
+    ({'max_workers': '2'}, {}, 'erwartet int'),
+    ({'max_workers': True}, {}, 'erwartet int'),
+    ({'use_scheduler': 1}, {}, 'erwartet bool'),
+    ({'max_workers': 0}, {}, 'mindestens 1'),
+    ({'state_backend': 'redis'}, {}, 'erlaubt: sqlite, json'),
+    ({'base_url': 'alturi.to'}, {}, 'http(s)-URL'),
+    ({'metrics_port': 70000}, {}, 'ungültiger Port'),
+    ({'chrome_args': '--no-sandbox'}, {}, 'Liste von Strings'),
+    ({'loop_interval': None}, {}, 'darf nicht leer sein'),
+    ({}, {'VOTEBOT_SCHEDULER': 'vielleicht'}, 'erwartet 1/0'),
+    ({}, {'VOTEBOT_MAX_WORKERS': 'zwei'}, 'erwartet int'),
+])
+def test_invalid_values_are_rejected(config_file, data, env, message):
+    write(config_file, data)
+    with pytest.raises(ConfigError) as excinfo:
+        load_config(str(config_file), environ=env)
+    assert message in str(excinfo.value)
+
+
+def test_all_errors_are_reported(config_file):
+    write(config_file, {'max_workers': 0, 'state_backend': 'redis'})
+    with pytest.raises(ConfigError) as excinfo:
+        load_config(str(config_file), environ={'VOTEBOT_LOOP_INTERVAL': 'x'})
+    assert len(excinfo.value.errors) == 3
+
+
+def test_invalid_json_is_rejected(config_file):
+    config_file.write_text('{"max_workers": 2,')
+    with pytest.raises(ConfigError):
+        load_config(str(config_file), environ={})
+
+
+def test_parse_overrides_only_accepts_reloadable_values():
+    assert parse_overrides(['confirm_wait=0.5']) == {'confirm_wait': 0.5}
+    with pytest.raises(ConfigError):
+        parse_overrides(['base_url=http://localhost'])
+
+
+def test_lean_chrome_flags_are_configurable(config_file):
+    assert BotConfig().lean_chrome_args == DEFAULT_LEAN_CHROME_ARGS
+    assert BotConfig().lean_blocked_urls == DEFAULT_LEAN_BLOCKED_URLS
+    config = load_config(str(config_file), environ={'VOTEBOT_LEAN_CHROME_ARGS': '--renderer-process-limit=2',
+                                                    'VOTEBOT_LEAN_BLOCKED_URLS': '*.woff2'})
+    assert config.lean_chrome_args == ('--renderer-process-limit=2',)
+    assert config.lean_blocked_urls == ('*.woff2',)
+    assert 'lean_chrome_args' in config.startup()
+
+
+def test_hot_reload_applies_reloadable_changes(config_file):
+    write(config_file, {'max_workers': 1, 'confirm_wait': 2})
+    watcher = ConfigWatcher(str(config_file), load_config(str(config_file), environ={}), environ={})
+    assert watcher.poll() is None
+
+    write(config_file, {'max_workers': 3, 'confirm_wait': 2})
+    assert watcher.poll() == {'max_workers': 3}
+    assert watcher.config.max_workers == 3
+    # Unverändert seit dem letzten Poll
+    assert watcher.poll() is None
+    assert watcher.stats() == {'reloads': 1, 'rejected': 0}
+
+
+def test_hot_reload_keeps_last_good_config_after_bad_edit(config_file):
+    write(config_file, {'max_workers': 2})
+    watcher = ConfigWatcher(str(config_file), load_config(str(config_file), environ={}), environ={})
+
+    write(config_file, {'max_workers': 0})
+    assert watcher.poll() is None
+    config_file.write_text('{"max_workers": ')
+    os.utime(config_file, ns=(99 * 10 ** 9, 99 * 10 ** 9))
+    assert watcher.poll() is None
+    assert watcher.config.max_workers == 2
+    assert watcher.stats()['rejected'] == 2
+
+    # Danach wieder gültig - wird übernommen
+    write(config_file, {'max_workers': 4})
+    assert watcher.poll() == {'max_workers': 4}
+
+
+def test_hot_reload_ignores_restart_only_values(config_file):
+    write(config_file, {'max_workers': 1})
+    watcher = ConfigWatcher(str(config_file), load_config(str(config_file), environ={}), environ={})
+    write(config_file, {'max_workers': 1, 'base_url': 'http://localhost:8080'})
+    assert watcher.poll() is None
+    assert watcher.config.base_url == BotConfig().base_url
+
+
+def test_hot_reload_env_still_wins(config_file):
+    write(config_file, {'max_workers': 1})
+    environ = {'VOTEBOT_MAX_WORKERS': '2'}
+    watcher = ConfigWatcher(str(config_file), load_config(str(config_file), environ=environ), environ=environ)
+    write(config_file, {'max_workers': 3})
+    assert watcher.poll() is None
+    assert watcher.config.max_workers == 2
+
+
+def test_driver_uses_configured_lean_flags(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from selenium import webdriver
+    started = []
+
+    class FakeChrome:
+        def __init__(self, options=None, service=None):
+            started.append(options)
+            self.service = SimpleNamespace(path='/usr/bin/chromedriver')
+            self.cdp = []
+
+        def implicitly_wait(self, seconds):
+            pass
+
+        def execute_script(self, script, *args):
+            pass
+
+        def execute_cdp_cmd(self, command, params):
+            self.cdp.append((command, params))
+
+    monkeypatch.setattr(webdriver, 'Chrome', FakeChrome)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url='http://127.0.0.1:1', state_backend='json', use_ledger=False, use_async_webhook=False,
+                        lean_browser=True, lean_chrome_args=('--renderer-process-limit=2',), lean_blocked_urls=('*.woff2',))
+    try:
+        driver = bot._create_driver()
+    finally:
+        bot.shutdown()
+    arguments = started[0].arguments
+    assert '--renderer-process-limit=2' in arguments
+    assert not set(DEFAULT_LEAN_CHROME_ARGS) & set(arguments)
+    assert set(DEFAULT_CHROME_ARGS) <= set(arguments)
+    assert ('Network.setBlockedURLs', {'urls': ['*.woff2']}) in driver.cdp
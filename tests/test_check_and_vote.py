@@ -0,0 +1,128 @@
+"""check_and_vote ohne Browser: Tabelle und Driver werden simuliert"""
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mock_site import GERMANY_TZ
+from vote_parser import VoteRow
+
+
+class FailingDriver:
+    """Driver, bei dem der Vote-Link nie gefunden wird"""
+
+    def get(self, url):
+        pass
+
+    def refresh(self):
+        pass
+
+    def find_element(self, by, selector):
+        raise RuntimeError('Element nicht gefunden')
+
+
+def row(when, site='TopG', index=0):
+    text = when.strftime('%d.%m.%Y %H:%M') + ' Uhr'
+    return VoteRow(index, site, f'https://{site.lower()}.example/vote', f'Next vote: {text}', text)
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url='http://127.0.0.1:1', state_backend='json', use_ledger=False, use_async_webhook=False)
+    yield bot
+    bot.shutdown()
+
+
+def test_failed_vote_link_rereads_table_on_fresh_thread(bot):
+    # Thread hat noch nie gevotet - last_vote_rows existiert dort nicht
+    now = datetime.now(GERMANY_TZ)
+    tables = [[row(now - timedelta(hours=1))], [row(now + timedelta(hours=23))]]
+    bot.read_vote_rows = lambda: tables.pop(0)
+    results = []
+
+    def worker():
+        bot.driver = FailingDriver()
+        results.append(bot.check_and_vote('alice', {'username': 'alice'}))
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    result = results[0]
+    assert result['failed'] == ['TopG']
+    assert not tables
+    assert result['next_votes']['TopG'] > now
+
+
+class VotingDriver:
+    """Driver, bei dem jeder Vote-Link gefunden wird und Reloads nichts ändern"""
+
+    current_window_handle = 'main'
+    window_handles = ['main']
+    switch_to = SimpleNamespace(window=lambda handle: None)
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        pass
+
+    def refresh(self):
+        self.refreshes = getattr(self, 'refreshes', 0) + 1
+
+    def find_element(self, by, selector):
+        return SimpleNamespace(get_attribute=lambda name: 'https://topg.example/vote', click=lambda: None)
+
+
+def test_stale_time_after_vote_is_clamped_to_cooldown(bot):
+    now = datetime.now(GERMANY_TZ)
+    # Auch nach dem Vote zeigt die Tabelle noch die alte, bereits erreichte Zeit
+    tables = [[row(now - timedelta(hours=1))], [row(now - timedelta(hours=1))]]
+    bot.read_vote_rows = lambda: tables.pop(0)
+    bot.driver = VotingDriver()
+
+    def perform_vote(username, element, site, account, row=None):
+        bot._local.last_vote_coins = (10, 11)
+        return True
+    bot.perform_vote = perform_vote
+
+    result = bot.check_and_vote('alice', {'username': 'alice'})
+    cooldown = bot.cooldown_predictor.cooldown('TopG')
+    assert result['voted'] == ['TopG']
+    assert result['estimated'] == ['TopG']
+    assert now + timedelta(seconds=cooldown) <= result['next_votes']['TopG'] <= datetime.now(GERMANY_TZ) + timedelta(seconds=cooldown)
+
+    # Der geklemmte Wert ist keine Stichprobe der Abklingzeit
+    bot.apply_cooldown_estimates('alice', result)
+    assert not bot.cooldown_predictor._samples.get('TopG')
+
+
+def test_confirm_reload_is_learned_per_site(bot):
+    button = SimpleNamespace(click=lambda: None, is_displayed=lambda: True)
+    # TopG zeigt den Confirm-Button erst nach einem Reload, Gtop100 sofort
+    waits = []
+
+    def wait_for(condition, description, timeout=None, required=True):
+        waits.append((site_in_progress[0], description))
+        if description == 'Confirm-Button ohne Reload':
+            return None if site_in_progress[0] == 'TopG' else button
+        if description.startswith('Confirm-Button'):
+            return button
+        return True
+    site_in_progress = [None]
+    bot.wait_for = wait_for
+    bot.driver = VotingDriver()
+    coins = iter(range(100))
+    bot.get_current_coins = lambda: next(coins)
+    bot.read_vote_rows = lambda: []
+
+    for site in ['TopG', 'Gtop100', 'TopG', 'Gtop100']:
+        site_in_progress[0] = site
+        assert bot.perform_vote('alice', VotingDriver().find_element(None, None), site, {'username': 'alice'})
+
+    assert bot.confirm_needs_reload == {'TopG': True, 'Gtop100': False}
+    without_reload = [site for site, description in waits if description == 'Confirm-Button ohne Reload']
+    # Nach dem ersten Durchlauf lädt TopG direkt neu, Gtop100 wartet weiterhin ohne Reload
+    assert without_reload == ['TopG', 'Gtop100', 'Gtop100']
@@ -0,0 +1,49 @@
+"""Persistenz des CooldownPredictor: eine Zeile pro Stichprobe bzw. (Account, Vote-Seite)"""
+import pytest
+
+from cooldown_predictor import CooldownPredictor
+from state_store import JsonStateStore, SqliteStateStore
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def make_store(request, tmp_path):
+    def make():
+        if request.param == 'json':
+            return JsonStateStore(str(tmp_path / 'vote_times.json'), retry_path=str(tmp_path / 'retry.json'),
+                                  cooldown_path=str(tmp_path / 'cooldowns.json'))
+        return SqliteStateStore(str(tmp_path / 'state.db'))
+    return make
+
+
+def test_samples_and_estimates_survive_restart(make_store):
+    predictor = CooldownPredictor(store=make_store(), window=2)
+    for i, seconds in enumerate((3600, 7200, 5400)):
+        predictor.record_vote('alice', 'TopG', 1000.0 * i, 1000.0 * i + seconds)
+    estimated = predictor.estimate('bob', 'Gtop100', now=100.0)
+
+    restored = CooldownPredictor(store=make_store(), window=2)
+    assert list(restored._samples['TopG']) == [7200, 5400]
+    assert restored._last_voted[('alice', 'TopG')] == 2000.0
+    assert restored._estimates[('bob', 'Gtop100')] == (estimated, 1, False)
+
+
+def test_observed_time_clears_stored_estimate(make_store):
+    predictor = CooldownPredictor(store=make_store())
+    predictor.estimate('alice', 'TopG', now=100.0)
+    predictor.observe('alice', 'TopG', 5000.0)
+    assert not CooldownPredictor(store=make_store()).is_estimated('alice', 'TopG')
+
+
+def test_workers_sharing_a_database_keep_each_others_rows(tmp_path):
+    # Zwei Shards mit eigenem Predictor - keiner darf die Zeilen des anderen überschreiben
+    path = str(tmp_path / 'state.db')
+    first = CooldownPredictor(store=SqliteStateStore(path))
+    second = CooldownPredictor(store=SqliteStateStore(path))
+    first.record_vote('alice', 'TopG', 0.0, 3600.0)
+    second.record_vote('bob', 'TopG', 0.0, 7200.0)
+    second.estimate('bob', 'Gtop100', now=0.0)
+
+    restored = CooldownPredictor(store=SqliteStateStore(path))
+    assert sorted(restored._samples['TopG']) == [3600, 7200]
+    assert set(restored._last_voted) == {('alice', 'TopG'), ('bob', 'TopG')}
+    assert restored.is_estimated('bob', 'Gtop100')
@@ -0,0 +1,152 @@
+"""DriverPool: Ausleihe, Rückgabe mit Isolation und Recycling; DriverWatchdog: RSS-Limit"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import driver_pool
+from driver_pool import DriverPool, DriverWatchdog
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """Driver mit Cookies und Fenstern - Reset entfernt beides, sofern nicht sticky_cookies"""
+
+    def __init__(self, sticky_cookies=False):
+        self.cookies = [{'name': 'session'}]
+        self.window_handles = ['main']
+        self.switch_to = FakeSwitch(self)
+        self.sticky_cookies = sticky_cookies
+        self.quit_called = False
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def execute_script(self, script, *args):
+        pass
+
+    def delete_all_cookies(self):
+        if not self.sticky_cookies:
+            self.cookies = []
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.getAllCookies':
+            return {'cookies': self.cookies}
+        return {}
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def started():
+    return []
+
+
+def make_pool(started, driver_args=None, **kwargs):
+    def factory():
+        driver = FakeDriver(**(driver_args or {}))
+        started.append(driver)
+        return driver
+    return DriverPool(factory, **kwargs)
+
+
+def test_returned_driver_is_reset_and_reused(started):
+    pool = make_pool(started)
+    driver = pool.acquire()
+    driver.window_handles.append('vote-tab')
+    pool.release(driver)
+
+    assert driver.cookies == [] and driver.window_handles == ['main']
+    assert pool.acquire() is driver
+    stats = pool.stats()
+    assert (stats['hits'], stats['misses'], stats['startups'], stats['recycled']) == (1, 1, 1, 0)
+
+
+def test_driver_is_recycled_after_max_uses(started):
+    pool = make_pool(started, max_uses=2)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    pool.release(driver)
+
+    assert driver.quit_called
+    assert pool.acquire() is not driver
+    assert len(started) == 2
+    assert pool.stats()['recycled'] == 1
+
+
+def test_driver_is_recycled_when_isolation_fails(started):
+    pool = make_pool(started, driver_args={'sticky_cookies': True})
+    driver = pool.acquire()
+    pool.release(driver)
+    assert driver.quit_called
+    stats = pool.stats()
+    assert stats['recycled'] == 1 and stats['isolation_failures'] == 1
+
+
+def test_surplus_driver_is_quit_without_counting_as_recycled(started):
+    pool = make_pool(started, max_idle=1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert not first.quit_called and second.quit_called
+    assert pool.stats()['recycled'] == 0
+
+    pool.close_all()
+    assert first.quit_called
+
+
+def test_discarded_driver_is_never_reused(started):
+    pool = make_pool(started)
+    driver = pool.acquire()
+    pool.discard(driver, 'RSS-Limit überschritten')
+    assert driver.quit_called
+    assert pool.acquire() is not driver
+    assert pool.stats()['recycled'] == 1
+
+
+def test_counters_are_consistent_under_concurrency(started):
+    # max_idle >= Anzahl Threads - jeder beendete Driver wurde recycelt, keiner als Überschuss
+    pool = make_pool(started, max_idle=8, max_uses=3)
+
+    def worker():
+        for _ in range(50):
+            pool.release(pool.acquire())
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert stats['hits'] + stats['misses'] == 400
+    assert stats['startups'] == stats['misses'] == len(started)
+    assert stats['recycled'] == sum(driver.quit_called for driver in started)
+    assert len(started) - stats['recycled'] == len(pool._idle)
+
+
+def test_watchdog_marks_killed_driver_until_unwatched(monkeypatch):
+    monkeypatch.setattr(driver_pool, 'driver_rss', lambda driver: 2048 * 1024 * 1024)
+    killed_pids = []
+    monkeypatch.setattr(driver_pool, 'kill_process_tree', killed_pids.append)
+    watchdog = DriverWatchdog(max_rss_mb=1024)
+    driver = SimpleNamespace(service=SimpleNamespace(process=SimpleNamespace(pid=4711)))
+
+    watchdog.watch(driver, 'alice')
+    assert not watchdog.killed(driver)
+    watchdog._check()
+    assert watchdog.killed(driver)
+    assert killed_pids == [4711]
+    assert watchdog.unwatch(driver) == (2048.0, True)
+    assert not watchdog.killed(driver)
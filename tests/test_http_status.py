@@ -0,0 +1,132 @@
+"""HTTP-Fast-Path (HttpStatusClient, AlturiVoteBot.check_status_http) gegen die lokale Mock-Seite"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from mock_site import MockSiteState, start_mock_site, GERMANY_TZ
+from http_status import HttpStatusClient
+from vote_ledger import HTTP_CHECKED
+
+SITES = ('TopG', 'Gtop100')
+
+
+@pytest.fixture
+def site():
+    server = start_mock_site(MockSiteState({'alice': 'secret'}, sites=SITES))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def bot(site, tmp_path, monkeypatch):
+    # data/ und vote_times.json landen relativ zum Arbeitsverzeichnis
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url=site.base_url, use_http_fast_path=True, state_backend='json', use_ledger=False,
+                        use_async_webhook=False)
+    bot.apply_settings({'politeness_delay': 0})
+    yield bot
+    bot.shutdown()
+
+
+def not_due(state, username='alice'):
+    for vote_site in SITES:
+        state.set_next_vote(username, vote_site, datetime.now(GERMANY_TZ) + timedelta(hours=3))
+
+
+def test_login_sends_hidden_form_fields(site):
+    client = HttpStatusClient(site.base_url)
+    assert client.login('alice', 'secret') is not None
+    assert site.state.logins == 1
+
+    # Ohne das versteckte Token lehnt die Seite den Login ab
+    session = requests.Session()
+    session.post(f'{site.base_url}/login', data={'user': 'alice', 'pass': 'secret', 'goingin': ''})
+    assert '/vote' not in session.get(f'{site.base_url}/vote').url
+    assert site.state.logins == 1
+
+
+def test_login_with_wrong_password_fails(site):
+    assert HttpStatusClient(site.base_url).login('alice', 'wrong') is None
+
+
+def test_vote_rows_are_parsed(site):
+    not_due(site.state)
+    rows = HttpStatusClient(site.base_url).get_vote_rows('alice', 'secret')
+    assert [row.site for row in rows] == list(SITES)
+    assert all(row.next_vote_text.endswith('Uhr') for row in rows)
+
+
+def test_session_is_reused(site):
+    client = HttpStatusClient(site.base_url)
+    client.get_vote_rows('alice', 'secret')
+    client.get_vote_rows('alice', 'secret')
+    assert site.state.logins == 1
+
+    client.drop_session('alice')
+    assert 'alice' not in client.sessions
+
+
+def test_not_due_returns_next_votes(site, bot):
+    not_due(site.state)
+    next_votes = bot.check_status_http('alice', 'secret')
+    assert set(next_votes) == set(SITES)
+    assert all(when > bot.get_current_time() for when in next_votes.values())
+
+
+def test_due_row_falls_back_to_browser(site, bot):
+    not_due(site.state)
+    site.state.set_next_vote('alice', 'TopG', datetime.now(GERMANY_TZ) - timedelta(minutes=5))
+    assert bot.check_status_http('alice', 'secret') is None
+
+
+def test_unparseable_row_falls_back_to_browser(site, bot):
+    not_due(site.state)
+    site.state.unparseable.add(('alice', 'TopG'))
+    assert bot.check_status_http('alice', 'secret') is None
+
+
+def test_unparseable_row_keeps_stored_times_and_starts_browser(site, bot):
+    # Nur Gtop100 lesbar (und nicht fällig) - TopG darf dadurch nicht aus vote_times verschwinden
+    not_due(site.state)
+    site.state.unparseable.add(('alice', 'TopG'))
+    stored = {'TopG': '2026-01-01T00:00:00+01:00', 'Gtop100': '2026-01-01T00:00:00+01:00'}
+    vote_times = {'alice': dict(stored)}
+
+    def no_browser():
+        raise RuntimeError('kein Chrome im Test')
+    bot.setup_driver = no_browser
+
+    with pytest.raises(RuntimeError):
+        bot.process_account({'username': 'alice', 'password': 'secret'}, vote_times)
+    assert vote_times['alice'] == stored
+
+
+def test_coins_are_read_from_ucp(site):
+    site.state.coins['alice'] = 1234
+    client = HttpStatusClient(site.base_url)
+    assert client.get_vote_rows('alice', 'secret') is not None
+    assert client.get_coins('alice') == 1234
+
+
+def test_coins_without_login_are_unknown(site):
+    # Nicht eingeloggt: /ucp leitet auf /home um, dort gibt es keinen Coins-Span
+    assert HttpStatusClient(site.base_url).get_coins('alice') is None
+
+
+def test_not_due_check_records_coins_without_browser(site, bot):
+    not_due(site.state)
+    site.state.coins['alice'] = 77
+    rows = []
+    bot.vote_ledger = SimpleNamespace(append=rows.append, close=lambda: None)
+
+    def no_browser():
+        raise AssertionError('Browser darf nicht starten')
+    bot.setup_driver = no_browser
+
+    vote_times = bot.process_account({'username': 'alice', 'password': 'secret'}, {})
+    assert set(vote_times['alice']) == set(SITES)
+    assert [(row.outcome, row.coins_after) for row in rows] == [(HTTP_CHECKED, 77)]
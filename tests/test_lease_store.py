@@ -0,0 +1,114 @@
+"""LeaseManager: zwei Worker auf derselben SQLite-Datei verarbeiten einen Account nie gleichzeitig"""
+from types import SimpleNamespace
+
+import pytest
+
+import lease_store
+from lease_store import LeaseManager
+
+TTL = 60
+ACCOUNTS = [f'user{i}' for i in range(20)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(lease_store, 'time', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def workers(tmp_path, clock):
+    path = str(tmp_path / 'state.db')
+    a = LeaseManager(path, worker_id='a', ttl=TTL)
+    b = LeaseManager(path, worker_id='b', ttl=TTL)
+    a.heartbeat()
+    b.heartbeat()
+    a.heartbeat()
+    yield a, b
+    a.close()
+    b.close()
+
+
+def test_held_lease_blocks_other_worker(workers):
+    a, b = workers
+    assert a.acquire('alice')
+    assert not b.acquire('alice')
+    assert b.stats()['contended'] == 1
+    # Eigene Lease erneut übernehmen ist erlaubt
+    assert a.acquire('alice')
+
+    a.release('alice')
+    assert b.acquire('alice')
+
+
+def test_lease_is_not_taken_before_it_expires(workers, clock):
+    a, b = workers
+    assert a.acquire('alice')
+    clock.now += TTL - 1
+    assert not b.acquire('alice')
+    assert a.still_owned('alice')
+
+
+def test_expired_lease_is_taken_over(workers, clock):
+    a, b = workers
+    assert a.acquire('alice')
+    clock.now += TTL + 1
+    assert b.acquire('alice')
+    assert not a.still_owned('alice')
+    assert a.stats()['lost'] == 1
+    # Worker a kommt zurück - die Lease gehört jetzt b
+    assert not a.acquire('alice')
+
+
+def test_heartbeat_keeps_lease_alive(workers, clock):
+    a, b = workers
+    assert a.acquire('alice')
+    clock.now += TTL - 1
+    a.heartbeat()
+    clock.now += TTL - 1
+    assert not b.acquire('alice')
+
+
+def test_accounts_are_split_between_live_workers(workers):
+    a, b = workers
+    mine_a = {username for username in ACCOUNTS if a.is_mine(username)}
+    mine_b = {username for username in ACCOUNTS if b.is_mine(username)}
+    assert mine_a and mine_b
+    assert not mine_a & mine_b
+    assert mine_a | mine_b == set(ACCOUNTS)
+
+
+def test_accounts_move_to_live_worker_after_heartbeat_drop(workers, clock):
+    a, b = workers
+    assert not all(b.is_mine(username) for username in ACCOUNTS)
+    # a sendet keinen Heartbeat mehr
+    clock.now += TTL + 1
+    b.heartbeat()
+    assert b.stats()['live_workers'] == 1
+    assert all(b.is_mine(username) for username in ACCOUNTS)
+
+
+def test_bots_skip_accounts_leased_by_another_worker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bots = [AlturiVoteBot(base_url='http://127.0.0.1:1', sharded=True, worker_id=worker_id, use_ledger=False,
+                          use_async_webhook=False) for worker_id in ('a', 'b')]
+    try:
+        for bot in bots:
+            bot.lease_manager.heartbeat()
+        accounts = [{'username': username, 'password': 'x'} for username in ACCOUNTS]
+        own = [{account['username'] for account in bot.filter_own_accounts(accounts, {})} for bot in bots]
+        assert not own[0] & own[1]
+        assert own[0] | own[1] == set(ACCOUNTS)
+
+        # Lease von a gehalten - b verarbeitet den Account nicht
+        username = sorted(own[0])[0]
+        processed = []
+        bots[1].process_account = lambda account, vote_times: processed.append(account['username'])
+        assert bots[0].lease_manager.acquire(username)
+        assert bots[1]._process_account_tracked({'username': username, 'password': 'x'}, {}) == (False, False)
+        assert processed == []
+    finally:
+        for bot in bots:
+            bot.shutdown()
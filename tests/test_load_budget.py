@@ -0,0 +1,59 @@
+"""LoadBudget: parallele Worker dürfen das Budget nicht gemeinsam passieren, bevor ein Browser läuft"""
+import os
+import threading
+import time
+
+from load_budget import LoadBudget, stable_jitter
+
+
+def test_starting_sessions_count_against_budget(monkeypatch):
+    # 4 CPUs, Last 2.0 - Budget 0.7/CPU lässt genau eine startende Session (+1 CPU = 0.75/CPU) zu
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(os, 'getloadavg', lambda: (2.0, 2.0, 2.0))
+    budget = LoadBudget(max_load_per_cpu=0.7, poll_interval=0.05, max_wait=5)
+
+    admitted = []
+    release = threading.Event()
+
+    def worker(i):
+        with budget.admit():
+            admitted.append(i)
+            release.wait(5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.3)
+    assert len(admitted) == 1
+    assert budget.starting == 1
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(admitted) == [0, 1, 2]
+    assert budget.starting == 0
+    assert budget.waits == 2
+
+
+def test_failed_start_releases_reservation(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 1)
+    monkeypatch.setattr(os, 'getloadavg', lambda: (0.0, 0.0, 0.0))
+    budget = LoadBudget(max_load_per_cpu=1.0)
+    try:
+        with budget.admit():
+            raise RuntimeError('Chrome startet nicht')
+    except RuntimeError:
+        pass
+    assert budget.starting == 0
+    assert budget.over_budget(budget.starting) is None
+
+
+def test_stable_jitter_is_stable_per_account_and_bounded():
+    keys = [(f'user{i}', '2024-05-01T12:00:00+02:00') for i in range(200)]
+    offsets = [stable_jitter(key, 600) for key in keys]
+    assert offsets == [stable_jitter(key, 600) for key in keys]
+    assert all(0 <= offset < 600 for offset in offsets)
+    # Verschiedene Accounts landen verteilt über das Intervall
+    assert len(set(offsets)) > 190
+    assert min(offsets) < 60 and max(offsets) > 540
+    assert stable_jitter(keys[0], 0) == 0.0
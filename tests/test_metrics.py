@@ -0,0 +1,47 @@
+"""Metrics: Histogramme pro Phase bzw. für lange Latenzen und der /metrics-Endpoint"""
+import requests
+
+from metrics import Metrics, start_metrics_server, LATENCY_BUCKETS
+
+
+def test_phases_use_short_buckets():
+    metrics = Metrics()
+    metrics.observe('login', 1.7)
+    text = metrics.render()
+    assert 'votebot_phase_duration_seconds_bucket{phase="login",le="2.5"} 1' in text
+    assert 'votebot_phase_duration_seconds_bucket{phase="login",le="1"} 0' in text
+
+
+def test_latencies_get_their_own_histogram():
+    metrics = Metrics()
+    metrics.observe('due_to_voted', 3 * 3600)
+    metrics.observe('due_to_voted', 90)
+    metrics.observe('cycle', 45)
+    text = metrics.render()
+
+    # Nicht mehr in phase_duration_seconds (dort landete alles über 120s in +Inf)
+    assert 'phase="due_to_voted"' not in text
+    assert 'phase="cycle"' not in text
+    assert '# TYPE votebot_due_to_voted_seconds histogram' in text
+    assert 'votebot_due_to_voted_seconds_bucket{le="120"} 1' in text
+    assert 'votebot_due_to_voted_seconds_bucket{le="14400"} 2' in text
+    assert 'votebot_due_to_voted_seconds_bucket{le="+Inf"} 2' in text
+    assert 'votebot_due_to_voted_seconds_count 2' in text
+    assert 'votebot_account_cycle_seconds_bucket{le="60"} 1' in text
+    assert LATENCY_BUCKETS[-1] >= 86400
+
+    # Log-Zusammenfassung und Benchmarks lesen weiterhin phase_stats()
+    assert metrics.phase_stats()['due_to_voted']['count'] == 2
+
+
+def test_metrics_server_binds_configured_host():
+    metrics = Metrics()
+    metrics.inc('votes_total', result='succeeded')
+    server = start_metrics_server(metrics, 0, host='0.0.0.0')
+    try:
+        assert server.server_address[0] == '0.0.0.0'
+        response = requests.get(f'http://127.0.0.1:{server.server_address[1]}/metrics', timeout=5)
+        assert 'votebot_votes_total{result="succeeded"} 1' in response.text
+    finally:
+        server.shutdown()
+        server.server_close()
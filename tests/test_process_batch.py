@@ -0,0 +1,79 @@
+"""process_batch mit mehreren Workern: jeder Account genau einmal, Zeiten vollständig im State-Backend"""
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock_site import GERMANY_TZ
+from state_store import SqliteStateStore
+
+
+class FakeDriver:
+    def get_cookies(self):
+        return []
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def bot(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url='http://127.0.0.1:1', state_backend=request.param, use_ledger=False, use_async_webhook=False,
+                        max_workers=4)
+    bot.politeness_delay = 0
+    bot.account_pause = 0
+    bot.setup_driver = lambda: setattr(bot, 'driver', FakeDriver())
+    bot.authenticate = lambda username, password: True
+    bot.logout = lambda: None
+    yield bot
+    bot.shutdown()
+
+
+def next_votes_for(username):
+    minutes = int(username[4:])
+    base = datetime.now(GERMANY_TZ).replace(second=0, microsecond=0) + timedelta(hours=20)
+    return {'TopG': base + timedelta(minutes=minutes), 'Gtop100': base + timedelta(hours=1, minutes=minutes)}
+
+
+def test_parallel_batch_processes_each_account_once(bot, tmp_path):
+    calls = Counter()
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def check_and_vote(username, account):
+        with lock:
+            calls[username] += 1
+            active.append(username)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(username)
+        return {'next_votes': next_votes_for(username), 'voted': ['TopG'], 'failed': [], 'skipped': [], 'seen': {},
+                'unparsed': [], 'estimated': [], 'voted_at': {'TopG': time.time()}, 'vote_seconds': {}, 'coins': {}}
+    bot.check_and_vote = check_and_vote
+
+    accounts = [{'username': f'user{i}', 'password': 'x'} for i in range(24)]
+    vote_times = {}
+    assert bot.process_batch(accounts, vote_times) == (24, 24, 0)
+
+    assert calls == Counter({account['username']: 1 for account in accounts})
+    assert max(peak) > 1
+    expected = {username: {site: when.isoformat() for site, when in next_votes_for(username).items()} for username in calls}
+    assert vote_times == expected
+    assert bot.metrics.phase_stats()['cycle']['count'] == 24
+
+    # Persistierter Stand enthält alle Accounts (inkrementelle Saves aus allen Threads)
+    if isinstance(bot.state_store, SqliteStateStore):
+        assert SqliteStateStore(str(tmp_path / 'data' / 'vote_state.db')).load() == expected
+    else:
+        assert json.loads((tmp_path / 'vote_times.json').read_text()) == expected
+
+    # Zweiter Durchlauf: nichts fällig, kein Account wird erneut verarbeitet
+    assert bot.process_batch(accounts, vote_times) == (0, 0, 24)
+    assert sum(calls.values()) == 24
@@ -0,0 +1,147 @@
+"""RetryManager: Klassifizierung, Backoff-Verlauf, Circuit-Breaker und geteilter Zustand"""
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchElementException, TimeoutException,
+                                        WebDriverException)
+
+import retry_policy
+from retry_policy import (RetryManager, RetryPolicy, classify_exception, ACCOUNT, SITE, BAD_CREDENTIALS, BROWSER_CRASH,
+                          PARSE_FAILURE, SELECTOR_MISSING, TIMEOUT, UNKNOWN)
+from state_store import SqliteStateStore
+
+
+@pytest.mark.parametrize('exc, kind', [
+    (InvalidSessionIdException('invalid session id'), BROWSER_CRASH),
+    (WebDriverException('chrome not reachable'), BROWSER_CRASH),
+    (ConnectionRefusedError(), BROWSER_CRASH),
+    (WebDriverException('unknown error: net::ERR_NAME_NOT_RESOLVED'), UNKNOWN),
+    (TimeoutException('Seite lädt nicht'), TIMEOUT),
+    (TimeoutError(), TIMEOUT),
+    (NoSuchElementException('#confirm-vote'), SELECTOR_MISSING),
+    (ValueError('kein Datum'), PARSE_FAILURE),
+    (KeyError('next_vote'), PARSE_FAILURE),
+    (RuntimeError('irgendwas'), UNKNOWN),
+])
+def test_classify_exception(exc, kind):
+    assert classify_exception(exc) == kind
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(retry_policy, 'time', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+POLICIES = {TIMEOUT: RetryPolicy(base=100, max_delay=300, threshold=4, cooldown=3600)}
+
+
+def test_account_backoff_doubles_until_breaker_opens(clock):
+    manager = RetryManager(policies=POLICIES, jitter=0)
+    delays = []
+    for _ in range(5):
+        delays.append(manager.record_failure(ACCOUNT, 'alice', TIMEOUT).retry_at - clock.now)
+    # 100, 200, 400 -> max_delay 300, ab threshold der Breaker-Cooldown
+    assert delays == [100, 200, 300, 3600, 3600]
+    assert manager.breakers_opened == 1
+    assert manager.blocked_until('alice', now=clock.now)[0] == clock.now + 3600
+    assert manager.blocked_until('alice', now=clock.now + 3600) is None
+
+    # Half-open: Erfolg schließt den Breaker vollständig
+    manager.record_success(ACCOUNT, 'alice')
+    assert manager.state(ACCOUNT, 'alice') is None
+    assert manager.record_failure(ACCOUNT, 'alice', TIMEOUT).retry_at - clock.now == 100
+
+
+def test_site_blocks_only_when_breaker_is_open(clock):
+    manager = RetryManager(policies=POLICIES, jitter=0)
+    for failures in range(1, 5):
+        manager.record_failure(SITE, 'TopG', TIMEOUT)
+        blocked = manager.site_blocked_until('TopG', now=clock.now)
+        assert (blocked is not None) == (failures >= 4)
+
+    # Account gesperrt nur wenn alle fälligen Vote-Seiten einen offenen Breaker haben
+    assert manager.blocked_until('alice', ['TopG'], now=clock.now) is not None
+    assert manager.blocked_until('alice', ['TopG', 'Gtop100'], now=clock.now) is None
+    assert manager.stats()['breakers_open'] == 1
+
+
+def test_jitter_stays_within_bounds(clock):
+    manager = RetryManager(policies=POLICIES, jitter=0.2)
+    for i in range(50):
+        delay = manager.record_failure(ACCOUNT, f'user{i}', TIMEOUT).retry_at - clock.now
+        assert 80 <= delay <= 120
+
+
+def test_state_survives_restart_and_is_shared_between_workers(tmp_path, clock):
+    path = str(tmp_path / 'state.db')
+    first = RetryManager(SqliteStateStore(path), jitter=0)
+    second = RetryManager(SqliteStateStore(path), jitter=0)
+
+    first.record_failure(ACCOUNT, 'alice', BAD_CREDENTIALS)
+    assert second.blocked_until('alice', now=clock.now) is None
+    second.refresh()
+    assert second.state(ACCOUNT, 'alice').failures == 1
+
+    # Zweiter Worker zählt auf dem geteilten Stand weiter
+    assert second.record_failure(ACCOUNT, 'alice', BAD_CREDENTIALS).failures == 2
+    second.record_success(SITE, 'TopG')
+    first.refresh()
+    assert first.state(ACCOUNT, 'alice').failures == 2
+    assert RetryManager(SqliteStateStore(path)).state(ACCOUNT, 'alice').failures == 2
+
+
+class FakeDriver:
+    def get_cookies(self):
+        return []
+
+    def quit(self):
+        pass
+
+
+def test_account_failure_is_recorded_once_per_attempt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url='http://127.0.0.1:1', state_backend='json', use_ledger=False, use_async_webhook=False)
+    try:
+        bot.setup_driver = lambda: setattr(bot, 'driver', FakeDriver())
+        bot.authenticate = lambda username, password: True
+        bot.check_and_vote = lambda username, account: {'next_votes': {}, 'voted': [], 'failed': ['TopG'], 'skipped': [], 'seen': {},
+                                                        'unparsed': [], 'estimated': [], 'voted_at': {}, 'vote_seconds': {},
+                                                        'coins': {}}
+        logouts = []
+
+        def broken_logout():
+            logouts.append(True)
+            raise TimeoutException('Logout hängt')
+        bot.logout = broken_logout
+
+        bot.process_account({'username': 'alice', 'password': 'a'}, {})
+        assert logouts
+        state = bot.retry_manager.state(ACCOUNT, 'alice')
+        assert state.failures == 1
+        assert bot.retry_manager.stats()['failures'] == 1
+    finally:
+        bot.shutdown()
+
+
+def test_watchdog_kill_does_not_count_as_failure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url='http://127.0.0.1:1', state_backend='json', use_ledger=False, use_async_webhook=False)
+    try:
+        bot.setup_driver = lambda: setattr(bot, 'driver', FakeDriver())
+        bot.authenticate = lambda username, password: True
+
+        def killed_mid_account(username, account):
+            # Watchdog beendet den Browser wegen RSS-Limit, der nächste WebDriver-Aufruf scheitert
+            bot.driver_watchdog._active[id(bot.driver)]['killed'] = True
+            raise InvalidSessionIdException('invalid session id')
+        bot.check_and_vote = killed_mid_account
+
+        bot.process_account({'username': 'alice', 'password': 'a'}, {})
+        assert bot.retry_manager.state(ACCOUNT, 'alice') is None
+        assert bot.retry_manager.stats()['failures'] == 0
+    finally:
+        bot.shutdown()
@@ -0,0 +1,51 @@
+"""SessionStore: gemeinsamer Schlüssel bei parallel startenden Containern, Metriken"""
+import os
+import threading
+
+import pytest
+
+from session_store import SessionStore
+
+pytest.importorskip('cryptography')
+from cryptography.fernet import Fernet  # noqa: E402
+
+
+def test_lost_create_race_uses_existing_key(tmp_path, monkeypatch):
+    # Der andere Container legt die Datei zwischen exists() und O_EXCL an
+    key = Fernet.generate_key()
+    (tmp_path / '.key').write_bytes(key)
+    monkeypatch.delenv('VOTEBOT_SESSION_KEY', raising=False)
+    monkeypatch.setattr(os.path, 'exists', lambda path: False)
+    first = SessionStore(str(tmp_path))
+    monkeypatch.undo()
+
+    first.save('alice', [{'name': 'sid', 'value': '1'}])
+    assert SessionStore(str(tmp_path), key=key).load('alice') == [{'name': 'sid', 'value': '1'}]
+
+
+def test_waits_while_key_file_is_empty(tmp_path, monkeypatch):
+    monkeypatch.delenv('VOTEBOT_SESSION_KEY', raising=False)
+    key = Fernet.generate_key()
+    key_file = tmp_path / '.key'
+    key_file.write_bytes(b'')
+    writer = threading.Timer(0.2, key_file.write_bytes, args=(key,))
+    writer.start()
+    store = SessionStore(str(tmp_path))
+    writer.join()
+
+    store.save('alice', [{'name': 'sid', 'value': '1'}])
+    assert SessionStore(str(tmp_path), key=key).load('alice') == [{'name': 'sid', 'value': '1'}]
+
+
+def test_stats_use_running_sums(tmp_path):
+    store = SessionStore(str(tmp_path), key=Fernet.generate_key())
+    store.record_login(4.0)
+    store.record_login(6.0)
+    store.record_restore(True, 1.0)
+    store.record_restore(False, 0.5)
+    stats = store.stats()
+    assert stats['full_logins'] == 2
+    assert stats['login_avg_seconds'] == 5.0
+    assert stats['restore_avg_seconds'] == 1.0
+    assert stats['saved_seconds'] == 4.0
+    assert stats['expired_sessions'] == 1
@@ -0,0 +1,88 @@
+"""SqliteStateStore: Migration aus vote_times.json und inkrementelles Speichern"""
+import json
+import sqlite3
+
+from state_store import LEGACY_SITE, SqliteStateStore, create_state_store
+
+
+def rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {(username, site): (next_vote_at, next_vote_ts) for username, site, next_vote_at, next_vote_ts
+                in conn.execute('SELECT username, vote_site, next_vote_at, next_vote_ts FROM vote_state')}
+    finally:
+        conn.close()
+
+
+def test_migrates_legacy_flat_format(tmp_path):
+    json_path = tmp_path / 'vote_times.json'
+    json_path.write_text(json.dumps({'alice': '2024-05-01T12:00:00', 'bob': None}))
+    store = create_state_store('sqlite', json_path=str(json_path), sqlite_path=str(tmp_path / 'state.db'))
+
+    assert store.load() == {'alice': {LEGACY_SITE: '2024-05-01T12:00:00'}}
+    assert rows(store.path)[('alice', LEGACY_SITE)][1] is not None
+    assert store.get_meta('migrated_from_json')
+
+
+def test_migrates_per_site_format(tmp_path):
+    json_path = tmp_path / 'vote_times.json'
+    vote_times = {'alice': {'TopG': '2024-05-01T12:00:00', 'Gtop100': '2024-05-01T18:30:00'}, 'bob': {'TopG': '2024-05-02T08:00:00'}}
+    json_path.write_text(json.dumps(vote_times))
+    store = SqliteStateStore(str(tmp_path / 'state.db'))
+    assert store.migrate_from_json(str(json_path)) == 2
+    assert store.load() == vote_times
+
+
+def test_migration_runs_only_once(tmp_path):
+    json_path = tmp_path / 'vote_times.json'
+    json_path.write_text(json.dumps({'alice': '2024-05-01T12:00:00'}))
+    store = SqliteStateStore(str(tmp_path / 'state.db'))
+    assert store.migrate_from_json(str(json_path)) == 1
+    store.save({}, ['alice'])
+
+    json_path.write_text(json.dumps({'carol': '2024-06-01T12:00:00'}))
+    assert store.migrate_from_json(str(json_path)) == 0
+    assert store.load() == {}
+
+
+def test_migration_skips_non_empty_database(tmp_path):
+    json_path = tmp_path / 'vote_times.json'
+    json_path.write_text(json.dumps({'alice': '2024-05-01T12:00:00'}))
+    store = SqliteStateStore(str(tmp_path / 'state.db'))
+    store.save({'bob': {'TopG': '2024-05-02T08:00:00'}})
+    assert store.migrate_from_json(str(json_path)) == 0
+    assert store.get_meta('migrated_from_json') == 'skipped'
+    assert store.load() == {'bob': {'TopG': '2024-05-02T08:00:00'}}
+
+
+def test_save_writes_only_changed_rows(tmp_path):
+    store = SqliteStateStore(str(tmp_path / 'state.db'))
+    vote_times = {f'user{i}': {'TopG': '2024-05-01T12:00:00', 'Gtop100': '2024-05-01T13:00:00'} for i in range(50)}
+    store.save(vote_times)
+    assert store._conn.total_changes == 100
+
+    # Unverändert - kein Schreibzugriff
+    before = store._conn.total_changes
+    store.save(vote_times)
+    assert store._conn.total_changes == before
+
+    # Eine geänderte Zeit, eine entfernte Seite, ein entfernter Account
+    vote_times['user1']['TopG'] = '2024-05-02T12:00:00'
+    del vote_times['user2']['Gtop100']
+    del vote_times['user3']
+    store.save(vote_times)
+    assert store._conn.total_changes - before == 4
+
+    restored = SqliteStateStore(store.path).load()
+    assert restored == vote_times
+
+
+def test_save_with_usernames_only_touches_those_accounts(tmp_path):
+    store = SqliteStateStore(str(tmp_path / 'state.db'))
+    store.save({'alice': {'TopG': '2024-05-01T12:00:00'}, 'bob': {'TopG': '2024-05-01T12:00:00'}})
+    before = store._conn.total_changes
+
+    # bob fehlt in vote_times, ist aber nicht in usernames - bleibt erhalten
+    store.save({'alice': {'TopG': '2024-05-03T12:00:00'}}, ['alice'])
+    assert store._conn.total_changes - before == 1
+    assert SqliteStateStore(store.path).load() == {'alice': {'TopG': '2024-05-03T12:00:00'}, 'bob': {'TopG': '2024-05-01T12:00:00'}}
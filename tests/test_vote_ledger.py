@@ -0,0 +1,207 @@
+"""VoteLedger: Spalten-Chunks, Wiederherstellung nach Absturz und summarize gegen eine naive Auswertung"""
+import json
+import os
+import random
+import struct
+import time
+
+import pytest
+
+from vote_ledger import (VoteLedger, LedgerRow, encode_chunk, decode_columns, iter_chunk_headers, scan, summarize,
+                         COMPACTING_FILE, TAIL_FILE, VOTED, FAILED, SKIPPED, CHECKED)
+
+ACCOUNTS = ('alice', 'bob', 'carol')
+SITES = ('TopG', 'Gtop100', 'Arena')
+
+
+def decode(data):
+    header_len = struct.unpack('<I', data[4:8])[0]
+    header = json.loads(data[8:8 + header_len])
+    return header, decode_columns(data[8 + header_len:], header)
+
+
+def rows_of(directory):
+    """Alle Zeilen (started, account, site, outcome) aus Segmenten und Tail"""
+    rows = []
+    for header, columns in scan(directory):
+        for started, account, site, outcome in zip(columns['started'], columns['account'], columns['site'], columns['outcome']):
+            rows.append((started, header['accounts'][account], header['sites'][site], header['outcomes'][outcome]))
+    return sorted(rows)
+
+
+def make_rows(count, start, seed=1, max_gap=6 * 3600):
+    rng = random.Random(seed)
+    rows = []
+    ts = start
+    while len(rows) < count:
+        ts += rng.uniform(60, max_gap)
+        account = rng.choice(ACCOUNTS)
+        cycle = rng.uniform(5, 60)
+        # Eine Session mit einer Zeile pro Vote-Seite (gleicher Beginn)
+        for site in rng.sample(SITES, rng.randint(1, len(SITES))):
+            outcome = rng.choice((VOTED, VOTED, FAILED, SKIPPED))
+            before = rng.randint(0, 500)
+            rows.append(LedgerRow(started=ts, finished=ts + cycle, account=account, site=site, outcome=outcome,
+                                  coins_before=before, coins_after=before + (1 if outcome == VOTED else 0),
+                                  vote_seconds=rng.uniform(1, 5), cycle_seconds=cycle))
+    return rows
+
+
+def test_chunk_round_trip():
+    rows = [
+        LedgerRow(started=200.5, finished=230.0, account='bob', site='TopG', outcome=VOTED, coins_before=10, coins_after=11,
+                  driver_seconds=1.5, auth_seconds=2.25, check_seconds=0.5, vote_seconds=3.0, cycle_seconds=29.5),
+        LedgerRow(started=100.0, finished=110.0, account='alice', site='*', outcome=CHECKED),
+    ]
+    header, columns = decode(encode_chunk(rows, batch='b1'))
+
+    assert header['n'] == 2
+    assert header['batch'] == 'b1'
+    assert (header['min_started'], header['max_started']) == (100.0, 200.5)
+    # Nach started sortiert
+    assert list(columns['started']) == [100.0, 200.5]
+    assert [header['accounts'][i] for i in columns['account']] == ['alice', 'bob']
+    assert [header['sites'][i] for i in columns['site']] == ['*', 'TopG']
+    assert [header['outcomes'][i] for i in columns['outcome']] == [CHECKED, VOTED]
+    # Unbekannt: -1 bzw. NaN
+    assert list(columns['coins_before']) == [-1, 10]
+    assert list(columns['coins_after']) == [-1, 11]
+    assert columns['vote_seconds'][0] != columns['vote_seconds'][0]
+    assert columns['vote_seconds'][1] == pytest.approx(3.0)
+    assert columns['auth_seconds'][1] == pytest.approx(2.25)
+
+
+def test_rows_survive_compaction_and_reopen(tmp_path):
+    directory = str(tmp_path)
+    rows = make_rows(50, time.time() - 20 * 86400)
+    ledger = VoteLedger(directory, chunk_rows=8)
+    for row in rows:
+        ledger.append(row)
+    assert ledger.stats()['chunks_written'] >= 5
+    assert rows_of(directory) == sorted((row.started, row.account, row.site, row.outcome) for row in rows)
+
+    ledger.close()
+    assert not os.path.exists(os.path.join(directory, TAIL_FILE))
+    VoteLedger(directory)
+    assert len(rows_of(directory)) == len(rows)
+
+
+def crash_during_compaction(directory, rows, cut):
+    """Stand nach Absturz beim Schreiben des Chunks: Tail in tail.compacting, Segment um cut Bytes gekürzt"""
+    ledger = VoteLedger(directory)
+    for row in rows:
+        ledger.append(row)
+    ledger.compact()
+    [segment] = ledger.segment_paths()
+    # Zustand vor dem Entfernen von tail.compacting nachbilden
+    batch = [header['batch'] for header, _ in iter_chunk_headers(segment)][-1]
+    with open(os.path.join(directory, COMPACTING_FILE), 'w', encoding='utf-8') as f:
+        f.write(batch + '\n')
+        for row in rows:
+            f.write(json.dumps(list(row)) + '\n')
+    if cut:
+        with open(segment, 'r+b') as f:
+            f.truncate(os.path.getsize(segment) - cut)
+    return segment
+
+
+@pytest.mark.parametrize('cut', [1, 100])
+def test_torn_chunk_is_rewritten(tmp_path, cut):
+    directory = str(tmp_path)
+    start = time.mktime((2026, 5, 10, 12, 0, 0, 0, 0, -1))
+    earlier = make_rows(5, start, seed=2)
+    torn = make_rows(6, earlier[-1].started, seed=3)
+
+    ledger = VoteLedger(directory)
+    for row in earlier:
+        ledger.append(row)
+    ledger.compact()
+    crash_during_compaction(directory, torn, cut)
+
+    # Abgeschnittener Chunk wird ignoriert bis _recover ihn neu schreibt
+    assert len(rows_of(directory)) == len(earlier)
+    VoteLedger(directory)
+    assert not os.path.exists(os.path.join(directory, COMPACTING_FILE))
+    assert rows_of(directory) == sorted((row.started, row.account, row.site, row.outcome) for row in earlier + torn)
+
+
+def test_written_chunk_is_not_duplicated(tmp_path):
+    directory = str(tmp_path)
+    rows = make_rows(6, time.mktime((2026, 5, 10, 12, 0, 0, 0, 0, -1)))
+    crash_during_compaction(directory, rows, cut=0)
+    VoteLedger(directory)
+    assert len(rows_of(directory)) == len(rows)
+
+
+def test_truncated_tail_line_is_skipped(tmp_path):
+    directory = str(tmp_path)
+    rows = make_rows(3, time.time() - 86400)
+    ledger = VoteLedger(directory)
+    for row in rows:
+        ledger.append(row)
+    with open(os.path.join(directory, TAIL_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(list(rows[0]))[:20])
+    assert len(rows_of(directory)) == len(rows)
+    assert VoteLedger(directory).stats()['tail_rows'] == len(rows)
+
+
+def reference_summary(rows, since=None, until=None, account=None, site=None):
+    """Naive Auswertung Zeile für Zeile"""
+    report = {}
+    sessions = {}
+    for row in rows:
+        if since is not None and row.started < since:
+            continue
+        if until is not None and row.started >= until:
+            continue
+        if account is not None and row.account != account:
+            continue
+        if site is not None and row.site != site:
+            continue
+        entry = report.setdefault(row.account, {'voted': 0, 'failed': 0, 'skipped': 0, 'coins_gained': 0})
+        if row.outcome in (VOTED, FAILED, SKIPPED):
+            entry[row.outcome] += 1
+        if row.outcome == VOTED:
+            entry['coins_gained'] += row.coins_after - row.coins_before
+        sessions.setdefault(row.account, set()).add(row.started)
+    for name, entry in report.items():
+        entry['sessions'] = len(sessions[name])
+        entry['attempts'] = entry['voted'] + entry['failed']
+        entry['success_rate'] = entry['voted'] / entry['attempts'] if entry['attempts'] else None
+    return report
+
+
+@pytest.fixture(scope='module')
+def filled_ledger(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('ledger'))
+    # Über mehrere Monatssegmente, mehrere Chunks und einen nicht kompaktierten Tail
+    rows = make_rows(400, time.time() - 90 * 86400, seed=7, max_gap=18 * 3600)
+    ledger = VoteLedger(directory, chunk_rows=64)
+    for row in rows:
+        ledger.append(row)
+    return directory, rows
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'account': 'bob'},
+    {'site': 'Gtop100'},
+    {'account': 'carol', 'site': 'Arena'},
+    {'since_days': 30},
+    {'since_days': 60, 'until_days': 20},
+    {'since_days': 45, 'until_days': 10, 'account': 'alice', 'site': 'TopG'},
+    {'account': 'nobody'},
+])
+def test_summarize_matches_naive_reference(filled_ledger, filters):
+    directory, rows = filled_ledger
+    now = time.time()
+    since = now - filters['since_days'] * 86400 if 'since_days' in filters else None
+    until = now - filters['until_days'] * 86400 if 'until_days' in filters else None
+    account, site = filters.get('account'), filters.get('site')
+
+    report = summarize(directory, since=since, until=until, account=account, site=site)
+    expected = reference_summary(rows, since, until, account, site)
+
+    assert set(report) == set(expected)
+    for name, entry in expected.items():
+        assert {key: report[name][key] for key in entry} == entry
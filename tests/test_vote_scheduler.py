@@ -0,0 +1,88 @@
+"""VoteScheduler: Reihenfolge nach Fälligkeit, Neuplanung, Entfernen und leerer Heap"""
+from vote_bot import VoteScheduler
+
+
+def test_pops_in_due_order():
+    scheduler = VoteScheduler()
+    scheduler.schedule('carol', 300)
+    scheduler.schedule('alice', 100)
+    scheduler.schedule('bob', 200)
+    assert scheduler.next_deadline() == 100
+    assert scheduler.pop_due(250) == ['alice', 'bob']
+    assert scheduler.pop_due(1000) == ['carol']
+    assert len(scheduler) == 0
+
+
+def test_reschedule_replaces_queued_entry():
+    scheduler = VoteScheduler()
+    scheduler.schedule('alice', 100)
+    scheduler.schedule('bob', 150)
+    scheduler.schedule('alice', 500)
+    assert len(scheduler) == 2
+    # Der alte Eintrag von alice wird nicht mehr geliefert
+    assert scheduler.next_deadline() == 150
+    assert scheduler.pop_due(200) == ['bob']
+    assert scheduler.pop_due(499) == []
+    assert scheduler.pop_due(500) == ['alice']
+    assert scheduler.pop_due(10 ** 9) == []
+
+
+def test_reschedule_to_earlier_time():
+    scheduler = VoteScheduler()
+    scheduler.schedule('alice', 500)
+    scheduler.schedule('alice', 100)
+    assert scheduler.pop_due(100) == ['alice']
+    assert scheduler.pop_due(500) == []
+
+
+def test_removed_account_is_not_popped():
+    scheduler = VoteScheduler()
+    scheduler.schedule('alice', 100)
+    scheduler.schedule('bob', 200)
+    scheduler.remove('alice')
+    scheduler.remove('unbekannt')
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == 200
+    assert scheduler.pop_due(1000) == ['bob']
+
+
+def test_empty_scheduler():
+    scheduler = VoteScheduler()
+    assert scheduler.next_deadline() is None
+    assert scheduler.pop_due(10 ** 9) == []
+    scheduler.schedule('alice', 100)
+    scheduler.clear()
+    assert len(scheduler) == 0
+    assert scheduler.next_deadline() is None
+
+
+def test_compaction_keeps_latest_due_times():
+    scheduler = VoteScheduler()
+    for round_ in range(100):
+        for name in ('alice', 'bob'):
+            scheduler.schedule(name, 1000 - round_ if name == 'alice' else 2000 + round_)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+    assert scheduler.pop_due(10 ** 9) == ['alice', 'bob']
+
+
+def test_jitter_change_moves_queued_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from vote_bot import AlturiVoteBot
+    bot = AlturiVoteBot(base_url='http://127.0.0.1:1', state_backend='json', use_ledger=False, use_async_webhook=False)
+    try:
+        vote_times = {f'user{i}': {'TopG': f'2030-05-01T12:0{i}:00+02:00'} for i in range(5)}
+        accounts = [{'username': username} for username in vote_times]
+        scheduler = VoteScheduler()
+        bot._rebuild_schedule(scheduler, accounts, vote_times)
+        # Nach einem Fehlversuch um retry_interval verschoben - Verschiebung bleibt erhalten
+        scheduler.schedule('user4', scheduler.entries()['user4'] + 300)
+
+        bot.apply_settings({'dispatch_jitter': 600})
+        bot._reschedule_jitter(scheduler, vote_times, 0)
+        entries = scheduler.entries()
+        for username in ['user0', 'user1', 'user2', 'user3']:
+            assert entries[username] == bot.get_due_timestamp(username, vote_times)
+        assert entries['user4'] == bot.get_due_timestamp('user4', vote_times) + 300
+        assert scheduler.pop_due(min(entries.values())) == [min(entries, key=entries.get)]
+    finally:
+        bot.shutdown()
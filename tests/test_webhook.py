@@ -0,0 +1,135 @@
+"""WebhookNotifier: nur vorübergehende Fehler landen im Spool, abgelehnte Embeds im Dead-Letter"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+import webhook
+from metrics import Metrics
+from webhook import WebhookNotifier
+
+
+@pytest.fixture
+def discord():
+    state = SimpleNamespace(status=204, requests=0)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            state.requests += 1
+            body = json.dumps({'retry_after': 0}).encode()
+            self.send_response(state.status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.url = f'http://127.0.0.1:{server.server_port}/webhook'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def notifier(discord, tmp_path, monkeypatch):
+    # Backoff-Pausen überspringen
+    monkeypatch.setattr(webhook, 'time', SimpleNamespace(sleep=lambda seconds: None, monotonic=time.monotonic, time=time.time))
+    return WebhookNotifier(discord.url, spool_path=str(tmp_path / 'spool.jsonl'), batch_wait=0, max_retries=1,
+                           dead_letter_path=str(tmp_path / 'dead.jsonl'))
+
+
+def deliver(notifier, embed):
+    notifier.start()
+    notifier.send(embed)
+    notifier.stop(timeout=5)
+
+
+def test_permanent_rejection_is_dead_lettered(discord, notifier, tmp_path):
+    discord.status = 400
+    deliver(notifier, {'title': 'kaputt'})
+    assert discord.requests == 1
+    assert not (tmp_path / 'spool.jsonl').exists()
+    entry = json.loads((tmp_path / 'dead.jsonl').read_text())
+    assert entry['status'] == 400 and entry['embeds'] == [{'title': 'kaputt'}]
+    assert notifier.stats()['dead_lettered'] == 1
+
+
+@pytest.mark.parametrize('status', [500, 429])
+def test_transient_failure_is_spooled(discord, notifier, tmp_path, status):
+    discord.status = status
+    deliver(notifier, {'title': 'später'})
+    assert json.loads((tmp_path / 'spool.jsonl').read_text())['embeds'] == [{'title': 'später'}]
+    assert not (tmp_path / 'dead.jsonl').exists()
+
+
+def test_spool_retry_stops_on_rejection(discord, notifier, tmp_path):
+    # Früher gespoolte Embeds, die Discord inzwischen ablehnt, werden nicht endlos erneut eingereiht
+    (tmp_path / 'spool.jsonl').write_text(json.dumps({'failed_at': 0, 'embeds': [{'title': 'alt'}]}) + '\n')
+    discord.status = 404
+    deliver(notifier, {'title': 'neu'})
+    assert not (tmp_path / 'spool.jsonl').exists()
+    assert notifier.stats()['dead_lettered'] == 2
+
+
+def test_delivery_time_is_measured_in_the_notifier(discord, notifier):
+    notifier.metrics = Metrics()
+    deliver(notifier, {'title': 'ok'})
+    assert notifier.metrics.phase_stats()['webhook_send']['count'] == 1
+
+
+def write_spool(path, *titles):
+    path.write_text(''.join(json.dumps({'failed_at': 0, 'embeds': [{'title': title}]}) + '\n' for title in titles))
+
+
+def test_spool_replay_survives_crash_between_batches(discord, notifier, tmp_path, monkeypatch):
+    titles = [f'alt-{i}' for i in range(25)]
+    write_spool(tmp_path / 'spool.jsonl', *titles)
+    delivered = []
+    deliver_batch = notifier._deliver
+
+    def crash_after_first_batch(embeds):
+        if delivered:
+            raise SystemExit('Absturz')
+        delivered.extend(embeds)
+        return deliver_batch(embeds)
+
+    monkeypatch.setattr(notifier, '_deliver', crash_after_first_batch)
+    with pytest.raises(SystemExit):
+        notifier._retry_spool()
+
+    # Zugestellter Batch ist weg, der Rest liegt weiterhin auf Platte
+    assert [embed['title'] for embed in delivered] == titles[:10]
+    restarted = WebhookNotifier(discord.url, spool_path=notifier.spool_path, batch_wait=0, max_retries=1,
+                                dead_letter_path=notifier.dead_letter_path)
+    assert [embed['title'] for embed in restarted._read_spool(restarted.replay_path)] == titles[10:]
+
+    restarted._retry_spool()
+    assert restarted.sent == 15
+    assert not (tmp_path / 'spool.jsonl').exists()
+    assert not (tmp_path / 'spool.jsonl.replay').exists()
+
+
+def test_spool_replay_keeps_entries_while_discord_is_down(discord, notifier, tmp_path):
+    write_spool(tmp_path / 'spool.jsonl', 'alt')
+    discord.status = 500
+    notifier._retry_spool()
+    assert notifier._read_spool(notifier.replay_path) == [{'title': 'alt'}]
+
+    # Neue Fehlschläge landen in einem frischen Spool und werden nach den älteren Embeds gesendet
+    notifier._spool([{'title': 'voll'}])
+    discord.status = 204
+    sent = []
+    deliver_batch = notifier._deliver
+    notifier._deliver = lambda embeds: (sent.extend(embeds), deliver_batch(embeds))[1]
+    notifier._retry_spool()
+    assert sent == [{'title': 'alt'}, {'title': 'voll'}]
+    assert not (tmp_path / 'spool.jsonl').exists()
+    assert not (tmp_path / 'spool.jsonl.replay').exists()
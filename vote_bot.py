@@ -1,65 +1,292 @@
 import time
 import json
 import os
-import requests
+import re
+import heapq
+import signal
+import threading
 import pytz
 from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from concurrent.futures import ThreadPoolExecutor
 import logging
+# Selenium und requests werden erst importiert, wenn ein Browser bzw. HTTP wirklich gebraucht wird (Kaltstart)
+from bot_config import DEFAULT_CHROME_ARGS, DEFAULT_LEAN_CHROME_ARGS, DEFAULT_LEAN_BLOCKED_URLS, DEFAULT_USER_AGENT, DEFAULT_CONFIG_PATH, ConfigError, ConfigWatcher, load_config
+from driver_paths import load_driver_paths
+from driver_pool import DriverPool, DriverWatchdog
+from accounts_watcher import AccountsWatcher
+from load_budget import LoadBudget, stable_jitter
+from lease_store import LeaseManager
+from retry_policy import (RetryManager, classify_exception, ACCOUNT, SITE, BAD_CREDENTIALS, PARSE_FAILURE, SELECTOR_MISSING,
+                          VOTE_REJECTED, BROWSER_CRASH, UNKNOWN)
+from cooldown_predictor import CooldownPredictor
+from vote_ledger import VoteLedger, LedgerRow, ALL_SITES, CHECKED, HTTP_CHECKED, LOGIN_FAILED, ERROR
+from session_store import SessionStore
+from session_replay import SessionRecorder
+from vote_parser import DateTimeParser, parse_vote_rows, parse_coins, parse_coins_text, COINS_JS, VOTE_STATE_JS
+from state_store import create_state_store
+from webhook import WebhookNotifier
+from metrics import Metrics, timed, start_metrics_server, process_uptime
+from log_setup import LogThrottle, setup_logging, parse_module_levels
 
-# Logging Setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('vote_bot.log'),
-        logging.StreamHandler()
-    ]
-)
+class VoteScheduler:
+    """Min-Heap der Fälligkeitszeiten (Unix-Timestamps) pro Account"""
+    def __init__(self):
+        self._heap = []
+        self._due = {}
+    
+    def __len__(self):
+        return len(self._due)
+    
+    def schedule(self, username, due_ts):
+        """Setze (oder ersetze) die Fälligkeit eines Accounts - O(log n)"""
+        self._due[username] = due_ts
+        heapq.heappush(self._heap, (due_ts, username))
+        
+        # Veraltete Heap-Einträge gelegentlich aufräumen
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(ts, name) for name, ts in self._due.items()]
+            heapq.heapify(self._heap)
+    
+    def remove(self, username):
+        """Entferne einen Account aus dem Zeitplan (Lazy Deletion)"""
+        self._due.pop(username, None)
+    
+    def clear(self):
+        self._heap = []
+        self._due = {}
+    
+    def _discard_stale(self):
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+    
+    def next_deadline(self):
+        """Früheste Fälligkeit oder None wenn nichts geplant ist"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+    
+    def entries(self):
+        """{username: Fälligkeit} aller eingeplanten Accounts"""
+        return dict(self._due)
+    
+    def pop_due(self, now_ts):
+        """Entnehme alle Accounts deren Fälligkeit erreicht ist (älteste zuerst)"""
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now_ts:
+                break
+            _, username = heapq.heappop(self._heap)
+            del self._due[username]
+            due.append(username)
+        return due
 
 class AlturiVoteBot:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, use_scheduler=False, use_driver_pool=False, pool_max_uses=20, pool_max_rss_mb=1024, max_workers=1,
+                 use_http_fast_path=False, base_url='https://alturi.to', use_session_store=False, state_backend='sqlite',
+                 use_async_webhook=True, metrics_port=None, metrics_host='127.0.0.1', lean_browser=False, driver_rss_limit_mb=1024,
+                 dispatch_jitter=0, max_load_per_cpu=None, min_available_mb=None, sharded=False, worker_id=None,
+                 log_throttle_seconds=900, estimate_recheck=120, use_ledger=True, record_dir=None, webhook_url=None,
+                 user_agent=DEFAULT_USER_AGENT, chrome_args=DEFAULT_CHROME_ARGS, chrome_extra_args=(), lean_chrome_args=DEFAULT_LEAN_CHROME_ARGS,
+                 lean_blocked_urls=DEFAULT_LEAN_BLOCKED_URLS, config_watcher=None):
         self.headless = headless
+        self.lean_browser = lean_browser
+        self.lean_chrome_args = list(lean_chrome_args)
+        self.lean_blocked_urls = list(lean_blocked_urls)
+        self.use_scheduler = use_scheduler
+        self.base_url = base_url.rstrip('/')
+        self.user_agent = user_agent
+        self.chrome_args = list(chrome_args) + list(chrome_extra_args)
+        
+        # Driver pro Worker-Thread (siehe driver-Property)
+        self._local = threading.local()
         self.driver = None
         self.accounts_file = 'accounts.json'
+        self.accounts_watcher = AccountsWatcher(self.accounts_file)
         self.vote_times_file = 'vote_times.json'
-        self.webhook_url = 'https://discord.com/api/webhooks/1410015421356310589/D8BMzL10uKYESq47j69S3ujXznO6KEsd7gFXc4E_gxwK-B6JLlQ-bus6FgC2neOSA1Tj'
+        self.state_db_file = os.path.join('data', 'vote_state.db')
+        # Beim Image-Build aufgelöste ChromeDriver-/Browser-Pfade (python driver_paths.py)
+        self.driver_cache_file = 'driver_paths.json'
+        self._driver_paths = None
+        self._first_decision_logged = False
+        # Discord-Webhook (Secret - nur aus config/votebot.json bzw. VOTEBOT_WEBHOOK_URL); None = keine Benachrichtigungen
+        self.webhook_url = webhook_url
+        self.webhook_timeout = 10
+        
+        # Hauptschleife: Abstand der Durchläufe, Pause nach unerwartetem Fehler bzw. ohne Accounts
+        self.loop_interval = 60
+        self.error_pause = 60
+        self.no_accounts_pause = 300
+        
+        # Scheduler-Modus: Intervall für Dateiänderungs-Checks und Retry nach Durchlauf ohne neue Zeit
+        self.file_poll_interval = 5
+        self.retry_interval = 60
+        
+        # Standard-Timeout für explizite Waits (Sekunden); wait_cap begrenzt alle Waits (Replay gegen lokale Aufnahmen)
+        self.wait_timeout = 10
+        self.wait_cap = None
+        self.vote_tab_timeout = 5
+        self.confirm_timeout = 5
+        self.vote_state_timeout = 5
+        
+        # Confirm-Button: Wartezeit ohne Reload; pro Vote-Seite gelernt ob sie dafür neu geladen werden muss (fehlt = unbekannt)
+        self.confirm_wait = 2
+        self.confirm_needs_reload = {}
+        
+        # Hot Reload der Zeit- und Concurrency-Werte (siehe apply_settings)
+        self.config_watcher = config_watcher
+        
+        # Reihenfolge der Coins-Strategien - die zuletzt erfolgreiche wandert nach vorne
+        self.coins_strategies = ['js', 'page_source', 'xpath', 'red_span']
+        self._coins_lock = threading.Lock()
+        
+        # Parallele Verarbeitung: max. gleichzeitige Accounts und Mindestabstand zwischen Session-Starts
+        self.max_workers = max(1, max_workers)
+        self.politeness_delay = 5
+        # Pause zwischen Accounts im sequentiellen Modus
+        self.account_pause = 5
+        self._state_lock = threading.Lock()
+        self._politeness_lock = threading.Lock()
+        self._last_session_start = 0
+        
+        # Wiederkehrende "noch nicht fällig"-Meldungen pro Account höchstens alle log_throttle_seconds
+        self.log_throttle_seconds = log_throttle_seconds
+        self.log_throttle = LogThrottle(log_throttle_seconds)
+        
+        # Dispatch: fällige Accounts um bis zu dispatch_jitter Sekunden versetzt starten, Sessions nur innerhalb des Lastbudgets
+        self.dispatch_jitter = dispatch_jitter
+        self.max_load_per_cpu = max_load_per_cpu
+        self.min_available_mb = min_available_mb
+        self.load_budget = LoadBudget(max_load_per_cpu=max_load_per_cpu, min_available_mb=min_available_mb)
+        
+        # Driver-Pool: warme Browser-Instanzen statt neuem Chrome pro Account
+        self.driver_pool = None
+        if use_driver_pool:
+            self.driver_pool = DriverPool(
+                self._create_driver,
+                max_idle=self.max_workers,
+                max_uses=pool_max_uses,
+                max_rss_mb=pool_max_rss_mb,
+                origins=[self.base_url]
+            )
+        
+        # Watchdog: beendet Driver über dem RSS-Limit und misst den Peak pro Account
+        self.driver_rss_limit_mb = driver_rss_limit_mb
+        self.driver_watchdog = DriverWatchdog(max_rss_mb=driver_rss_limit_mb)
+        self.driver_watchdog.start()
+        
+        # State-Backend: SQLite/WAL (Standard) oder vote_times.json (Kompatibilität)
+        self.state_store = create_state_store(state_backend, json_path=self.vote_times_file, sqlite_path=self.state_db_file)
+        
+        # Backoff und Circuit-Breaker pro Account und Vote-Seite - persistiert im State-Backend
+        self.retry_manager = RetryManager(self.state_store)
+        
+        # Gelernte Abklingzeit pro Vote-Seite - schätzt fehlende Next-Vote Zeiten statt minütlich neu einzuloggen
+        self.estimate_recheck = estimate_recheck
+        self.cooldown_predictor = CooldownPredictor(self.state_store, recheck=estimate_recheck, poll_interval=self.retry_interval)
+        
+        # Timing-Spans und Zähler pro Phase (optional als /metrics-Endpoint)
+        self.metrics = Metrics()
+        
+        # Sharding: mehrere Worker teilen sich die Accounts über Leases in der geteilten SQLite-Datei
+        self.lease_manager = None
+        if sharded:
+            if state_backend != 'sqlite':
+                raise ValueError("Sharding benötigt das SQLite State-Backend")
+            self.lease_manager = LeaseManager(self.state_db_file, worker_id=worker_id)
+            self.lease_manager.start()
+        
+        # Ledger: eine Zeile pro Vote-Versuch (Abfragen: python vote_ledger.py summary) - im Sharding-Modus eins pro Worker
+        self.vote_ledger = None
+        if use_ledger:
+            ledger_dir = os.path.join('data', 'ledger')
+            if self.lease_manager:
+                ledger_dir = os.path.join(ledger_dir, re.sub(r'[^\w.-]', '_', self.lease_manager.worker_id))
+            self.vote_ledger = VoteLedger(ledger_dir)
+        
+        # Webhook-Versand im Hintergrund, damit ein langsamer Endpoint den Vote-Ablauf nicht blockiert
+        self.webhook_notifier = None
+        if not self.webhook_url:
+            logging.info("🔕 Kein Discord-Webhook konfiguriert (VOTEBOT_WEBHOOK_URL) - Benachrichtigungen aus")
+        elif use_async_webhook:
+            self.webhook_notifier = WebhookNotifier(self.webhook_url, timeout=self.webhook_timeout, metrics=self.metrics)
+            self.webhook_notifier.start()
+        
+        # Recording: URL und HTML jedes Schritts pro Account-Session unter record_dir (Replay: python session_replay.py)
+        self.record_dir = record_dir
+        
+        # Session-Store: verschlüsselte Cookies pro Account, damit Logins übersprungen werden können
+        self.session_store = SessionStore() if use_session_store else None
+        
+        # HTTP-Fast-Path: "noch nicht fällig"-Checks ohne Browser
+        self.http_client = None
+        if use_http_fast_path:
+            from http_status import HttpStatusClient
+            self.http_client = HttpStatusClient(self.base_url, user_agent=self.user_agent, session_store=self.session_store)
         
         # Timezone Setup für Deutschland
         self.germany_tz = pytz.timezone('Europe/Berlin')
+        self.datetime_parser = DateTimeParser(self.germany_tz)
         
-        # Debug-Logging aktivieren für Datetime-Parsing
-        if logging.getLogger().level <= logging.INFO:
-            logging.getLogger().setLevel(logging.DEBUG)
+        # Stats der Komponenten zusätzlich als Gauges exportieren
+        if self.driver_pool:
+            self.metrics.add_collector('driver_pool', self.driver_pool.stats)
+        self.metrics.add_collector('driver_watchdog', self.driver_watchdog.stats)
+        self.metrics.add_collector('load_budget', self.load_budget.stats)
+        self.metrics.add_collector('retry', self.retry_manager.stats)
+        self.metrics.add_collector('cooldown', self.cooldown_predictor.stats)
+        if self.vote_ledger:
+            self.metrics.add_collector('ledger', self.vote_ledger.stats)
+        self.metrics.add_collector('logging', lambda: {'suppressed': self.log_throttle.suppressed})
+        if self.lease_manager:
+            self.metrics.add_collector('leases', self.lease_manager.stats)
+        if self.session_store:
+            self.metrics.add_collector('session_store', self.session_store.stats)
+        if self.webhook_notifier:
+            self.metrics.add_collector('webhook', self.webhook_notifier.stats)
+        if self.config_watcher:
+            self.metrics.add_collector('config', self.config_watcher.stats)
+        self.metrics_server = start_metrics_server(self.metrics, metrics_port, metrics_host) if metrics_port else None
         
+    @property
+    def driver(self):
+        """WebDriver des aktuellen Worker-Threads"""
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+    
+    @timed('setup_driver')
     def setup_driver(self):
-        """Setup Chrome WebDriver mit Optionen"""
+        """Setup Chrome WebDriver (aus dem Pool falls aktiviert)"""
+        if self.driver_pool:
+            self.driver = self.driver_pool.acquire()
+        else:
+            self.driver = self._create_driver()
+    
+    def _create_driver(self):
+        """Starte neuen Chrome WebDriver mit Optionen"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument('--headless')
         
-        # Anti-Detection Optionen
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--allow-running-insecure-content')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-images')  # Schneller laden
-        chrome_options.add_argument('--disable-javascript-harmony-promises')
-        chrome_options.add_argument('--disable-background-timer-throttling')
-        chrome_options.add_argument('--disable-renderer-backgrounding')
-        chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-        chrome_options.add_argument('--window-size=1920,1080')
+        # Anti-Detection/Performance-Flags (chrome_args bzw. chrome_extra_args in der Konfiguration)
+        for argument in self.chrome_args:
+            chrome_options.add_argument(argument)
+        
+        # Lean-Profil: weniger Renderer, kleine Caches, keine Hintergrund-Dienste (lean_chrome_args in der Konfiguration)
+        if self.lean_browser:
+            for argument in self.lean_chrome_args:
+                chrome_options.add_argument(argument)
+            # DOMContentLoaded reicht - gewartet wird ohnehin explizit auf Elemente
+            chrome_options.page_load_strategy = 'eager'
         
         # User-Agent setzen
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36')
+        chrome_options.add_argument(f'--user-agent={self.user_agent}')
         
         # Logging reduzieren
         chrome_options.add_argument('--log-level=3')
@@ -77,30 +304,180 @@ class AlturiVoteBot:
         }
         chrome_options.add_experimental_option('prefs', prefs)
         
-        # ChromeDriver Setup (funktioniert mit Chrome und Chromium)
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-        except Exception as e:
-            # Fallback für Chromium
-            logging.warning(f"Chrome-Setup fehlgeschlagen, versuche Chromium: {e}")
-            chrome_options.binary_location = '/usr/bin/chromium'
-            from selenium.webdriver.chrome.service import Service
-            service = Service('/usr/bin/chromedriver')
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        # ChromeDriver Setup: bekannte Pfade (Build-Cache bzw. erster erfolgreicher Start) ohne Selenium Manager
+        if self._driver_paths is None:
+            self._driver_paths = load_driver_paths(self.driver_cache_file) or {}
+        if self._driver_paths.get('chromedriver'):
+            if self._driver_paths.get('browser'):
+                chrome_options.binary_location = self._driver_paths['browser']
+            driver = webdriver.Chrome(service=Service(self._driver_paths['chromedriver']), options=chrome_options)
+        else:
+            # Kein Cache: Selenium Manager (funktioniert mit Chrome und Chromium)
+            try:
+                driver = webdriver.Chrome(options=chrome_options)
+            except Exception as e:
+                # Fallback für Chromium
+                logging.warning(f"Chrome-Setup fehlgeschlagen, versuche Chromium: {e}")
+                chrome_options.binary_location = '/usr/bin/chromium'
+                service = Service('/usr/bin/chromedriver')
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Aufgelöste Pfade für alle weiteren Starts in diesem Prozess merken
+            self._driver_paths = {'chromedriver': driver.service.path, 'browser': chrome_options.binary_location or None}
         
-        self.driver.implicitly_wait(10)
+        # Keine implizite Wartezeit - gewartet wird nur explizit über wait_for()
+        driver.implicitly_wait(0)
         
         # Anti-Detection Script
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        if self.lean_browser:
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.lean_blocked_urls})
+            except Exception as e:
+                logging.warning(f"⚠️ Request-Blocking konnte nicht aktiviert werden: {e}")
         
         logging.info("WebDriver erfolgreich gestartet")
+        return driver
         
+    @timed('close_driver')
     def close_driver(self):
-        """WebDriver schließen"""
+        """WebDriver schließen (bzw. an den Pool zurückgeben)"""
         if self.driver:
-            self.driver.quit()
+            _, killed = self.driver_watchdog.unwatch(self.driver)
+            if killed:
+                # Vom Watchdog beendet - nie zurück in den Pool
+                if self.driver_pool:
+                    self.driver_pool.discard(self.driver, "RSS-Limit überschritten")
+                else:
+                    try:
+                        self.driver.quit()
+                    except Exception as e:
+                        logging.debug(f"Fehler beim Beenden des WebDrivers: {e}")
+            elif self.driver_pool:
+                self.driver_pool.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
     
+    def log_session_store_stats(self):
+        """Session-Store-Metriken (gesparte Logins, vermiedene Round-Trip-Zeit) loggen"""
+        if not self.session_store:
+            return
+        stats = self.session_store.stats()
+        logging.info(f"   🍪 Sessions: {stats['saved_logins']} Login(s) gespart, {stats['expired_sessions']} abgelaufen, "
+                     f"Ø Login {stats['login_avg_seconds']:.2f}s vs. Ø Restore {stats['restore_avg_seconds']:.2f}s, "
+                     f"eingespart ~{stats['saved_seconds']:.0f}s")
+    
+    def log_webhook_stats(self):
+        """Webhook-Metriken (Queue-Tiefe, Zustell-Latenz) loggen"""
+        if not self.webhook_notifier:
+            return
+        stats = self.webhook_notifier.stats()
+        logging.info(f"   📨 Webhook: Queue {stats['queue_depth']}, {stats['sent']} Embed(s) in {stats['batches']} Nachricht(en) gesendet, "
+                     f"Ø Latenz {stats['latency_avg_seconds']:.2f}s (p95 {stats['latency_p95_seconds']:.2f}s), "
+                     f"{stats['rate_limited']}x Rate-Limit, {stats['spooled']} im Spool, {stats['dead_lettered']} abgelehnt")
+    
+    def log_metrics_summary(self):
+        """Dauer pro Phase (Ø/p95) und Zähler aus den Timing-Spans loggen"""
+        phases = self.metrics.phase_stats()
+        for phase, stats in sorted(phases.items(), key=lambda item: -item[1]['avg_seconds'] * item[1]['count']):
+            logging.info(f"   ⏱️  {phase}: {stats['count']}x, Ø {stats['avg_seconds']:.2f}s, p95 {stats['p95_seconds']:.2f}s")
+        counters = self.metrics.counters()
+        if counters:
+            logging.info(f"   📈 Zähler: {', '.join(f'{name} {value}' for name, value in sorted(counters.items()))}")
+    
+    def log_dispatch_stats(self):
+        """Hauptlatenz "fällig → gevotet" (p50/p95) und Wartezeiten durch das Lastbudget loggen"""
+        stats = self.metrics.phase_stats().get('due_to_voted')
+        if stats:
+            logging.info(f"   🎯 Fällig → gevotet: p50 {stats['p50_seconds']:.0f}s, p95 {stats['p95_seconds']:.0f}s ({stats['count']} Vote(s))")
+        if self.load_budget.waits:
+            budget = self.load_budget.stats()
+            logging.info(f"   🚦 Lastbudget: {budget['waits']}x gewartet, insgesamt {budget['waited_seconds']:.0f}s, {budget['timeouts']}x Timeout")
+    
+    def log_retry_stats(self):
+        """Accounts im Backoff und offene Circuit-Breaker loggen"""
+        stats = self.retry_manager.stats()
+        if not stats['failures'] and not stats['accounts_backoff']:
+            return
+        logging.info(f"   🧯 Retry: {stats['accounts_backoff']} Account(s) im Backoff, {stats['breakers_open']} Breaker offen, "
+                     f"{stats['failures']} Fehler klassifiziert")
+    
+    def log_cooldown_stats(self):
+        """Geschätzte Next-Vote Zeiten, dadurch gesparte Seitenaufrufe und Trefferquote loggen"""
+        stats = self.cooldown_predictor.stats()
+        if not stats['estimates']:
+            return
+        logging.info(f"   🔮 Schätzungen: {stats['estimates']} Next-Vote Zeit(en) geschätzt, ~{stats['page_loads_saved']} Seitenaufruf(e) gespart, "
+                     f"{stats['confirmed']} bestätigt (Ø {stats['early_avg_seconds'] / 60:.0f} min zu früh, {stats['confirmed_late']}x zu spät)")
+    
+    def log_memory_stats(self):
+        """Peak-RSS pro Account und Watchdog-Eingriffe loggen"""
+        stats = self.driver_watchdog.stats()
+        if not self.driver_watchdog.peaks:
+            return
+        logging.info(f"   🧠 Speicher: Peak-RSS pro Account max {stats['peak_rss_max_mb']:.0f} MB, Ø {stats['peak_rss_avg_mb']:.0f} MB, "
+                     f"{stats['kills']} WebDriver vom Watchdog beendet (Limit {self.driver_watchdog.max_rss_mb} MB)")
+    
+    def log_driver_pool_stats(self):
+        """Pool-Metriken (Hit-Rate, Startzeit) loggen"""
+        if not self.driver_pool:
+            return
+        stats = self.driver_pool.stats()
+        logging.info(f"   ♻️  Driver-Pool: Hit-Rate {stats['hit_rate']:.0%} ({stats['hits']} Hits / {stats['misses']} Starts), "
+                     f"Ø Startzeit {stats['startup_avg_seconds']:.2f}s, eingespart ~{stats['startup_saved_seconds']:.0f}s, "
+                     f"recycelt {stats['recycled']}")
+    
+    def shutdown(self):
+        """Offene Ressourcen (Driver-Pool, Webhook-Queue, Metrik-Endpoint, Ledger, State-Backend) freigeben"""
+        self.close_driver()
+        if self.driver_pool:
+            self.driver_pool.close_all()
+        if self.webhook_notifier:
+            self.webhook_notifier.stop()
+        self.driver_watchdog.stop()
+        if self.lease_manager:
+            self.lease_manager.close()
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+        if self.vote_ledger:
+            self.vote_ledger.close()
+        self.state_store.close()
+    
+    def apply_settings(self, settings):
+        """Zeit- und Concurrency-Werte (bot_config.RELOADABLE) übernehmen - beim Start und per Hot Reload zwischen Durchläufen"""
+        changed = []
+        for name, value in settings.items():
+            if getattr(self, name) != value:
+                changed.append(f"{name}={value}")
+            setattr(self, name, value)
+        self.max_workers = max(1, self.max_workers)
+        
+        # Komponenten mit eigener Kopie der Werte
+        if self.driver_pool:
+            self.driver_pool.max_idle = self.max_workers
+        self.load_budget.max_load_per_cpu = self.max_load_per_cpu
+        self.load_budget.min_available_mb = self.min_available_mb
+        self.driver_watchdog.max_rss_mb = self.driver_rss_limit_mb
+        self.log_throttle.interval = self.log_throttle_seconds
+        self.cooldown_predictor.recheck = self.estimate_recheck
+        self.cooldown_predictor.poll_interval = self.retry_interval
+        if self.webhook_notifier:
+            self.webhook_notifier.timeout = self.webhook_timeout
+        
+        if changed:
+            logging.info(f"⚙️  Konfiguration übernommen: {', '.join(changed)}")
+        return changed
+    
+    def reload_config(self):
+        """Hot Reload: geänderte Zeit-/Concurrency-Werte aus der Konfigurationsdatei übernehmen"""
+        if not self.config_watcher:
+            return
+        changes = self.config_watcher.poll()
+        if changes:
+            self.apply_settings(changes)
+    
     def load_accounts(self):
         """Lade Account-Daten aus JSON-Datei"""
         if os.path.exists(self.accounts_file):
@@ -125,17 +502,42 @@ class AlturiVoteBot:
             logging.info(f"Beispiel-Accounts-Datei '{self.accounts_file}' erstellt. Bitte mit deinen Daten füllen!")
             return example_accounts
     
+    def refresh_accounts(self):
+        """Accounts über den Watcher laden - (Accounts, AccountsDiff oder None falls unverändert)"""
+        if not os.path.exists(self.accounts_file):
+            self.load_accounts()  # legt die Beispiel-Datei an
+        diff = self.accounts_watcher.poll()
+        if diff and not diff.initial:
+            logging.info(f"📝 accounts.json geändert: {len(diff.added)} neu, {len(diff.removed)} entfernt, {len(diff.modified)} geändert")
+        return self.accounts_watcher.accounts, diff
+    
+    def apply_accounts_diff(self, diff, vote_times):
+        """vote_times an einen AccountsDiff anpassen - beim ersten Laden vollständiger Abgleich"""
+        if diff.initial:
+            return self.sync_vote_times_with_accounts(diff.accounts, vote_times)
+        
+        removed = [username for username in diff.removed if username in vote_times]
+        with self._state_lock:
+            for username in removed:
+                del vote_times[username]
+                logging.info(f"🗑️  Account '{username}' aus vote_times entfernt (nicht mehr in accounts.json)")
+        if self.http_client:
+            for username in diff.removed:
+                self.http_client.drop_session(username)
+        if removed:
+            self.save_vote_times(vote_times, removed)
+        if diff.added:
+            logging.info(f"🆕 Neue Accounts erkannt: {', '.join(account['username'] for account in diff.added)} - werden beim ersten Vote hinzugefügt")
+        return vote_times
+    
     def load_vote_times(self):
-        """Lade gespeicherte Vote-Zeiten"""
-        if os.path.exists(self.vote_times_file):
-            with open(self.vote_times_file, 'r') as f:
-                return json.load(f)
-        return {}
+        """Lade gespeicherte Vote-Zeiten ({username: {Vote-Seite: ISO-Zeit}})"""
+        return self.state_store.load()
     
-    def save_vote_times(self, vote_times):
-        """Speichere Vote-Zeiten"""
-        with open(self.vote_times_file, 'w') as f:
-            json.dump(vote_times, f, indent=4)
+    def save_vote_times(self, vote_times, usernames=None):
+        """Speichere Vote-Zeiten (mit usernames nur die Einträge dieser Accounts)"""
+        with self._state_lock:
+            self.state_store.save(vote_times, usernames)
     
     def sync_vote_times_with_accounts(self, accounts, vote_times):
         """Synchronisiere vote_times.json mit accounts.json"""
@@ -157,6 +559,9 @@ class AlturiVoteBot:
                 del vote_times[username]
                 logging.info(f"🗑️  Account '{username}' aus vote_times.json entfernt (nicht mehr in accounts.json)")
             
+            if removed_accounts:
+                self.save_vote_times(vote_times, removed_accounts)
+            
             # Logge neue Accounts (werden beim ersten Vote automatisch hinzugefügt)
             if new_accounts:
                 logging.info(f"🆕 Neue Accounts erkannt: {', '.join(new_accounts)} - werden beim ersten Vote hinzugefügt")
@@ -169,51 +574,80 @@ class AlturiVoteBot:
         except Exception as e:
             logging.error(f"Fehler bei der Synchronisation von vote_times: {e}")
             return vote_times
-        """Speichere Vote-Zeiten"""
-        with open(self.vote_times_file, 'w') as f:
-            json.dump(vote_times, f, indent=4)
-    
+
+    @timed('get_current_coins')
     def get_current_coins(self):
-        """Hole aktuellen Vote-Coins Stand"""
+        """Hole aktuellen Vote-Coins Stand - zuletzt erfolgreiche Strategie zuerst, Volltext-Suche nur als letzter Ausweg"""
         try:
-            # Suche nach "Current Vote-Coins:" Text
-            coins_elements = self.driver.find_elements(By.XPATH, "//text()[contains(., 'Current Vote-Coins:')]/following-sibling::span | //span[contains(preceding-sibling::text(), 'Current Vote-Coins:')]")
-            
-            if coins_elements:
-                coins_text = coins_elements[0].text.strip()
-                # Entferne alle nicht-numerischen Zeichen außer Zahlen
-                coins_number = ''.join(filter(str.isdigit, coins_text))
-                if coins_number:
-                    return int(coins_number)
-            
-            # Alternative Suche: Suche nach rotem Text der Coins enthält
-            red_spans = self.driver.find_elements(By.CSS_SELECTOR, "span[style*='color:red'], span[style*='color: red']")
-            for span in red_spans:
-                coins_text = span.text.strip()
-                if coins_text.isdigit():
-                    return int(coins_text)
-            
-            # Weitere Alternative: Suche im gesamten Seitentext
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            if "Current Vote-Coins:" in page_text:
-                lines = page_text.split('\n')
-                for i, line in enumerate(lines):
-                    if "Current Vote-Coins:" in line:
-                        # Suche in dieser und den nächsten Zeilen nach einer Zahl
-                        for j in range(max(0, i-1), min(len(lines), i+3)):
-                            words = lines[j].split()
-                            for word in words:
-                                cleaned_word = ''.join(filter(str.isdigit, word))
-                                if cleaned_word and len(cleaned_word) >= 2:  # Mindestens 2-stellige Zahl
-                                    return int(cleaned_word)
+            for i, strategy in enumerate(list(self.coins_strategies)):
+                try:
+                    coins = getattr(self, f'_coins_via_{strategy}')()
+                except Exception as e:
+                    logging.debug(f"Coins-Strategie '{strategy}' fehlgeschlagen: {e}")
+                    continue
+                if coins is None:
+                    continue
+                
+                # Erfolgreiche Strategie nach vorne - die Seite ändert sich selten
+                if i:
+                    with self._coins_lock:
+                        if strategy in self.coins_strategies:
+                            self.coins_strategies.remove(strategy)
+                            self.coins_strategies.insert(0, strategy)
+                    logging.info(f"Coins-Strategie '{strategy}' wird ab jetzt zuerst versucht")
+                self.metrics.inc('coins_strategy_total', strategy=strategy)
+                return coins
+            
+            # Letzter Ausweg: kompletten Seitentext übertragen und durchsuchen
+            coins = self._coins_via_body_text()
+            if coins is not None:
+                logging.warning("⚠️ Vote-Coins nur über den kompletten Seitentext gefunden - Selektoren prüfen")
+                self.metrics.inc('coins_strategy_total', strategy='body_text')
+                return coins
             
             logging.warning("Konnte Current Vote-Coins nicht finden")
+            self.metrics.inc('parse_failures_total', kind='coins')
             return None
             
         except Exception as e:
             logging.error(f"Fehler beim Ermitteln der Vote-Coins: {e}")
             return None
     
+    def _coins_via_js(self):
+        """Ein Round-Trip: Span hinter "Current Vote-Coins:" bzw. roter Zahlen-Span per JavaScript"""
+        coins_text = self.driver.execute_script(COINS_JS)
+        coins_number = ''.join(filter(str.isdigit, coins_text or ''))
+        return int(coins_number) if coins_number else None
+    
+    def _coins_via_page_source(self):
+        """Ein Round-Trip: Regex über das Seiten-HTML"""
+        return parse_coins(self.driver.page_source)
+    
+    def _coins_via_xpath(self):
+        """Suche nach "Current Vote-Coins:" Text per XPath (langsam bei großem DOM)"""
+        from selenium.webdriver.common.by import By
+        coins_elements = self.driver.find_elements(By.XPATH, "//text()[contains(., 'Current Vote-Coins:')]/following-sibling::span | //span[contains(preceding-sibling::text(), 'Current Vote-Coins:')]")
+        if coins_elements:
+            # Entferne alle nicht-numerischen Zeichen außer Zahlen
+            coins_number = ''.join(filter(str.isdigit, coins_elements[0].text.strip()))
+            if coins_number:
+                return int(coins_number)
+        return None
+    
+    def _coins_via_red_span(self):
+        """Rote Spans einzeln abfragen (ein Round-Trip pro Span)"""
+        from selenium.webdriver.common.by import By
+        for span in self.driver.find_elements(By.CSS_SELECTOR, "span[style*='color:red'], span[style*='color: red']"):
+            coins_text = span.text.strip()
+            if coins_text.isdigit():
+                return int(coins_text)
+        return None
+    
+    def _coins_via_body_text(self):
+        """Gesamten Seitentext übertragen und um "Current Vote-Coins:" nach einer Zahl suchen"""
+        from selenium.webdriver.common.by import By
+        return parse_coins_text(self.driver.find_element(By.TAG_NAME, "body").text)
+    
     def send_discord_webhook(self, account_name, old_coins, new_coins, success=True, error_message=None):
         """Sende Discord Webhook Nachricht"""
         try:
@@ -250,11 +684,22 @@ class AlturiVoteBot:
                     "timestamp": datetime.now().isoformat()
                 }
             
+            if not self.webhook_url:
+                return
+            
+            # Asynchron: einreihen und sofort weiter
+            if self.webhook_notifier:
+                self.webhook_notifier.send(embed)
+                return
+            
+            import requests
             payload = {
                 "embeds": [embed]
             }
             
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            # Asynchron misst der WebhookNotifier die Zustellung selbst
+            with self.metrics.span('webhook_send'):
+                response = requests.post(self.webhook_url, json=payload, timeout=self.webhook_timeout)
             
             if response.status_code == 204:
                 logging.info(f"Discord Webhook erfolgreich gesendet für {account_name}")
@@ -271,53 +716,93 @@ class AlturiVoteBot:
     def parse_datetime(self, date_str):
         """Parse Datum/Zeit String (DD.MM.YYYY HH:MM Uhr/Clock) in deutscher Zeitzone"""
         try:
-            # Bereinige den String
-            date_str = date_str.strip()
-            
-            # Entferne "Uhr" oder "Clock" am Ende
-            date_str = date_str.replace(' Uhr', '').replace(' Clock', '').strip()
-            
-            logging.debug(f"Versuche zu parsen: '{date_str}'")
-            
-            # Verschiedene Formate versuchen
-            formats = [
-                '%d.%m.%Y %H:%M',  # DD.MM.YYYY HH:MM
-                '%d.%m.%Y %H:%M:%S',  # DD.MM.YYYY HH:MM:SS
-                '%Y-%m-%d %H:%M',  # YYYY-MM-DD HH:MM
-                '%Y-%m-%d %H:%M:%S'  # YYYY-MM-DD HH:MM:SS
-            ]
-            
-            for fmt in formats:
-                try:
-                    # Parse als naive datetime
-                    parsed_date = datetime.strptime(date_str, fmt)
-                    
-                    # Konvertiere zu deutscher Zeitzone (Website Zeit ist Deutschland)
-                    parsed_date = self.germany_tz.localize(parsed_date)
-                    
-                    logging.debug(f"Erfolgreich geparst mit Format '{fmt}': {parsed_date}")
-                    return parsed_date
-                except ValueError:
-                    continue
-            
-            logging.error(f"Konnte Datum nicht parsen: '{date_str}' (Original)")
-            return None
+            parsed_date = self.datetime_parser.parse(date_str)
+            if parsed_date is None:
+                logging.error(f"Konnte Datum nicht parsen: '{date_str}' (Original)")
+            return parsed_date
             
         except Exception as e:
             logging.error(f"Fehler beim Parsen des Datums '{date_str}': {e}")
             return None
     
+    def wait_for(self, condition, description, timeout=None, required=True):
+        """Warte bis eine DOM/URL-Bedingung erfüllt ist und logge die tatsächlich gewartete Zeit"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException, NoSuchElementException
+        
+        timeout = self.wait_timeout if timeout is None else timeout
+        if self.wait_cap is not None:
+            timeout = min(timeout, self.wait_cap)
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+            logging.debug(f"⏱️  Wait '{description}' erfüllt nach {time.monotonic() - start:.2f}s")
+            return result
+        except TimeoutException:
+            logging.debug(f"⏱️  Wait '{description}' Timeout nach {time.monotonic() - start:.2f}s")
+            if required:
+                # Seite vollständig geladen, Element trotzdem nicht da: Selektor passt nicht mehr (statt Netzwerk-Timeout)
+                if self._page_loaded():
+                    raise NoSuchElementException(f"'{description}' nach {timeout}s nicht erfüllt (Seite vollständig geladen)")
+                raise
+            return None
+    
+    def _record_step(self, step):
+        """Recording-Modus: aktuellen Seitenstand als Schritt der Session speichern (fremde Vote-Seiten nur als URL)"""
+        recorder = getattr(self._local, 'recorder', None)
+        if recorder is None:
+            return
+        try:
+            url = self.driver.current_url
+            recorder.snapshot(step, url, self.driver.page_source if url.startswith(self.base_url) else None)
+        except Exception as e:
+            logging.debug(f"Schritt '{step}' konnte nicht aufgenommen werden: {e}")
+    
+    def _page_loaded(self):
+        from selenium.common.exceptions import WebDriverException
+        try:
+            return self.driver.execute_script('return document.readyState') == 'complete'
+        except WebDriverException:
+            return False
+    
+    def _note_failure(self, kind, error):
+        """Fehlerklasse des letzten Fehlers im aktuellen Worker-Thread merken (für Backoff/Breaker)"""
+        self._local.last_failure = (kind, str(error))
+    
+    def _last_failure(self, default_error):
+        return getattr(self._local, 'last_failure', None) or (UNKNOWN, default_error)
+    
+    def _vote_state_changed(self, old_coins, row):
+        """Bedingung: Coins-Wert oder Status-Zelle der gevoteten Zeile hat sich geändert (ein Round-Trip pro Poll)"""
+        from selenium.common.exceptions import WebDriverException
+        old_cell_text = ' '.join(row.cell_text.split()) if row else None
+        
+        def condition(driver):
+            try:
+                coins_text, cell_text = driver.execute_script(VOTE_STATE_JS, row.index + 1 if row else 0)
+            except WebDriverException:
+                # Seite wird gerade ersetzt
+                return False
+            coins_number = ''.join(filter(str.isdigit, coins_text or ''))
+            if old_coins is not None and coins_number and int(coins_number) != old_coins:
+                return True
+            return bool(old_cell_text and cell_text and ' '.join(cell_text.split()) != old_cell_text)
+        return condition
+    
+    @timed('login')
     def login(self, username, password):
         """Login auf alturi.to"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             logging.info(f"Starte Login für {username}...")
-            self.driver.get('https://alturi.to/login')
+            self.driver.get(f'{self.base_url}/login')
             
             # Warte auf Login-Formular
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "user"))
-            )
-            time.sleep(1)
+            self.wait_for(EC.presence_of_element_located((By.NAME, "user")), "Login-Formular vorhanden")
+            self.wait_for(EC.element_to_be_clickable((By.NAME, "goingin")), "Login-Button klickbar")
+            self._record_step('login_form')
             
             # Finde Login-Elemente
             username_field = self.driver.find_element(By.NAME, "user")
@@ -333,8 +818,9 @@ class AlturiVoteBot:
             # Login-Button klicken
             login_button.click()
             
-            # Warte auf Weiterleitung
-            time.sleep(3)
+            # Warte auf Weiterleitung (Login-Formular wird durch neue Seite ersetzt)
+            self.wait_for(EC.staleness_of(login_button), "Weiterleitung nach Login", required=False)
+            self._record_step('after_login')
             
             current_url = self.driver.current_url
             logging.info(f"URL nach Login: {current_url}")
@@ -344,8 +830,13 @@ class AlturiVoteBot:
             
             # Teste Login durch Zugriff auf /vote
             logging.info(f"Teste Login-Status durch /vote Zugriff...")
-            self.driver.get('https://alturi.to/vote')
-            time.sleep(2)
+            self.driver.get(f'{self.base_url}/vote')
+            self.wait_for(
+                EC.any_of(EC.url_contains('/vote'), EC.url_contains('/home'), EC.url_contains('/login')),
+                "URL nach /vote Zugriff",
+                required=False
+            )
+            self._record_step('login_check')
             
             vote_url = self.driver.current_url
             logging.info(f"URL nach /vote Zugriff: {vote_url}")
@@ -355,129 +846,245 @@ class AlturiVoteBot:
                 return True
             elif '/home' in vote_url or '/login' in vote_url:
                 logging.error(f"❌ Login fehlgeschlagen für {username} - Zugriff auf /vote verweigert")
+                self._note_failure(BAD_CREDENTIALS, "Zugriff auf /vote nach Login verweigert")
                 return False
             else:
                 logging.warning(f"⚠️ Unerwartete URL nach /vote Test: {vote_url}")
                 # Bei Unsicherheit als fehlgeschlagen behandeln
+                self._note_failure(PARSE_FAILURE, f"Unerwartete URL nach Login: {vote_url}")
                 return False
                 
         except Exception as e:
             logging.error(f"Fehler beim Login für {username}: {e}")
+            self._note_failure(classify_exception(e), e)
             return False
     
-    def check_and_vote(self, username, account):
-        """Prüfe Vote-Status und vote falls möglich"""
+    def restore_session(self, username):
+        """Gespeicherte Cookies in den Browser laden und mit einem einzigen /vote-Request prüfen"""
+        cookies = self.session_store.load(username)
+        if not cookies:
+            return False
+        
+        start = time.monotonic()
         try:
-            self.driver.get('https://alturi.to/vote')
-            time.sleep(2)
+            # Network.setCookie braucht (anders als add_cookie) keinen vorherigen Seitenaufruf der Domain
+            for cookie in cookies:
+                params = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite') if key in cookie}
+                if 'expiry' in cookie:
+                    params['expires'] = cookie['expiry']
+                if not params.get('domain'):
+                    params['url'] = self.base_url
+                self.driver.execute_cdp_cmd('Network.setCookie', params)
             
-            # Suche Vote-Tabelle mit spezifischem Selektor
-            vote_table = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "table.table"))
-            )
+            self.driver.get(f'{self.base_url}/vote')
+            self._record_step('session_restore')
+            valid = '/vote' in self.driver.current_url
+        except Exception as e:
+            logging.warning(f"⚠️ Fehler beim Wiederherstellen der Session für {username}: {e}")
+            valid = False
+        
+        self.session_store.record_restore(valid, time.monotonic() - start)
+        self.metrics.inc('session_restores_total', result='valid' if valid else 'expired')
+        if valid:
+            logging.info(f"🍪 {username}: Gespeicherte Session gültig - Login übersprungen")
+        else:
+            logging.info(f"🍪 {username}: Gespeicherte Session abgelaufen - erneuter Login")
+            self.session_store.delete(username)
+            self.driver.delete_all_cookies()
+        return valid
+    
+    def authenticate(self, username, password):
+        """Gespeicherte Session wiederverwenden, sonst vollständiger Login"""
+        if self.session_store and self.restore_session(username):
+            return True
+        
+        start = time.monotonic()
+        if not self.login(username, password):
+            self.metrics.inc('logins_total', result='failed')
+            return False
+        self.metrics.inc('logins_total', result='succeeded')
+        
+        if self.session_store:
+            self.session_store.record_login(time.monotonic() - start)
+            self.session_store.save(username, self.driver.get_cookies())
+        return True
+    
+    @timed('parse_table')
+    def read_vote_rows(self):
+        """Vote-Tabelle mit einem einzigen WebDriver-Round-Trip lesen und parsen"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        vote_table = self.wait_for(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table")), "Vote-Tabelle vorhanden")
+        return parse_vote_rows(vote_table.get_attribute('outerHTML'))
+    
+    def _parse_row_time(self, username, row):
+        """Next-Vote Zeit einer Tabellenzeile oder None"""
+        next_vote_time = self.parse_datetime(row.next_vote_text) if row.next_vote_text else None
+        if next_vote_time:
+            logging.info(f"{username}: Gefunden - {row.site}: Next vote {row.next_vote_text}")
+        else:
+            self.metrics.inc('parse_failures_total', kind='next_vote')
+            logging.warning(f"{username}: ⚠️ Next-Vote Zeit konnte nicht geparst werden aus: '{row.cell_text[:200]}'")
+        return next_vote_time
+    
+    @timed('check_and_vote')
+    def check_and_vote(self, username, account):
+        """Prüfe alle Vote-Seiten und vote alle fälligen in einer Session
+        
+        Rückgabe: {'next_votes': {Vote-Seite: datetime}, 'voted': [...], 'failed': [...], 'skipped': [...],
+        'seen': {Vote-Seite: Zeit vor dem Vote}, 'unparsed': [Seiten ohne lesbare Zeit], 'estimated': [], 'voted_at': {Vote-Seite: Timestamp},
+        'vote_seconds': {Vote-Seite: Dauer}, 'coins': {Vote-Seite: (alt, neu)}}
+        oder None bei Fehler
+        """
+        from selenium.webdriver.common.by import By
+        
+        try:
+            self.driver.get(f'{self.base_url}/vote')
+            self._record_step('vote_page')
             
-            vote_rows = vote_table.find_elements(By.CSS_SELECTOR, "tbody tr")
+            vote_rows = self.read_vote_rows()
             logging.info(f"{username}: {len(vote_rows)} Vote-Möglichkeiten gefunden")
             
-            for i, row in enumerate(vote_rows):
+            result = {'next_votes': {}, 'voted': [], 'failed': [], 'skipped': [], 'seen': {}, 'unparsed': [], 'estimated': [], 'voted_at': {},
+                      'vote_seconds': {}, 'coins': {}}
+            due_rows = []
+            current_time = self.get_current_time()
+            
+            # === Ein Durchlauf: fällige Zeilen sammeln, Zeiten der übrigen merken ===
+            for row in vote_rows:
+                logging.debug(f"Zelltext: {row.cell_text}")
+                next_vote_time = self._parse_row_time(username, row)
+                if not next_vote_time:
+                    result['unparsed'].append(row.site)
+                    continue
+                result['seen'][row.site] = next_vote_time
+                
+                # WICHTIG: Vote ist alle 24h + 1 Minute möglich
+                vote_possible_time = next_vote_time + timedelta(minutes=1)
+                if current_time >= vote_possible_time:
+                    blocked_until = self.retry_manager.site_blocked_until(row.site)
+                    if blocked_until:
+                        logging.info(f"{username}: 🧯 {row.site} fällig, aber Circuit-Breaker offen bis "
+                                     f"{datetime.fromtimestamp(blocked_until, self.germany_tz).strftime('%H:%M:%S')} - übersprungen")
+                        result['skipped'].append(row.site)
+                        continue
+                    logging.info(f"{username}: 🗳️ Vote ist möglich für {row.site}! (Möglich seit: {vote_possible_time})")
+                    due_rows.append(row)
+                else:
+                    wait_time = vote_possible_time - current_time
+                    logging.info(f"{username}: ⏰ Vote noch nicht möglich für {row.site}. Warten bis {vote_possible_time} (noch {wait_time})")
+                    result['next_votes'][row.site] = next_vote_time
+            
+            # === Alle fälligen Zeilen in derselben Session voten ===
+            # Kein Seitenstand aus einem früheren Account - scheitern alle Zeilen vor perform_vote, wird die Tabelle neu gelesen
+            self._local.last_vote_rows = None
+            for row in due_rows:
+                vote_start = time.monotonic()
                 try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) >= 2:
-                        # Vote-Link aus erster Spalte
-                        vote_link_element = cells[0].find_element(By.TAG_NAME, "a")
-                        vote_link_text = vote_link_element.text
-                        vote_url = vote_link_element.get_attribute("href")
-                        
-                        # Text aus zweiter Spalte
-                        cell_text = cells[1].text
-                        logging.info(f"{username}: Prüfe {vote_link_text}...")
-                        logging.debug(f"Zelltext: {cell_text}")
-                        
-                        # Suche nach Next vote Zeit
-                        next_vote_time = None
-                        
-                        # Verschiedene Formate prüfen
-                        patterns = [
-                            ("Next vote:", "Next vote:"),
-                            ("Nächster vote:", "Nächster vote:"),
-                            ("Next Vote:", "Next Vote:"),
-                            ("Nächster Vote:", "Nächster Vote:")
-                        ]
-                        
-                        for pattern_text, split_text in patterns:
-                            if pattern_text in cell_text:
-                                try:
-                                    time_part = cell_text.split(split_text)[1].strip().split('\n')[0].strip()
-                                    next_vote_time = self.parse_datetime(time_part)
-                                    logging.info(f"{username}: Gefunden - {pattern_text} {time_part}")
-                                    break
-                                except Exception as e:
-                                    logging.debug(f"Fehler beim Parsen von '{pattern_text}': {e}")
-                                    continue
-                        
-                        if next_vote_time:
-                            current_time = self.get_current_time()
-                            time_diff = current_time - next_vote_time
-                            
-                            logging.info(f"{username}: Next Vote: {next_vote_time}, Aktuell: {current_time}")
-                            logging.info(f"{username}: Zeitdifferenz: {time_diff}")
-                            
-                            # WICHTIG: Vote ist alle 24h + 1 Minute möglich
-                            # Prüfe ob Vote möglich ist (Next Vote Zeit + 1 Minute)
-                            vote_possible_time = next_vote_time + timedelta(minutes=1)
-                            
-                            if current_time >= vote_possible_time:
-                                logging.info(f"{username}: 🗳️ Vote ist möglich für {vote_link_text}! (Möglich seit: {vote_possible_time})")
-                                
-                                # Vote durchführen
-                                if self.perform_vote(username, vote_link_element, vote_link_text, account):
-                                    # Nach erfolgreichem Vote neue Zeit ermitteln
-                                    time.sleep(3)
-                                    self.driver.refresh()
-                                    time.sleep(2)
-                                    
-                                    # Neue Next-Vote Zeit suchen
-                                    try:
-                                        updated_rows = self.driver.find_elements(By.CSS_SELECTOR, "table.table tbody tr")
-                                        if i < len(updated_rows):
-                                            updated_cells = updated_rows[i].find_elements(By.TAG_NAME, "td")
-                                            if len(updated_cells) >= 2:
-                                                updated_cell_text = updated_cells[1].text
-                                                for pattern_text, split_text in patterns:
-                                                    if pattern_text in updated_cell_text:
-                                                        try:
-                                                            new_time_part = updated_cell_text.split(split_text)[1].strip().split('\n')[0].strip()
-                                                            new_next_vote_time = self.parse_datetime(new_time_part)
-                                                            if new_next_vote_time:
-                                                                logging.info(f"{username}: Neue Next-Vote Zeit: {new_next_vote_time}")
-                                                                return new_next_vote_time
-                                                        except:
-                                                            continue
-                                    except Exception as e:
-                                        logging.warning(f"Fehler beim Ermitteln der neuen Vote-Zeit: {e}")
-                                    
-                                    return True  # Vote erfolgreich
-                            else:
-                                wait_time = vote_possible_time - current_time
-                                logging.info(f"{username}: ⏰ Vote noch nicht möglich für {vote_link_text}. Warten bis {vote_possible_time} (noch {wait_time})")
-                                # Speichere die nächste Vote-Zeit für diesen Account
-                                return next_vote_time
-                        else:
-                            logging.warning(f"{username}: ⚠️ Next-Vote Zeit konnte nicht geparst werden aus: '{cell_text[:200]}'")
-                            
+                    # perform_vote lädt die Seite neu - Link daher pro Zeile frisch suchen
+                    vote_link_element = self.driver.find_element(
+                        By.CSS_SELECTOR, f"table.table tbody tr:nth-of-type({row.index + 1}) td:first-child a"
+                    )
+                    self._local.last_failure = None
+                    if self.perform_vote(username, vote_link_element, row.site, account, row=row):
+                        result['voted'].append(row.site)
+                        result['voted_at'][row.site] = time.time()
+                        self.metrics.inc('votes_total', result='succeeded')
+                        self.retry_manager.record_success(SITE, row.site)
+                    else:
+                        result['failed'].append(row.site)
+                        self.metrics.inc('votes_total', result='failed')
+                        self._record_failure(SITE, row.site, *self._last_failure("Vote fehlgeschlagen"))
+                    result['coins'][row.site] = self._local.last_vote_coins
                 except Exception as e:
-                    logging.error(f"Fehler beim Verarbeiten der Vote-Row {i+1}: {e}")
-                    continue
+                    logging.error(f"Fehler beim Voten von {row.site} (Vote-Row {row.index + 1}): {e}")
+                    result['failed'].append(row.site)
+                    self.metrics.inc('votes_total', result='failed')
+                    self._note_failure(classify_exception(e), e)
+                    self._record_failure(SITE, row.site, classify_exception(e), e)
+                result['vote_seconds'][row.site] = time.monotonic() - vote_start
             
-            logging.warning(f"{username}: Keine Vote-Möglichkeiten mit gültiger Zeit gefunden")
-            return None
+            # === Neue Zeiten aus dem finalen Seitenstand des letzten Votes, sonst Tabelle einmal neu lesen ===
+            if due_rows:
+                try:
+                    updated_rows = self._local.last_vote_rows
+                    if not updated_rows or not any(r.next_vote_text for r in updated_rows if r.site in result['voted']):
+                        self.driver.refresh()
+                        self._record_step('reread')
+                        updated_rows = self.read_vote_rows()
+                    now = self.get_current_time()
+                    for updated_row in updated_rows:
+                        if updated_row.next_vote_text:
+                            new_next_vote_time = self.parse_datetime(updated_row.next_vote_text)
+                            if new_next_vote_time and updated_row.site in result['voted'] and new_next_vote_time <= now:
+                                # Seite zeigt nach dem Vote noch die alte Zeit - sonst sofort wieder fällig
+                                cooldown = self.cooldown_predictor.cooldown(updated_row.site)
+                                logging.warning(f"{username}: Veraltete Next-Vote Zeit für {updated_row.site} nach Vote ({new_next_vote_time}) - "
+                                                f"setze jetzt + {timedelta(seconds=round(cooldown))}")
+                                new_next_vote_time = now + timedelta(seconds=cooldown)
+                                result['estimated'].append(updated_row.site)
+                            if new_next_vote_time:
+                                result['next_votes'][updated_row.site] = new_next_vote_time
+                    logging.info(f"{username}: Neue Next-Vote Zeiten: {', '.join(f'{site} {when}' for site, when in result['next_votes'].items())}")
+                except Exception as e:
+                    logging.warning(f"Fehler beim Ermitteln der neuen Vote-Zeiten: {e}")
+            
+            if not result['next_votes'] and not due_rows:
+                logging.warning(f"{username}: Keine Vote-Möglichkeiten mit gültiger Zeit gefunden")
+            return result
             
         except Exception as e:
             logging.error(f"Fehler beim Prüfen/Voten für {username}: {e}")
+            self._note_failure(classify_exception(e), e)
+            return None
+    
+    def check_status_http(self, username, password):
+        """HTTP-Fast-Path: {Vote-Seite: Next-Vote Zeit} falls nichts fällig ist, sonst None (Browser wird benötigt)"""
+        try:
+            rows = self.http_client.get_vote_rows(username, password)
+            if rows is None:
+                logging.warning(f"🌐 {username}: /vote per HTTP nicht erreichbar - nutze Browser")
+                return None
+            
+            logging.info(f"🌐 {username}: {len(rows)} Vote-Möglichkeiten per HTTP gefunden")
+            
+            next_votes = {}
+            current_time = self.get_current_time()
+            for row in rows:
+                next_vote_time = self.parse_datetime(row.next_vote_text) if row.next_vote_text else None
+                if not next_vote_time:
+                    # Ohne lesbare Zeit kann die Seite fällig sein - Browser-Flow entscheidet (inkl. Schätzung der Zeit)
+                    self.metrics.inc('parse_failures_total', kind='next_vote')
+                    logging.warning(f"🌐 {username}: Next-Vote Zeit für {row.site} per HTTP nicht lesbar - nutze Browser")
+                    return None
+                
+                vote_possible_time = next_vote_time + timedelta(minutes=1)
+                if current_time >= vote_possible_time:
+                    logging.info(f"🌐 {username}: Vote fällig für {row.site} - starte Browser")
+                    return None
+                next_votes[row.site] = next_vote_time
+            
+            if not next_votes:
+                logging.warning(f"🌐 {username}: Keine gültige Next-Vote Zeit per HTTP gefunden - nutze Browser")
+                return None
+            
+            logging.info(f"🌐 {username}: ⏰ Noch kein Vote möglich. Früheste Zeit: {min(next_votes.values())}")
+            return next_votes
+            
+        except Exception as e:
+            logging.error(f"🌐 Fehler beim HTTP-Status-Check für {username}: {e}")
             return None
     
-    def perform_vote(self, username, vote_link_element, vote_link_text, account):
-        """Führe den Vote-Prozess durch"""
+    @timed('perform_vote')
+    def perform_vote(self, username, vote_link_element, vote_link_text, account, row=None):
+        """Führe den Vote-Prozess durch (row: VoteRow der Zeile, für die Erfolgserkennung über die Status-Zelle)"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import WebDriverException
+        
+        self._local.last_vote_coins = (None, None)
+        self._local.last_vote_rows = None
         try:
             # Hole aktuellen Coins-Stand vor dem Vote
             old_coins = self.get_current_coins()
@@ -488,12 +1095,13 @@ class AlturiVoteBot:
             
             # Merke aktuelles Fenster
             original_window = self.driver.current_window_handle
+            handles_before = self.driver.window_handles
             
             # Klicke auf Vote-Link (öffnet neuen Tab)
             vote_link_element.click()
             
-            # Warte kurz für neuen Tab
-            time.sleep(1)
+            # Warte auf neuen Tab
+            self.wait_for(EC.new_window_is_opened(handles_before), "Neuer Vote-Tab geöffnet", timeout=self.vote_tab_timeout, required=False)
             
             # Schließe alle neuen Tabs
             all_windows = self.driver.window_handles
@@ -501,39 +1109,76 @@ class AlturiVoteBot:
                 if window != original_window:
                     self.driver.switch_to.window(window)
                     logging.info(f"{username}: Schließe Vote-Tab: {self.driver.current_url}")
+                    self._record_step('vote_tab')
                     self.driver.close()
             
             # Zurück zum Original-Tab
             self.driver.switch_to.window(original_window)
             
-            # Refresh der Vote-Seite (für Popup-Behandlung)
-            logging.info(f"{username}: Refreshe Vote-Seite...")
-            self.driver.refresh()
-            time.sleep(2)
-            
-            # Suche nach Confirm-Button
+            # Confirm-Button: erst ohne Reload abwarten (DOM-Änderung), Reload nur falls nötig
+            reloads = 0
             confirm_clicked = False
-            try:
-                logging.info(f"{username}: Suche nach Confirm-Button...")
-                confirm_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.ID, "confirm-vote"))
-                )
+            confirm_button = None
+            needs_reload = self.confirm_needs_reload.get(vote_link_text)
+            if not needs_reload:
+                confirm_button = self.wait_for(EC.element_to_be_clickable((By.ID, "confirm-vote")), "Confirm-Button ohne Reload",
+                                               timeout=self.confirm_wait, required=False)
+            if confirm_button is None:
+                logging.info(f"{username}: Refreshe Vote-Seite für Confirm-Button...")
+                self.driver.refresh()
+                reloads += 1
+                confirm_button = self.wait_for(EC.element_to_be_clickable((By.ID, "confirm-vote")), "Confirm-Button klickbar",
+                                               timeout=self.confirm_timeout, required=False)
+                self._record_step('confirm_reload')
+                if confirm_button is not None and needs_reload is None:
+                    # Seite blendet den Button erst nach Reload ein - künftig direkt neu laden
+                    self.confirm_needs_reload[vote_link_text] = True
+            elif needs_reload is None:
+                self.confirm_needs_reload[vote_link_text] = False
+            
+            page_replaced = False
+            if confirm_button is not None:
                 confirm_button.click()
                 confirm_clicked = True
                 logging.info(f"{username}: 🔄 Vote-Confirm geklickt für {vote_link_text}")
-                time.sleep(3)  # Warte etwas länger nach Confirm
                 
-            except TimeoutException:
+                # Confirm verarbeitet: Formular lädt die Seite neu (stale) oder Button verschwindet (AJAX)
+                self.wait_for(
+                    EC.any_of(EC.staleness_of(confirm_button), EC.invisibility_of_element(confirm_button)),
+                    "Confirm verarbeitet",
+                    timeout=self.confirm_timeout,
+                    required=False
+                )
+                try:
+                    confirm_button.is_displayed()
+                except WebDriverException:
+                    page_replaced = True
+                self._record_step('after_confirm')
+            else:
                 logging.warning(f"{username}: ⚠️ Confirm-Button nicht gefunden - Vote möglicherweise bereits durchgeführt")
             
-            # Nach Confirm: Refresh und Coins prüfen
-            logging.info(f"{username}: Refreshe Seite nach Confirm...")
-            self.driver.refresh()
-            time.sleep(2)
+            # Erfolg an Coins-Änderung bzw. neuer Next-Vote Zeit der Zeile erkennen - ohne zusätzlichen Reload
+            changed = False
+            if confirm_clicked:
+                changed = self.wait_for(self._vote_state_changed(old_coins, row), "Coins/Next-Vote geändert", timeout=self.vote_state_timeout,
+                                        required=False)
+            
+            # Nur wenn die Seite nicht ersetzt wurde und sich nichts geändert hat: einmal neu laden
+            if not changed and not page_replaced and reloads == 0:
+                logging.info(f"{username}: Refreshe Seite nach Confirm...")
+                self.driver.refresh()
+                reloads += 1
+                self._record_step('after_reload')
+            self.metrics.inc('vote_reloads_total', reloads)
             
-            # Hole neuen Coins-Stand
+            # Coins und Next-Vote Zeiten aus demselben finalen Seitenstand
             new_coins = self.get_current_coins()
-            logging.info(f"{username}: Vote-Coins nach Vote: {new_coins}")
+            logging.info(f"{username}: Vote-Coins nach Vote: {new_coins} ({reloads} Reload(s))")
+            self._local.last_vote_coins = (old_coins, new_coins)
+            try:
+                self._local.last_vote_rows = self.read_vote_rows()
+            except Exception as e:
+                logging.debug(f"Vote-Tabelle nach Vote nicht lesbar: {e}")
             
             # Account-Name für Webhook
             account_name = account.get('name', username)
@@ -542,6 +1187,7 @@ class AlturiVoteBot:
             if old_coins is not None and new_coins is not None:
                 if new_coins > old_coins:
                     coins_gained = new_coins - old_coins
+                    self.metrics.inc('coins_gained_total', coins_gained)
                     logging.info(f"{username}: ✅ Vote erfolgreich! +{coins_gained} Coins ({old_coins} → {new_coins})")
                     
                     # Sende Erfolgs-Webhook
@@ -553,6 +1199,7 @@ class AlturiVoteBot:
                     
                     # Sende Error-Webhook
                     error_msg = f"Keine Coins-Erhöhung erkannt ({old_coins} → {new_coins})"
+                    self._note_failure(VOTE_REJECTED, error_msg)
                     self.send_discord_webhook(account_name, old_coins, new_coins, success=False, error_message=error_msg)
                     
                     return False
@@ -568,12 +1215,14 @@ class AlturiVoteBot:
                     logging.error(f"{username}: ❌ Vote fehlgeschlagen und Coins-Status unbekannt")
                     
                     error_msg = "Vote-Prozess fehlgeschlagen, Coins-Status unbekannt"
+                    self._note_failure(SELECTOR_MISSING, "Confirm-Button nicht gefunden, Coins-Status unbekannt")
                     self.send_discord_webhook(account_name, old_coins, new_coins, success=False, error_message=error_msg)
                     
                     return False
                 
         except Exception as e:
             logging.error(f"Fehler beim Vote-Prozess für {username}: {e}")
+            self._note_failure(classify_exception(e), e)
             
             # Sende Error-Webhook
             account_name = account.get('name', username)
@@ -582,17 +1231,22 @@ class AlturiVoteBot:
             
             return False
     
+    @timed('logout')
     def logout(self):
         """Logout vom Account"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
-            self.driver.get('https://alturi.to/ucp')
-            time.sleep(2)
+            self.driver.get(f'{self.base_url}/ucp')
+            self._record_step('ucp')
             
-            logout_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href='https://alturi.to/auth/logout']"))
+            logout_button = self.wait_for(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, f"a[href='{self.base_url}/auth/logout']")),
+                "Logout-Link klickbar"
             )
             logout_button.click()
-            time.sleep(2)
+            self.wait_for(EC.staleness_of(logout_button), "Weiterleitung nach Logout", required=False)
             logging.info("Logout erfolgreich")
             return True
             
@@ -605,163 +1259,679 @@ class AlturiVoteBot:
         username = account['username']
         name = account.get('name', username)
         
+        # Backoff nach Fehlern bzw. offene Circuit-Breaker - kein Browser-Start
+        blocked = self._retry_blocked_until(username, vote_times)
+        if blocked:
+            until, reason = blocked
+            until_text = datetime.fromtimestamp(until, self.germany_tz).strftime('%d.%m.%Y %H:%M:%S')
+            self.log_throttle.log(('backoff', username, until), logging.INFO, f"🧯 Account '{name}' pausiert bis {until_text} ({reason})")
+            return False, f"Backoff bis {until_text}"
+        
         # Neuer Account - immer verarbeiten
         if username not in vote_times:
             logging.info(f"🆕 Neuer Account '{name}' - wird sofort verarbeitet")
             return True, "Neuer Account"
         
-        # Bestehender Account - prüfe Zeit
+        # Bestehender Account - prüfe früheste Zeit über alle Vote-Seiten
         try:
-            last_next_vote = datetime.fromisoformat(vote_times[username])
+            last_next_vote = self.get_next_vote_time(username, vote_times)
             
-            # Stelle sicher dass gespeicherte Zeit auch timezone-aware ist
-            if last_next_vote.tzinfo is None:
-                last_next_vote = self.germany_tz.localize(last_next_vote)
+            if last_next_vote is None:
+                logging.info(f"🆕 Account '{name}' ohne gespeicherte Vote-Zeiten - wird sofort verarbeitet")
+                return True, "Keine Vote-Zeiten gespeichert"
             
             vote_possible_time = last_next_vote + timedelta(minutes=1)
             current_time = self.get_current_time()
             
+            # Versatz gegen gleichzeitig fällige Accounts (stabil pro Account und Fälligkeit)
+            vote_possible_time += timedelta(seconds=stable_jitter((username, last_next_vote.isoformat()), self.dispatch_jitter))
+            
             if current_time >= vote_possible_time:
                 logging.info(f"⏰ Account '{name}' ist bereit zum Voten (möglich seit: {vote_possible_time})")
                 return True, f"Vote möglich seit {vote_possible_time}"
             else:
                 wait_time = vote_possible_time - current_time
-                logging.info(f"⌛ Account '{name}' noch nicht bereit. Warten noch {wait_time}")
+                self.log_throttle.log(('not_due', username, vote_possible_time), logging.INFO,
+                                      f"⌛ Account '{name}' noch nicht bereit. Warten noch {wait_time}")
                 return False, f"Warten noch {wait_time}"
                 
         except Exception as e:
             logging.error(f"Fehler beim Prüfen der Vote-Zeit für '{name}': {e}")
             logging.info(f"🔄 Verarbeite Account '{name}' aufgrund von Zeit-Parsing Fehler")
             return True, f"Zeitfehler - wird verarbeitet: {e}"
-        """Verarbeite einen Account"""
+    
+    def get_next_vote_time(self, username, vote_times):
+        """Früheste gespeicherte Next-Vote Zeit eines Accounts über alle Vote-Seiten (None wenn keine)"""
+        value = vote_times[username]
+        
+        # Altes Format: eine Zeit pro Account statt {Vote-Seite: Zeit}
+        iso_times = value.values() if isinstance(value, dict) else [value]
+        
+        earliest = None
+        for iso_time in iso_times:
+            next_vote = datetime.fromisoformat(iso_time)
+            
+            # Stelle sicher dass gespeicherte Zeit auch timezone-aware ist
+            if next_vote.tzinfo is None:
+                next_vote = self.germany_tz.localize(next_vote)
+            
+            if earliest is None or next_vote < earliest:
+                earliest = next_vote
+        return earliest
+    
+    def get_due_timestamp(self, username, vote_times):
+        """Fälligkeit eines Accounts als Unix-Timestamp (früheste Next Vote + 1 Minute + Dispatch-Versatz), 0 = sofort
+        
+        Backoff nach Fehlern bzw. offene Circuit-Breaker verschieben die Fälligkeit.
+        """
+        due_ts = 0
+        if username in vote_times:
+            try:
+                last_next_vote = self.get_next_vote_time(username, vote_times)
+                if last_next_vote is not None:
+                    jitter = stable_jitter((username, last_next_vote.isoformat()), self.dispatch_jitter)
+                    due_ts = (last_next_vote + timedelta(minutes=1)).timestamp() + jitter
+            except Exception as e:
+                logging.error(f"Fehler beim Berechnen der Fälligkeit für '{username}': {e}")
+        
+        blocked = self._retry_blocked_until(username, vote_times)
+        return max(due_ts, blocked[0]) if blocked else due_ts
+    
+    def _retry_blocked_until(self, username, vote_times):
+        """(Timestamp, Grund) falls Account-Backoff oder offene Breaker aller fälligen Vote-Seiten den Account sperren"""
+        now = time.time()
+        due_sites = [site for site, due_ts in self._site_due_times(username, vote_times).items() if due_ts <= now]
+        return self.retry_manager.blocked_until(username, due_sites, now=now)
+    
+    def _record_failure(self, scope, key, kind, error=None):
+        """Fehler an den RetryManager melden - außer der Watchdog hat den Browser wegen RSS-Limit beendet (kein Fehler des Accounts/der Seite)"""
+        if self.driver is not None and self.driver_watchdog.killed(self.driver):
+            logging.info(f"🐕 '{key}': {kind} nach Watchdog-Abbruch - zählt nicht für Backoff/Breaker")
+            return
+        self.retry_manager.record_failure(scope, key, kind, error)
+    
+    def _record_account_outcome(self, username, result):
+        """Backoff des Accounts zurücksetzen oder den Fehler (ohne erfolgreichen Vote) zählen"""
+        if result is None:
+            self._record_failure(ACCOUNT, username, *self._last_failure("Vote-Seite nicht lesbar"))
+        elif result['failed'] and not result['voted']:
+            self._record_failure(ACCOUNT, username, *self._last_failure("Alle fälligen Votes fehlgeschlagen"))
+        else:
+            self.retry_manager.record_success(ACCOUNT, username)
+    
     def process_account(self, account, vote_times):
         """Verarbeite einen Account"""
         username = account['username']
         password = account['password']
         name = account.get('name', username)
         
-        logging.info(f"🔄 Verarbeite Account: {name}")
+        logging.debug(f"🔄 Verarbeite Account: {name}")
         
         # Prüfe ob Account verarbeitet werden soll
         should_process, reason = self.should_process_account(account, vote_times)
         
         if not should_process:
-            logging.info(f"⏭️  Account '{name}' übersprungen: {reason}")
+            logging.debug(f"⏭️  Account '{name}' übersprungen: {reason}")
             return vote_times
         
         logging.info(f"▶️  Account '{name}' wird verarbeitet: {reason}")
         
-        # Setup neuer Browser
-        self.setup_driver()
+        # Mindestabstand zwischen Logins auf der Seite einhalten
+        self._wait_politeness()
+        cycle_start = time.monotonic()
+        started = time.time()
+        
+        # HTTP-Fast-Path: Browser nur starten wenn wirklich ein Vote fällig ist
+        if self.http_client:
+            next_votes = self.check_status_http(username, password)
+            if next_votes:
+                with self._state_lock:
+                    vote_times[username] = {site: next_vote.isoformat() for site, next_vote in next_votes.items()}
+                logging.info(f"💾 {name}: Nächste Vote-Zeiten für {len(next_votes)} Vote-Seite(n) gespeichert (ohne Browser): {min(next_votes.values())}")
+                coins = self.http_client.get_coins(username)
+                if coins is not None:
+                    logging.info(f"{username}: Aktuelle Vote-Coins (HTTP): {coins}")
+                self.metrics.observe('http_check', time.monotonic() - cycle_start)
+                self.record_ledger(username, started, cycle_start, {'check_seconds': time.monotonic() - cycle_start, 'coins_after': coins},
+                                   outcome=HTTP_CHECKED)
+                logging.info(f"⏱️  {name}: HTTP-Check in {time.monotonic() - cycle_start:.1f}s abgeschlossen")
+                return vote_times
+        
+        # Fälligkeit pro Vote-Seite merken - Basis für die Latenz "fällig → gevotet"
+        due_times = self._site_due_times(username, vote_times)
         
+        # Setup neuer Browser - nur innerhalb des Lastbudgets (CPU/Speicher), Startplatz bis der Browser läuft reserviert
+        phases = {}
         try:
-            # Login
-            if self.login(username, password):
-                # Vote prüfen und ausführen
+            with self.load_budget.admit():
+                self.setup_driver()
+        except Exception as e:
+            self.retry_manager.record_failure(ACCOUNT, username, BROWSER_CRASH, e)
+            self.record_ledger(username, started, cycle_start, phases)
+            raise
+        phases['driver_seconds'] = time.monotonic() - cycle_start
+        self.driver_watchdog.watch(self.driver, name)
+        self._local.last_failure = None
+        self._local.recorder = None
+        if self.record_dir:
+            try:
+                self._local.recorder = SessionRecorder(self.record_dir, username, self.base_url)
+            except OSError as e:
+                logging.error(f"Recording für {username} nicht möglich: {e}")
+        
+        result = None
+        outcome = ERROR
+        # Pro Versuch genau ein Eintrag im Account-Backoff - spätere Fehler (Session speichern, Logout) zählen nicht erneut
+        outcome_recorded = False
+        try:
+            # Login (oder gespeicherte Session)
+            auth_start = time.monotonic()
+            authenticated = self.authenticate(username, password)
+            phases['auth_seconds'] = time.monotonic() - auth_start
+            if authenticated:
+                # Alle fälligen Vote-Seiten in dieser Session voten
+                check_start = time.monotonic()
                 result = self.check_and_vote(username, account)
+                phases['check_seconds'] = time.monotonic() - check_start
+                self._record_account_outcome(username, result)
+                outcome_recorded = True
+                if result:
+                    self.apply_cooldown_estimates(username, result)
                 
-                if isinstance(result, datetime):
-                    # Speichere nächste Vote-Zeit
-                    vote_times[username] = result.isoformat()
-                    logging.info(f"💾 {name}: Nächste Vote-Zeit gespeichert: {result}")
-                elif result is True:
-                    logging.info(f"✅ {name}: Vote erfolgreich durchgeführt!")
-                else:
+                if result and result['voted']:
+                    logging.info(f"✅ {name}: {len(result['voted'])} Vote(s) erfolgreich durchgeführt: {', '.join(result['voted'])}")
+                    self._record_due_to_voted(due_times, result['voted'])
+                
+                if result and result['next_votes']:
+                    # Speichere nächste Vote-Zeit pro Vote-Seite
+                    with self._state_lock:
+                        old_site_times = vote_times.get(username)
+                        old_site_times = old_site_times if isinstance(old_site_times, dict) else {}
+                        site_times = {site: next_vote.isoformat() for site, next_vote in result['next_votes'].items()}
+                        
+                        # Fehlgeschlagene bzw. übersprungene Seiten ohne neu gelesene Zeit behalten ihre alte Zeit (-> erneuter Check)
+                        for site in result['voted'] + result['failed'] + result['skipped']:
+                            if site not in site_times and site in old_site_times:
+                                site_times[site] = old_site_times[site]
+                        vote_times[username] = site_times
+                    estimated = f" (davon {len(result['estimated'])} geschätzt)" if result['estimated'] else ""
+                    logging.info(f"💾 {name}: Nächste Vote-Zeiten für {len(result['next_votes'])} Vote-Seite(n) gespeichert{estimated}, früheste: {min(result['next_votes'].values())}")
+                elif not (result and result['voted']):
                     logging.warning(f"⚠️  {name}: Vote-Prozess ohne Ergebnis")
                 
-                # Logout
-                self.logout()
+                if result:
+                    self.record_vote_results(username, result)
+                
+                # Mit Session-Store bleibt die Session gültig und wird gespeichert, sonst Logout
+                if self.session_store:
+                    self.session_store.save(username, self.driver.get_cookies())
+                else:
+                    self.logout()
             else:
+                outcome = LOGIN_FAILED
                 logging.error(f"❌ {name}: Login fehlgeschlagen - Account übersprungen")
+                self._record_failure(ACCOUNT, username, *self._last_failure("Login fehlgeschlagen"))
+                outcome_recorded = True
             
         except Exception as e:
             logging.error(f"💥 Fehler beim Verarbeiten von Account '{name}': {e}")
+            if not outcome_recorded:
+                self._record_failure(ACCOUNT, username, classify_exception(e), e)
         finally:
+            if self._local.recorder is not None:
+                self._local.recorder.finish(result)
+                self._local.recorder = None
             self.close_driver()
+            self.metrics.observe('cycle', time.monotonic() - cycle_start)
+            self.record_ledger(username, started, cycle_start, phases, result, outcome)
+            logging.info(f"⏱️  {name}: Zyklus in {time.monotonic() - cycle_start:.1f}s abgeschlossen")
         
         return vote_times
     
-    def run(self):
-        """Hauptschleife - lädt accounts.json bei jedem Durchlauf neu"""
-        logging.info("🚀 Starte Alturi Vote Bot...")
+    def record_ledger(self, username, started, cycle_start, phases, result=None, outcome=ERROR):
+        """Session ins Ledger schreiben: eine Zeile pro Vote-Versuch, sonst eine Zeile mit outcome für die ganze Session"""
+        if not self.vote_ledger:
+            return
+        session = dict(started=started, finished=time.time(), account=username, cycle_seconds=time.monotonic() - cycle_start, **phases)
+        rows = []
+        if result is not None:
+            for site_outcome in ('voted', 'failed', 'skipped'):
+                for site in result[site_outcome]:
+                    coins_before, coins_after = result['coins'].get(site, (None, None))
+                    rows.append(LedgerRow(site=site, outcome=site_outcome, coins_before=coins_before, coins_after=coins_after,
+                                          vote_seconds=result['vote_seconds'].get(site), **session))
+            outcome = CHECKED
+        if not rows:
+            rows.append(LedgerRow(site=ALL_SITES, outcome=outcome, **session))
+        try:
+            for row in rows:
+                self.vote_ledger.append(row)
+        except Exception as e:
+            logging.error(f"Fehler beim Schreiben ins Vote-Ledger für {username}: {e}")
+    
+    def apply_cooldown_estimates(self, username, result):
+        """Gelesene Zeiten an den CooldownPredictor melden, fehlende (nach Vote bzw. nicht parsebar) konservativ schätzen"""
+        predictor = self.cooldown_predictor
+        for site, next_vote in result['seen'].items():
+            predictor.observe(username, site, next_vote.timestamp())
+        for site, voted_at in result['voted_at'].items():
+            next_vote = result['next_votes'].get(site)
+            # Geschätzte Zeit (z.B. veraltete Anzeige nach dem Vote) ist keine Stichprobe der Abklingzeit
+            observed = next_vote is not None and site not in result['estimated']
+            predictor.record_vote(username, site, voted_at, next_vote.timestamp() if observed else None)
+        
+        now = time.time()
+        for site in result['voted'] + result['unparsed']:
+            if site in result['next_votes']:
+                continue
+            next_vote = datetime.fromtimestamp(predictor.estimate(username, site, now=now, voted_at=result['voted_at'].get(site)), self.germany_tz)
+            result['next_votes'][site] = next_vote
+            result['estimated'].append(site)
+            logging.info(f"🔮 {username}: Keine Next-Vote Zeit für {site} gelesen - geschätzt {next_vote.strftime('%d.%m.%Y %H:%M:%S')} "
+                         f"(Abklingzeit {timedelta(seconds=round(predictor.cooldown(site)))})")
+    
+    def _site_due_times(self, username, vote_times):
+        """{Vote-Seite: Unix-Timestamp ab dem gevotet werden konnte} aus den gespeicherten Zeiten"""
+        with self._state_lock:
+            value = vote_times.get(username)
+        site_times = value if isinstance(value, dict) else ({'*': value} if value else {})
+        due_times = {}
+        for site, iso_time in site_times.items():
+            try:
+                next_vote = datetime.fromisoformat(iso_time)
+                if next_vote.tzinfo is None:
+                    next_vote = self.germany_tz.localize(next_vote)
+                due_times[site] = (next_vote + timedelta(minutes=1)).timestamp()
+            except (TypeError, ValueError):
+                continue
+        return due_times
+    
+    def _record_due_to_voted(self, due_times, voted_sites):
+        """Latenz von Fälligkeit bis erfolgreichem Vote pro Vote-Seite (neue Accounts ohne Zeit zählen nicht)"""
+        now = time.time()
+        for site in voted_sites:
+            due_ts = due_times.get(site, due_times.get('*'))
+            if due_ts is not None and due_ts <= now:
+                self.metrics.observe('due_to_voted', now - due_ts)
+    
+    def record_vote_results(self, username, result):
+        """Letztes Ergebnis und Coins pro Vote-Seite im State-Backend ablegen"""
+        try:
+            results = {}
+            for site in result['next_votes']:
+                results[site] = ('estimated' if site in result['estimated'] else 'waiting', None, None)
+            for outcome in ('voted', 'failed'):
+                for site in result[outcome]:
+                    coins_before, coins_after = result['coins'].get(site, (None, None))
+                    results[site] = (outcome, coins_before, coins_after)
+            self.state_store.record_results(username, results)
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern der Vote-Ergebnisse für {username}: {e}")
+    
+    def _wait_politeness(self):
+        """Warte bis seit dem letzten Session-Start (über alle Worker) politeness_delay vergangen ist"""
+        with self._politeness_lock:
+            wait = self._last_session_start + self.politeness_delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_session_start = time.monotonic()
+    
+    def _process_account_tracked(self, account, vote_times):
+        """Verarbeite Account und melde (verarbeitet, gevotet) zurück"""
+        username = account['username']
+        
+        # Im Sharding-Modus nur mit Lease - und mit dem Stand, den andere Worker zuletzt geschrieben haben
+        if self.lease_manager:
+            if not self.lease_manager.acquire(username):
+                logging.info(f"🧩 {username}: Lease gehört einem anderen Worker - übersprungen")
+                return False, False
+            self._refresh_shared_state(username, vote_times)
+            self.retry_manager.refresh()
+        
+        with self._state_lock:
+            was_known = username in vote_times
+            old_value = vote_times.get(username)
+        
+        try:
+            self.process_account(account, vote_times)
+            if self.lease_manager and not self.lease_manager.still_owned(username):
+                logging.warning(f"🧩 {username}: Lease während der Verarbeitung abgelaufen - Ergebnis wird trotzdem gespeichert")
+            self.save_vote_times(vote_times, [username])
+        finally:
+            if self.lease_manager:
+                self.lease_manager.release(username)
+        
+        with self._state_lock:
+            processed = not was_known or vote_times.get(username) != old_value
+            # Neue Zeit gespeichert = Vote war möglich
+            voted = processed and username in vote_times
+        return processed, voted
+    
+    def _refresh_shared_state(self, username, vote_times):
+        """Zeiten eines Accounts aus der geteilten Datenbank übernehmen"""
+        # Unter demselben Lock wie save_vote_times - load_user setzt den Snapshot des State-Stores
+        with self._state_lock:
+            sites = self.state_store.load_user(username)
+            if sites:
+                vote_times[username] = sites
+            else:
+                vote_times.pop(username, None)
+    
+    def filter_own_accounts(self, accounts, vote_times):
+        """Sharding: nur Accounts dieses Workers - für fremde die aktuellen Zeiten übernehmen (für den Zeitplan)"""
+        if not self.lease_manager:
+            return accounts
+        own = []
+        for account in accounts:
+            if self.lease_manager.is_mine(account['username']):
+                own.append(account)
+            else:
+                self._refresh_shared_state(account['username'], vote_times)
+        if len(own) < len(accounts):
+            logging.info(f"🧩 {len(own)}/{len(accounts)} Account(s) gehören zu Worker '{self.lease_manager.worker_id}'")
+        return own
+    
+    def process_batch(self, accounts, vote_times):
+        """Verarbeite eine Liste von Accounts (sequentiell oder mit max_workers parallel)"""
+        accounts = self.filter_own_accounts(accounts, vote_times)
+        accounts_processed = 0
+        accounts_voted = 0
+        accounts_skipped = 0
+        batch_start = time.monotonic()
         
+        if self.max_workers == 1:
+            for i, account in enumerate(accounts, 1):
+                account_name = account.get('name', account['username'])
+                logging.debug(f"--- Account {i}/{len(accounts)}: {account_name} ---")
+                
+                try:
+                    processed, voted = self._process_account_tracked(account, vote_times)
+                    if processed:
+                        accounts_processed += 1
+                        accounts_voted += int(voted)
+                    else:
+                        accounts_skipped += 1
+                    
+                    # Pause zwischen Accounts (außer beim letzten)
+                    if i < len(accounts) and self.account_pause:
+                        logging.info(f"⏸️  Pause {self.account_pause} Sekunden zwischen Accounts...")
+                        time.sleep(self.account_pause)
+                    
+                except Exception as e:
+                    logging.error(f"💥 Kritischer Fehler bei Account '{account_name}': {e}")
+                    accounts_skipped += 1
+        else:
+            logging.info(f"🧵 Verarbeite {len(accounts)} Account(s) mit bis zu {self.max_workers} Workern parallel...")
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='vote-worker') as executor:
+                futures = {executor.submit(self._process_account_tracked, account, vote_times): account for account in accounts}
+                for future, account in futures.items():
+                    account_name = account.get('name', account['username'])
+                    try:
+                        processed, voted = future.result()
+                        if processed:
+                            accounts_processed += 1
+                            accounts_voted += int(voted)
+                        else:
+                            accounts_skipped += 1
+                    except Exception as e:
+                        logging.error(f"💥 Kritischer Fehler bei Account '{account_name}': {e}")
+                        accounts_skipped += 1
+        
+        elapsed = time.monotonic() - batch_start
+        # Ohne verarbeitete Accounts nur auf DEBUG - sonst eine Zeile pro Minute im Leerlauf
+        logging.log(logging.INFO if accounts_processed else logging.DEBUG,
+                    f"⏱️  Batch mit {len(accounts)} Account(s) in {elapsed:.1f}s abgearbeitet (Concurrency {self.max_workers})")
+        return accounts_processed, accounts_voted, accounts_skipped
+    
+    def _file_signature(self, path):
+        """(mtime, Größe) einer Datei oder None falls nicht vorhanden"""
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def _watched_file_signatures(self):
+        """Signatur der extern änderbaren State-Datei (accounts.json überwacht der AccountsWatcher)"""
+        state_path = self.state_store.watch_path
+        return (self._file_signature(state_path) if state_path else None,)
+    
+    def _sleep_until(self, deadline, signatures):
+        """Schlafe bis zur Deadline, wache früher auf wenn accounts.json oder vote_times.json geändert wurden"""
         while True:
+            if deadline is None:
+                timeout = self.file_poll_interval
+            else:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                timeout = min(remaining, self.file_poll_interval)
+            
+            time.sleep(timeout)
+            
+            if self.accounts_watcher.has_changed():
+                logging.info("📝 Änderung an accounts.json erkannt")
+                return True
+            if self.config_watcher and self.config_watcher.has_changed():
+                logging.info("📝 Änderung an der Konfiguration erkannt")
+                return True
+            if self._watched_file_signatures() != signatures:
+                logging.info("📝 Dateiänderung erkannt - Zeitplan wird neu aufgebaut")
+                return True
+    
+    def _log_first_decision(self):
+        """Einmalig: Zeit vom Prozessstart bis zur ersten Scheduler-Entscheidung (Kaltstart-Metrik)"""
+        if self._first_decision_logged:
+            return
+        self._first_decision_logged = True
+        uptime = process_uptime()
+        if uptime is not None:
+            self.metrics.observe('startup', uptime)
+            logging.info(f"⚡ Erste Scheduler-Entscheidung {uptime:.2f}s nach Prozessstart")
+    
+    def _rebuild_schedule(self, scheduler, accounts, vote_times):
+        scheduler.clear()
+        for account in accounts:
+            username = account['username']
+            scheduler.schedule(username, self.get_due_timestamp(username, vote_times))
+    
+    def _reschedule_jitter(self, scheduler, vote_times, old_jitter):
+        """Geänderter dispatch_jitter (Hot Reload): eingeplante Fälligkeiten um die Differenz des Versatzes verschieben
+        
+        Backoff- bzw. retry_interval-Verschiebungen bleiben dabei erhalten.
+        """
+        for username, due_ts in scheduler.entries().items():
             try:
-                # === SCHRITT 1: Accounts neu laden ===
-                logging.info("📁 Lade accounts.json neu...")
-                accounts = self.load_accounts()
+                last_next_vote = self.get_next_vote_time(username, vote_times)
+            except Exception:
+                continue
+            if last_next_vote is None:
+                continue
+            key = (username, last_next_vote.isoformat())
+            scheduler.schedule(username, due_ts + stable_jitter(key, self.dispatch_jitter) - stable_jitter(key, old_jitter))
+    
+    def _apply_schedule_diff(self, scheduler, diff, vote_times):
+        """Nur die geänderten Accounts im Zeitplan aktualisieren"""
+        for username in diff.removed:
+            scheduler.remove(username)
+        for account in diff.added + diff.modified:
+            username = account['username']
+            scheduler.schedule(username, self.get_due_timestamp(username, vote_times))
+    
+    def run_scheduled(self):
+        """Hauptschleife im Scheduler-Modus - schläft bis zur nächsten Fälligkeit statt minütlich zu pollen"""
+        logging.info("🚀 Starte Alturi Vote Bot (Scheduler-Modus)...")
+        
+        scheduler = VoteScheduler()
+        accounts_by_username = {}
+        vote_times = {}
+        signatures = None
+        
+        while True:
+            try:
+                old_jitter = self.dispatch_jitter
+                self.reload_config()
+                if self.dispatch_jitter != old_jitter:
+                    self._reschedule_jitter(scheduler, vote_times, old_jitter)
+                accounts, diff = self.refresh_accounts()
                 
                 if not accounts:
                     logging.error("❌ Keine Accounts in accounts.json gefunden!")
-                    time.sleep(300)  # Warte 5 Minuten
+                    self._sleep_until(time.time() + self.no_accounts_pause, self._watched_file_signatures())
                     continue
                 
-                logging.info(f"📋 {len(accounts)} Account(s) geladen: {[acc.get('name', acc['username']) for acc in accounts]}")
+                # === Zeitplan neu aufbauen wenn sich vote_times geändert hat (oder beim Start) ===
+                if self._watched_file_signatures() != signatures:
+                    vote_times = self.sync_vote_times_with_accounts(accounts, self.load_vote_times())
+                    accounts_by_username = {account['username']: account for account in accounts}
+                    self._rebuild_schedule(scheduler, accounts, vote_times)
+                    signatures = self._watched_file_signatures()
+                    logging.info(f"📋 Zeitplan für {len(scheduler)} Account(s) aufgebaut")
                 
-                # === SCHRITT 2: Vote-Zeiten laden und synchronisieren ===
-                logging.info("⚙️  Lade und synchronisiere vote_times.json...")
-                vote_times = self.load_vote_times()
-                vote_times = self.sync_vote_times_with_accounts(accounts, vote_times)
+                # === Geänderte Accounts als Events in den Zeitplan übernehmen ===
+                elif diff:
+                    vote_times = self.apply_accounts_diff(diff, vote_times)
+                    accounts_by_username = {account['username']: account for account in accounts}
+                    self._apply_schedule_diff(scheduler, diff, vote_times)
                 
-                # === SCHRITT 3: Accounts verarbeiten ===
-                logging.info(f"🔄 Starte Verarbeitung von {len(accounts)} Account(s)...")
+                # === Fällige Accounts verarbeiten ===
+                due_usernames = [username for username in scheduler.pop_due(time.time()) if username in accounts_by_username]
+                self._log_first_decision()
                 
-                accounts_processed = 0
-                accounts_voted = 0
-                accounts_skipped = 0
+                if due_usernames:
+                    self.process_batch([accounts_by_username[username] for username in due_usernames], vote_times)
                 
-                for i, account in enumerate(accounts, 1):
-                    account_name = account.get('name', account['username'])
-                    logging.info(f"\n--- Account {i}/{len(accounts)}: {account_name} ---")
-                    
-                    try:
-                        old_vote_times = vote_times.copy()
-                        vote_times = self.process_account(account, vote_times)
-                        
-                        # Prüfe ob Account verarbeitet wurde
-                        if vote_times != old_vote_times or account['username'] not in old_vote_times:
-                            accounts_processed += 1
-                            if account['username'] in vote_times:
-                                # Neue Zeit gespeichert = Vote war möglich
-                                accounts_voted += 1
-                        else:
-                            accounts_skipped += 1
-                        
-                        # Speichere vote_times nach jedem Account
-                        self.save_vote_times(vote_times)
-                        
-                        # Pause zwischen Accounts (außer beim letzten)
-                        if i < len(accounts):
-                            logging.info("⏸️  Pause 5 Sekunden zwischen Accounts...")
-                            time.sleep(5)
-                        
-                    except Exception as e:
-                        logging.error(f"💥 Kritischer Fehler bei Account '{account_name}': {e}")
-                        accounts_skipped += 1
+                # Neue Fälligkeiten einplanen - ohne neue Zeit erneut nach retry_interval versuchen
+                for username in due_usernames:
+                    due_ts = self.get_due_timestamp(username, vote_times)
+                    if due_ts <= time.time():
+                        due_ts = time.time() + self.retry_interval
+                    scheduler.schedule(username, due_ts)
                 
-                # === SCHRITT 4: Durchlauf-Zusammenfassung ===
-                logging.info(f"\n🏁 Durchlauf abgeschlossen:")
-                logging.info(f"   📊 Accounts gesamt: {len(accounts)}")
-                logging.info(f"   ✅ Verarbeitet: {accounts_processed}")
-                logging.info(f"   🗳️  Gevotet: {accounts_voted}")
-                logging.info(f"   ⏭️  Übersprungen: {accounts_skipped}")
+                # Eigene Schreibzugriffe auf vote_times.json sollen keinen Rebuild auslösen
+                if due_usernames:
+                    signatures = self._watched_file_signatures()
+                    self.log_driver_pool_stats()
+                    self.log_session_store_stats()
+                    self.log_webhook_stats()
+                    self.log_memory_stats()
+                    self.log_retry_stats()
+                    self.log_cooldown_stats()
+                    self.log_dispatch_stats()
+                    self.log_metrics_summary()
                 
-                # === SCHRITT 5: Wartezeit bis nächster Durchlauf ===
-                wait_minutes = 1
-                logging.info(f"⏰ Warte {wait_minutes} Minuten bis zum nächsten Durchlauf...")
-                logging.info(f"🕐 Nächster Check um: {(self.get_current_time() + timedelta(minutes=wait_minutes)).strftime('%H:%M:%S')}")
+                # === Bis zur nächsten Fälligkeit schlafen ===
+                deadline = scheduler.next_deadline()
+                if deadline is not None:
+                    next_check = datetime.fromtimestamp(deadline, self.germany_tz)
+                    logging.info(f"🕐 Nächste Fälligkeit um: {next_check.strftime('%d.%m.%Y %H:%M:%S')}")
+                self._sleep_until(deadline, signatures)
                 
-                time.sleep(wait_minutes * 60)
+            except KeyboardInterrupt:
+                logging.info("🛑 Bot gestoppt durch Benutzer (Strg+C)")
+                self.shutdown()
+                break
+            except Exception as e:
+                logging.error(f"💥 Unerwarteter Fehler in der Scheduler-Schleife: {e}")
+                logging.info(f"🔄 Warte {self.error_pause:g} Sekunden vor Neustart...")
+                signatures = None
+                time.sleep(self.error_pause)
+    
+    def run_cycle(self):
+        """Ein Durchlauf der Hauptschleife - gibt die Wartezeit bis zum nächsten Durchlauf in Sekunden zurück"""
+        # === SCHRITT 1: Konfiguration und Accounts nur bei Änderungen neu laden ===
+        self.reload_config()
+        accounts, diff = self.refresh_accounts()
+        
+        if not accounts:
+            logging.error("❌ Keine Accounts in accounts.json gefunden!")
+            return self.no_accounts_pause
+        
+        if diff:
+            logging.info(f"📋 {len(accounts)} Account(s) geladen: {[acc.get('name', acc['username']) for acc in accounts]}")
+        
+        # === SCHRITT 2: Vote-Zeiten laden, bei geänderten Accounts synchronisieren ===
+        logging.debug("⚙️  Lade Vote-Zeiten...")
+        vote_times = self.load_vote_times()
+        if diff:
+            vote_times = self.apply_accounts_diff(diff, vote_times)
+        
+        # === SCHRITT 3: Accounts verarbeiten ===
+        logging.debug(f"🔄 Starte Verarbeitung von {len(accounts)} Account(s)...")
+        
+        # Am längsten überfällige Accounts zuerst
+        accounts = sorted(accounts, key=lambda account: self.get_due_timestamp(account['username'], vote_times))
+        self._log_first_decision()
+        accounts_processed, accounts_voted, accounts_skipped = self.process_batch(accounts, vote_times)
+        
+        # === SCHRITT 4: Durchlauf-Zusammenfassung (ohne fällige Accounts nur gedrosselt eine Zeile) ===
+        if not accounts_processed and not accounts_voted:
+            self.log_throttle.log(('idle',), logging.INFO, f"💤 Keine fälligen Accounts ({len(accounts)} geprüft) - "
+                                                           f"nächster Check alle {self.loop_interval:g} Sekunden")
+            return self.loop_interval
+        
+        logging.info(f"🏁 Durchlauf abgeschlossen:")
+        logging.info(f"   📊 Accounts gesamt: {len(accounts)}")
+        logging.info(f"   ✅ Verarbeitet: {accounts_processed}")
+        logging.info(f"   🗳️  Gevotet: {accounts_voted}")
+        logging.info(f"   ⏭️  Übersprungen: {accounts_skipped}")
+        self.log_driver_pool_stats()
+        self.log_session_store_stats()
+        self.log_webhook_stats()
+        self.log_memory_stats()
+        self.log_retry_stats()
+        self.log_cooldown_stats()
+        self.log_dispatch_stats()
+        self.log_metrics_summary()
+        
+        # === SCHRITT 5: Wartezeit bis nächster Durchlauf ===
+        logging.info(f"⏰ Warte {self.loop_interval:g} Sekunden bis zum nächsten Durchlauf...")
+        logging.info(f"🕐 Nächster Check um: {(self.get_current_time() + timedelta(seconds=self.loop_interval)).strftime('%H:%M:%S')}")
+        return self.loop_interval
+    
+    def run(self):
+        """Hauptschleife - prüft accounts.json bei jedem Durchlauf auf Änderungen"""
+        if self.use_scheduler:
+            return self.run_scheduled()
+        
+        logging.info("🚀 Starte Alturi Vote Bot...")
+        
+        while True:
+            try:
+                time.sleep(self.run_cycle())
                 
             except KeyboardInterrupt:
                 logging.info("🛑 Bot gestoppt durch Benutzer (Strg+C)")
+                self.shutdown()
                 break
             except Exception as e:
                 logging.error(f"💥 Unerwarteter Fehler in der Hauptschleife: {e}")
-                logging.info("🔄 Warte 60 Sekunden vor Neustart...")
-                time.sleep(60)
+                logging.info(f"🔄 Warte {self.error_pause:g} Sekunden vor Neustart...")
+                time.sleep(self.error_pause)
 
 if __name__ == "__main__":
-    # Bot starten
-    bot = AlturiVoteBot(headless=True)  # headless=False für sichtbaren Browser
+    # Logging: Queue + Hintergrund-Thread, Rotation nach Größe und täglich
+    # VOTEBOT_LOG_LEVEL=DEBUG bzw. VOTEBOT_LOG_LEVELS=driver_pool=DEBUG,selenium=INFO setzen Level global bzw. pro Modul
+    # VOTEBOT_LOG_FORMAT=json schreibt kompakte JSON-Zeilen; VOTEBOT_LOG_FILE, VOTEBOT_LOG_MAX_MB, VOTEBOT_LOG_BACKUPS für die Datei
+    setup_logging(
+        log_file=os.environ.get('VOTEBOT_LOG_FILE', 'vote_bot.log'),
+        level=os.environ.get('VOTEBOT_LOG_LEVEL', 'INFO'),
+        module_levels=parse_module_levels(os.environ.get('VOTEBOT_LOG_LEVELS')),
+        json_lines=os.environ.get('VOTEBOT_LOG_FORMAT', 'text') == 'json',
+        max_bytes=int(float(os.environ.get('VOTEBOT_LOG_MAX_MB', '10')) * 1024 * 1024),
+        backup_count=int(os.environ.get('VOTEBOT_LOG_BACKUPS', '5')),
+    )
+    # SIGTERM (docker stop) wie Strg+C behandeln, damit shutdown() läuft und die Log-Queue geleert wird
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    # Bot starten - Konfiguration aus config/votebot.json (VOTEBOT_CONFIG) und VOTEBOT_*-Variablen, siehe bot_config.py
+    # (z.B. VOTEBOT_SCHEDULER=1, VOTEBOT_MAX_WORKERS=2, VOTEBOT_WEBHOOK_URL=...; Übersicht: python bot_config.py)
+    config_path = os.environ.get('VOTEBOT_CONFIG', DEFAULT_CONFIG_PATH)
+    try:
+        config = load_config(config_path)
+    except ConfigError as e:
+        logging.critical("❌ Ungültige Konfiguration:\n  " + '\n  '.join(e.errors))
+        raise SystemExit(1)
+    bot = AlturiVoteBot(**config.startup(), config_watcher=ConfigWatcher(config_path, config))
+    bot.apply_settings(config.reloadable())
     bot.run()
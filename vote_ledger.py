@@ -0,0 +1,500 @@
+"""Append-only Ledger aller Vote-Versuche mit kompakter Spaltenablage und Abfrage-CLI
+
+Jeder Versuch landet sofort als JSON-Zeile in tail.jsonl (crash-sicher, O_APPEND). Ab
+chunk_rows Zeilen bzw. beim Beenden wird der Tail in einen Spalten-Chunk umgeschrieben und an
+das Monatssegment ledger-YYYY-MM.bin angehängt:
+
+    b'VLC1' | uint32 Headerlänge | Header (JSON) | eine array.array-Spalte nach der anderen
+
+Der Header enthält Zeilenzahl, Spalten mit Typecode, Byte-Reihenfolge, Zeitbereich und die
+Wörterbücher für Accounts, Vote-Seiten und Ergebnisse (Spalten speichern nur Indizes). Zeilen
+sind pro Chunk nach Beginn sortiert: Abfragen überspringen Chunks außerhalb des Zeitraums ohne
+die Spalten zu lesen und finden Teilbereiche per Binärsuche.
+
+    python vote_ledger.py summary [--since 30d] [--account NAME] [--site SITE] [--json]
+    python vote_ledger.py daily [--since 30d] [--account NAME]
+    python vote_ledger.py compact
+"""
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import struct
+import logging
+import argparse
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+DEFAULT_DIRECTORY = os.path.join('data', 'ledger')
+MAGIC = b'VLC1'
+TAIL_FILE = 'tail.jsonl'
+COMPACTING_FILE = 'tail.compacting'
+
+# Ergebnisse eines Versuchs - '*' als Vote-Seite für Sessions ohne Vote-Versuch
+VOTED = 'voted'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+CHECKED = 'checked'
+HTTP_CHECKED = 'http_checked'
+LOGIN_FAILED = 'login_failed'
+ERROR = 'error'
+ALL_SITES = '*'
+
+
+class LedgerRow(NamedTuple):
+    """Ein Vote-Versuch bzw. eine Session ohne Vote (Dauern in Sekunden, None = nicht gemessen)"""
+    started: float                      # Unix-Timestamp Beginn der Session
+    finished: float                     # Unix-Timestamp Ende der Session
+    account: str
+    site: str
+    outcome: str
+    coins_before: Optional[int] = None
+    coins_after: Optional[int] = None
+    driver_seconds: Optional[float] = None
+    auth_seconds: Optional[float] = None
+    check_seconds: Optional[float] = None
+    vote_seconds: Optional[float] = None
+    cycle_seconds: Optional[float] = None
+
+
+# (Spalte, Typecode) - Strings als Index ins Wörterbuch des Chunks, -1 bzw. NaN = unbekannt
+COLUMNS = (
+    ('started', 'd'),
+    ('finished', 'd'),
+    ('account', 'H'),
+    ('site', 'H'),
+    ('outcome', 'B'),
+    ('coins_before', 'i'),
+    ('coins_after', 'i'),
+    ('driver_seconds', 'f'),
+    ('auth_seconds', 'f'),
+    ('check_seconds', 'f'),
+    ('vote_seconds', 'f'),
+    ('cycle_seconds', 'f'),
+)
+_DICTIONARY_COLUMNS = {'account': 'accounts', 'site': 'sites', 'outcome': 'outcomes'}
+_DURATION_COLUMNS = ('driver_seconds', 'auth_seconds', 'check_seconds', 'vote_seconds', 'cycle_seconds')
+
+
+def _segment_name(ts):
+    return f"ledger-{time.strftime('%Y-%m', time.gmtime(ts))}.bin"
+
+
+def encode_chunk(rows, batch=None):
+    """Zeilen als Spalten-Chunk (bytes) - nach started sortiert, damit Abfragen Zeiträume per Binärsuche finden"""
+    rows = sorted(rows, key=lambda row: row.started)
+    dictionaries = {name: [] for name in _DICTIONARY_COLUMNS.values()}
+    indexes = {name: {} for name in _DICTIONARY_COLUMNS.values()}
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+
+    for row in rows:
+        values = row._asdict()
+        for name, typecode in COLUMNS:
+            value = values[name]
+            if name in _DICTIONARY_COLUMNS:
+                dictionary = _DICTIONARY_COLUMNS[name]
+                index = indexes[dictionary].get(value)
+                if index is None:
+                    index = indexes[dictionary][value] = len(dictionaries[dictionary])
+                    dictionaries[dictionary].append(value)
+                value = index
+            elif typecode == 'i':
+                value = -1 if value is None else int(value)
+            elif typecode == 'f':
+                value = math.nan if value is None else value
+            columns[name].append(value)
+
+    header = {
+        'n': len(rows),
+        'columns': [[name, typecode, columns[name].itemsize] for name, typecode in COLUMNS],
+        'byteorder': sys.byteorder,
+        'min_started': min(columns['started']),
+        'max_started': max(columns['started']),
+        'batch': batch,
+        **dictionaries,
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return b''.join([MAGIC, struct.pack('<I', len(header_bytes)), header_bytes] + [columns[name].tobytes() for name, _ in COLUMNS])
+
+
+def iter_chunk_headers(path):
+    """(Header, Offset der Spaltendaten) aller vollständigen Chunks einer Segmentdatei - ohne die Spalten zu lesen"""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        while True:
+            start = f.tell()
+            prefix = f.read(8)
+            if len(prefix) < 8:
+                return
+            try:
+                if prefix[:4] != MAGIC:
+                    raise ValueError("Magic fehlt")
+                header = json.loads(f.read(struct.unpack('<I', prefix[4:])[0]))
+            except ValueError:
+                logging.error(f"📒 Segment '{path}' beschädigt bei Offset {start} - Rest wird ignoriert")
+                return
+            offset = f.tell()
+            end = offset + sum(itemsize for _, _, itemsize in header['columns']) * header['n']
+            if end > file_size:
+                # Abgebrochener Schreibvorgang - VoteLedger._recover schneidet ihn ab
+                return
+            yield header, offset
+            f.seek(end)
+
+
+def complete_size(path):
+    """Länge der Segmentdatei bis zum Ende des letzten vollständigen Chunks"""
+    end = 0
+    for header, offset in iter_chunk_headers(path):
+        end = offset + sum(itemsize for _, _, itemsize in header['columns']) * header['n']
+    return end
+
+
+def read_chunk(f, header, offset, names=None):
+    """Spalten eines Chunks als {Name: array} (names: nur diese Spalten dekodieren)"""
+    f.seek(offset)
+    return decode_columns(f.read(sum(itemsize for _, _, itemsize in header['columns']) * header['n']), header, names)
+
+
+def decode_columns(data, header, names=None):
+    columns = {}
+    position = 0
+    for name, typecode, itemsize in header['columns']:
+        size = itemsize * header['n']
+        if names is None or name in names:
+            column = array(typecode)
+            column.frombytes(data[position:position + size])
+            if header['byteorder'] != sys.byteorder:
+                column.byteswap()
+            columns[name] = column
+        position += size
+    return columns
+
+
+def _read_tail(path):
+    rows = []
+    if not os.path.exists(path):
+        return rows
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                rows.append(LedgerRow(*json.loads(line)))
+            except (ValueError, TypeError):
+                # Letzte Zeile nach einem Absturz evtl. unvollständig
+                continue
+    return rows
+
+
+class VoteLedger:
+    """Schreibt Vote-Versuche append-only: sofort in den Tail, gebündelt als Spalten-Chunk ins Monatssegment"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, chunk_rows=256):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.tail_path = os.path.join(directory, TAIL_FILE)
+        self._tail_rows = len(_read_tail(self.tail_path))
+
+        # Metriken
+        self.appended = 0
+        self.chunks_written = 0
+
+        self._recover()
+
+    def _recover(self):
+        """Nach Absturz während der Kompaktierung: Chunk fertig schreiben oder als bereits geschrieben verwerfen"""
+        compacting_path = os.path.join(self.directory, COMPACTING_FILE)
+        if not os.path.exists(compacting_path):
+            return
+        # Halb geschriebene Chunks abschneiden, sonst lägen spätere Chunks dahinter außer Reichweite
+        for path in self.segment_paths():
+            size = complete_size(path)
+            if size < os.path.getsize(path):
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+        with open(compacting_path, 'r', encoding='utf-8') as f:
+            batch = f.readline().strip()
+        written = any(header.get('batch') == batch
+                      for path in self.segment_paths() for header, _ in iter_chunk_headers(path))
+        if not written:
+            self._write_chunks(_read_tail(compacting_path), batch)
+        os.remove(compacting_path)
+        logging.info(f"📒 Unterbrochene Ledger-Kompaktierung {'verworfen' if written else 'abgeschlossen'}")
+
+    def segment_paths(self):
+        return sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                      if name.startswith('ledger-') and name.endswith('.bin'))
+
+    def append(self, row):
+        """Eine Zeile anhängen - ab chunk_rows Zeilen im Tail wird kompaktiert"""
+        line = json.dumps(list(row), separators=(',', ':')) + '\n'
+        with self._lock:
+            with open(self.tail_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._tail_rows += 1
+            self.appended += 1
+            if self._tail_rows >= self.chunk_rows:
+                self._compact()
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        rows = _read_tail(self.tail_path)
+        if not rows:
+            return
+        batch = uuid.uuid4().hex
+        compacting_path = os.path.join(self.directory, COMPACTING_FILE)
+        # Batch-ID vorne, damit _recover nach einem Absturz erkennt ob der Chunk schon im Segment steht
+        with open(compacting_path, 'w', encoding='utf-8') as f:
+            f.write(batch + '\n')
+            with open(self.tail_path, 'r', encoding='utf-8') as tail:
+                f.write(tail.read())
+            f.flush()
+            os.fsync(f.fileno())
+        os.remove(self.tail_path)
+        self._tail_rows = 0
+
+        self._write_chunks(rows, batch)
+        os.remove(compacting_path)
+
+    def _write_chunks(self, rows, batch):
+        by_segment = {}
+        for row in rows:
+            by_segment.setdefault(_segment_name(row.started), []).append(row)
+        for name, segment_rows in by_segment.items():
+            with open(os.path.join(self.directory, name), 'ab') as f:
+                f.write(encode_chunk(segment_rows, batch))
+                f.flush()
+                os.fsync(f.fileno())
+            self.chunks_written += 1
+
+    def close(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logging.error(f"Fehler beim Kompaktieren des Ledgers: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {'appended': self.appended, 'tail_rows': self._tail_rows, 'chunks_written': self.chunks_written}
+
+
+def _ledger_directories(directory):
+    """Ledger-Verzeichnis plus Unterverzeichnisse (ein Ledger pro Worker im Sharding-Modus)"""
+    directories = [directory]
+    if os.path.isdir(directory):
+        directories += sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                              if os.path.isdir(os.path.join(directory, name)))
+    return directories
+
+
+def scan(directory=DEFAULT_DIRECTORY, since=None, until=None, names=None):
+    """Spalten-Chunks im Zeitraum als (Header, {Spalte: array}) - inklusive noch nicht kompaktiertem Tail"""
+    for ledger_dir in _ledger_directories(directory):
+        if not os.path.isdir(ledger_dir):
+            continue
+        for name in sorted(os.listdir(ledger_dir)):
+            if not (name.startswith('ledger-') and name.endswith('.bin')):
+                continue
+            path = os.path.join(ledger_dir, name)
+            with open(path, 'rb') as f:
+                for header, offset in iter_chunk_headers(path):
+                    if since is not None and header['max_started'] < since:
+                        continue
+                    if until is not None and header['min_started'] >= until:
+                        continue
+                    yield header, read_chunk(f, header, offset, names)
+
+        tail_rows = _read_tail(os.path.join(ledger_dir, TAIL_FILE))
+        if tail_rows:
+            data = encode_chunk(tail_rows)
+            header_len = struct.unpack('<I', data[4:8])[0]
+            header = json.loads(data[8:8 + header_len])
+            yield header, decode_columns(data[8 + header_len:], header, names)
+
+
+def _p95(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+def _row_range(columns, since, until):
+    """Zeilenbereich eines (nach started sortierten) Chunks im Zeitraum per Binärsuche"""
+    started = columns['started']
+    low = bisect_left(started, since) if since is not None else 0
+    high = bisect_left(started, until) if until is not None else len(started)
+    return low, high
+
+
+def summarize(directory=DEFAULT_DIRECTORY, since=None, until=None, account=None, site=None):
+    """Pro Account: Versuche, Erfolgsquote, Coins pro Tag, p95 Zykluszeit und Ø Dauer pro Phase"""
+    accounts = {}
+    first = last = None
+    names = ('started', 'account', 'site', 'outcome', 'coins_before', 'coins_after') + _DURATION_COLUMNS
+    for header, columns in scan(directory, since, until):
+        if account is not None and account not in header['accounts']:
+            continue
+        if site is not None and site not in header['sites']:
+            continue
+        low, high = _row_range(columns, since, until)
+        if low >= high:
+            continue
+        first = min(first, columns['started'][low]) if first is not None else columns['started'][low]
+        last = max(last, columns['started'][high - 1]) if last is not None else columns['started'][high - 1]
+
+        account_filter = header['accounts'].index(account) if account is not None else None
+        site_filter = header['sites'].index(site) if site is not None else None
+        entries = [None] * len(header['accounts'])
+        outcomes = header['outcomes']
+        voted_id = outcomes.index(VOTED) if VOTED in outcomes else -1
+
+        for ts, account_id, site_id, outcome_id, before, after, driver, auth, check, vote, cycle in zip(
+                *(columns[name][low:high] for name in names)):
+            if account_filter is not None and account_id != account_filter:
+                continue
+            if site_filter is not None and site_id != site_filter:
+                continue
+            entry = entries[account_id]
+            if entry is None:
+                entry = entries[account_id] = accounts.setdefault(header['accounts'][account_id], {
+                    'voted': 0, 'failed': 0, 'skipped': 0, 'sessions': 0, 'coins_gained': 0,
+                    '_cycles': {}, '_phases': {name: [] for name in _DURATION_COLUMNS[:-1]},
+                })
+            outcome = outcomes[outcome_id]
+            if outcome in (VOTED, FAILED, SKIPPED):
+                entry[outcome] += 1
+            if outcome_id == voted_id:
+                if before >= 0 and after >= 0:
+                    entry['coins_gained'] += after - before
+                if vote == vote:  # NaN = nicht gemessen
+                    entry['_phases']['vote_seconds'].append(vote)
+
+            # Mehrere Zeilen einer Session (eine pro Vote-Seite) zählen als ein Zyklus
+            if ts not in entry['_cycles']:
+                entry['_cycles'][ts] = cycle
+                entry['sessions'] += 1
+                phases = entry['_phases']
+                for phase, value in (('driver_seconds', driver), ('auth_seconds', auth), ('check_seconds', check)):
+                    if value == value:
+                        phases[phase].append(value)
+
+    span_start = since if since is not None else first
+    span_end = min(until if until is not None else time.time(), time.time())
+    days = max((span_end - span_start) / 86400, 1 / 24) if span_start is not None else None
+
+    report = {}
+    for name, entry in sorted(accounts.items()):
+        attempts = entry['voted'] + entry['failed']
+        cycles = [value for value in entry.pop('_cycles').values() if value == value]
+        phases = entry.pop('_phases')
+        report[name] = dict(
+            entry,
+            attempts=attempts,
+            success_rate=entry['voted'] / attempts if attempts else None,
+            coins_per_day=entry['coins_gained'] / days if days else None,
+            cycle_p95_seconds=_p95(cycles),
+            **{f'{phase[:-len("_seconds")]}_avg_seconds': sum(values) / len(values) if values else None
+               for phase, values in phases.items()},
+        )
+    return report
+
+
+def daily(directory=DEFAULT_DIRECTORY, since=None, until=None, account=None):
+    """{Tag (lokal): {'voted': n, 'failed': n, 'coins_gained': n}} über alle bzw. einen Account"""
+    days = {}
+    names = ('started', 'account', 'outcome', 'coins_before', 'coins_after')
+    day_cache = {}
+    for header, columns in scan(directory, since, until, set(names)):
+        if account is not None and account not in header['accounts']:
+            continue
+        account_filter = header['accounts'].index(account) if account is not None else None
+        outcomes = header['outcomes']
+        low, high = _row_range(columns, since, until)
+        for ts, account_id, outcome_id, before, after in zip(*(columns[name][low:high] for name in names)):
+            if account_filter is not None and account_id != account_filter:
+                continue
+            outcome = outcomes[outcome_id]
+            if outcome not in (VOTED, FAILED):
+                continue
+            # Tagesgrenze nur einmal pro Stunde berechnen
+            hour = int(ts // 3600)
+            day = day_cache.get(hour)
+            if day is None:
+                day = day_cache[hour] = time.strftime('%Y-%m-%d', time.localtime(ts))
+            entry = days.get(day)
+            if entry is None:
+                entry = days[day] = {'voted': 0, 'failed': 0, 'coins_gained': 0}
+            entry[outcome] += 1
+            if outcome == VOTED and before >= 0 and after >= 0:
+                entry['coins_gained'] += after - before
+    return dict(sorted(days.items()))
+
+
+def parse_since(value):
+    """'30d', '12h' oder ISO-Datum -> Unix-Timestamp"""
+    if value is None:
+        return None
+    units = {'d': 86400, 'h': 3600, 'm': 60}
+    if value[-1:] in units and value[:-1].replace('.', '', 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _format(value, pattern):
+    return '-' if value is None else format(value, pattern)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=('summary', 'daily', 'compact'))
+    parser.add_argument('--dir', default=DEFAULT_DIRECTORY)
+    parser.add_argument('--since', help="z.B. 30d, 12h oder 2026-01-01")
+    parser.add_argument('--until')
+    parser.add_argument('--account')
+    parser.add_argument('--site')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        VoteLedger(args.dir).compact()
+        print(f"✅ Ledger in '{args.dir}' kompaktiert")
+        return 0
+
+    start = time.perf_counter()
+    since, until = parse_since(args.since), parse_since(args.until)
+    if args.command == 'summary':
+        report = summarize(args.dir, since, until, account=args.account, site=args.site)
+    else:
+        report = daily(args.dir, since, until, account=args.account)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps({'query_ms': elapsed_ms, 'result': report}, indent=2, ensure_ascii=False))
+        return 0
+
+    if args.command == 'summary':
+        print(f"{'Account':<24} {'Versuche':>8} {'Erfolg':>7} {'Coins/Tag':>9} {'p95 Zyklus':>10} {'Ø Login':>8} {'Ø Vote':>7}")
+        for name, entry in report.items():
+            print(f"{name[:24]:<24} {entry['attempts']:>8} {_format(entry['success_rate'], '.0%'):>7} "
+                  f"{_format(entry['coins_per_day'], '.2f'):>9} {_format(entry['cycle_p95_seconds'], '.1f'):>9}s "
+                  f"{_format(entry['auth_avg_seconds'], '.1f'):>7}s {_format(entry['vote_avg_seconds'], '.1f'):>6}s")
+    else:
+        print(f"{'Tag':<10} {'Votes':>6} {'Fehler':>6} {'Coins':>6}")
+        for day, entry in report.items():
+            print(f"{day:<10} {entry['voted']:>6} {entry['failed']:>6} {entry['coins_gained']:>6}")
+    print(f"⏱️  Abfrage in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
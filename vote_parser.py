@@ -0,0 +1,196 @@
+import re
+import html
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class VoteRow(NamedTuple):
+    """Eine Zeile der Vote-Tabelle"""
+    index: int                       # Position unter den <tr> in tbody (für nth-of-type)
+    site: str                        # Linktext der ersten Spalte
+    url: str                         # href des Vote-Links
+    cell_text: str                   # Text der zweiten Spalte
+    next_vote_text: Optional[str]    # Teil hinter "Next vote:" bzw. "Nächster Vote:"
+
+
+# Ein Durchlauf über tbody: jede Zeile mit erster (Link-) und zweiter (Status-) Zelle
+_TABLE_RE = re.compile(r'<table[^>]*class="[^"]*\btable\b[^"]*"[^>]*>(.*?)</table>', re.S | re.I)
+_TBODY_RE = re.compile(r'<tbody[^>]*>(.*?)</tbody>', re.S | re.I)
+_CELL = r'<td\b[^>]*>([^<]*(?:<(?!/t[dr]>)[^<]*)*)</td>'
+_ROW_RE = re.compile(rf'<tr\b[^>]*>\s*(?:{_CELL}\s*{_CELL})?.*?</tr>', re.S | re.I)
+_LINK_RE = re.compile(r'<a\b[^>]*?href="([^"]*)"[^>]*>(.*?)</a>', re.S | re.I)
+_BR_RE = re.compile(r'<br\s*/?>|</(?:p|div|li)>', re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+_NEXT_VOTE_RE = re.compile(r'N(?:ext|ächster) [vV]ote:\s*([^\n]+)')
+
+# "Current Vote-Coins:" gefolgt von einem (roten) Span mit der Zahl
+_COINS_RE = re.compile(r'Current Vote-Coins:\s*(?:<[^>]+>\s*)*?<span[^>]*>\s*([\d.,\s]+?)\s*</span>', re.S | re.I)
+_RED_SPAN_RE = re.compile(r'<span\b[^>]*style="[^"]*color:\s*red[^"]*"[^>]*>\s*(\d+)\s*</span>', re.I)
+
+# Ein Round-Trip im Browser: Span hinter dem Text "Current Vote-Coins:", sonst erster rein numerischer roter Span
+COINS_JS = """
+const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+while (walker.nextNode()) {
+    const node = walker.currentNode;
+    if (!node.nodeValue.includes('Current Vote-Coins:')) continue;
+    for (let el = node.nextSibling; el; el = el.nextSibling) {
+        if (el.nodeType !== 1) continue;
+        const span = el.tagName === 'SPAN' ? el : el.querySelector('span');
+        if (span) return span.textContent;
+    }
+}
+for (const span of document.querySelectorAll("span[style*='color:red'], span[style*='color: red']")) {
+    const text = span.textContent.trim();
+    if (/^\\d+$/.test(text)) return text;
+}
+return null;
+"""
+
+# Login-Formular (Action + versteckte Felder wie CSRF-Tokens)
+_FORM_RE = re.compile(r'<form\b([^>]*)>(.*?)</form>', re.S | re.I)
+_ACTION_RE = re.compile(r'action="([^"]*)"', re.I)
+_INPUT_RE = re.compile(r'<input\b[^>]*>', re.I)
+_ATTR_RE = re.compile(r'(\w+)="([^"]*)"')
+
+# Zeitangaben der Seite ("DD.MM.YYYY HH:MM Uhr/Clock") - vorkompiliert statt strptime, Reihenfolge der Gruppen: Jahr, Monat, Tag
+_DATETIME_SUFFIX_RE = re.compile(r'\s+(?:Uhr|Clock)\b')
+DATETIME_PATTERNS = (
+    (re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4}) (\d{1,2}):(\d{2})(?::(\d{2}))?$'), (3, 2, 1)),  # DD.MM.YYYY HH:MM[:SS]
+    (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{2})(?::(\d{2}))?$'), (1, 2, 3)),    # YYYY-MM-DD HH:MM[:SS]
+)
+
+
+# Zustand nach dem Vote in einem Round-Trip: [Coins-Text, Text der Status-Zelle in Zeile arguments[0]]
+VOTE_STATE_JS = "const coins = (function () {" + COINS_JS + "})();" + """
+const cell = document.querySelector('table.table tbody tr:nth-of-type(' + arguments[0] + ') td:nth-of-type(2)');
+return [coins, cell ? cell.innerText : null];
+"""
+
+
+def html_to_text(fragment):
+    """HTML-Fragment in Text umwandeln (Zeilenumbrüche bei <br>, Tags entfernt)"""
+    text = _BR_RE.sub('\n', fragment)
+    text = html.unescape(_TAG_RE.sub('', text))
+    lines = [' '.join(line.split()) for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_vote_rows(page_html):
+    """Alle Zeilen der Vote-Tabelle (table.table tbody tr) als VoteRow - ein Regex-Durchlauf"""
+    table = _TABLE_RE.search(page_html)
+    if not table:
+        return []
+
+    body = _TBODY_RE.search(table.group(1))
+    rows = []
+    for index, match in enumerate(_ROW_RE.finditer(body.group(1) if body else table.group(1))):
+        first_cell, second_cell = match.groups()
+        if second_cell is None:
+            continue
+
+        link = _LINK_RE.search(first_cell)
+        if not link:
+            continue
+
+        cell_text = html_to_text(second_cell)
+        next_vote = _NEXT_VOTE_RE.search(cell_text)
+        rows.append(VoteRow(
+            index=index,
+            site=html_to_text(link.group(2)),
+            url=html.unescape(link.group(1)),
+            cell_text=cell_text,
+            next_vote_text=next_vote.group(1).strip() if next_vote else None,
+        ))
+    return rows
+
+
+def parse_coins(page_html):
+    """Vote-Coins aus dem Span hinter "Current Vote-Coins:" oder None"""
+    match = _COINS_RE.search(page_html)
+    if not match:
+        return None
+    digits = ''.join(filter(str.isdigit, match.group(1)))
+    return int(digits) if digits else None
+
+
+def parse_red_span_coins(page_html):
+    """Erster rein numerischer rot formatierter Span oder None"""
+    match = _RED_SPAN_RE.search(page_html)
+    return int(match.group(1)) if match else None
+
+
+def parse_coins_text(page_text):
+    """Letzter Ausweg: erste mind. zweistellige Zahl hinter "Current Vote-Coins:" im Seitentext
+
+    Gesucht wird zuerst im Rest der Zeile, dann in den beiden folgenden Zeilen und erst
+    zuletzt in der Zeile davor - andere Zähler davor (z.B. Dragon-Coins) werden so übergangen.
+    """
+    if "Current Vote-Coins:" not in page_text:
+        return None
+    lines = page_text.split('\n')
+    for i, line in enumerate(lines):
+        if "Current Vote-Coins:" not in line:
+            continue
+        candidates = [line.split("Current Vote-Coins:", 1)[1]] + lines[i + 1:i + 3] + lines[max(0, i - 1):i]
+        for candidate in candidates:
+            for word in candidate.split():
+                cleaned_word = ''.join(filter(str.isdigit, word))
+                if cleaned_word and len(cleaned_word) >= 2:
+                    return int(cleaned_word)
+    return None
+
+
+def parse_login_form(page_html):
+    """Action und versteckte Felder des Login-Formulars (mit Feld "user")"""
+    for attributes, body in _FORM_RE.findall(page_html):
+        if 'name="user"' not in body:
+            continue
+
+        action = _ACTION_RE.search(attributes)
+        hidden = {}
+        for tag in _INPUT_RE.findall(body):
+            attrs = dict(_ATTR_RE.findall(tag))
+            if attrs.get('type', '').lower() == 'hidden' and 'name' in attrs:
+                hidden[attrs['name']] = html.unescape(attrs.get('value', ''))
+        return (html.unescape(action.group(1)) if action else None), hidden
+    return None, {}
+
+
+class DateTimeParser:
+    """Parst Zeitangaben der Seite in einer festen Zeitzone und merkt sich das zuletzt passende Format"""
+
+    def __init__(self, tz, patterns=DATETIME_PATTERNS):
+        self.tz = tz
+        self.patterns = list(patterns)
+        self._offsets = {}
+
+    def _localize(self, naive):
+        # UTC-Offset pro Stunde cachen - pytz.localize ist der teuerste Teil
+        key = naive.replace(minute=0, second=0)
+        tzinfo = self._offsets.get(key)
+        if tzinfo is None:
+            tzinfo = self.tz.localize(key).tzinfo
+            if len(self._offsets) > 1024:
+                self._offsets.clear()
+            self._offsets[key] = tzinfo
+        return naive.replace(tzinfo=tzinfo)
+
+    def parse(self, date_str):
+        """Aware datetime oder None"""
+        date_str = _DATETIME_SUFFIX_RE.sub('', date_str.strip()).strip()
+
+        for i, (pattern, (year, month, day)) in enumerate(self.patterns):
+            match = pattern.match(date_str)
+            if not match:
+                continue
+            try:
+                parsed = datetime(int(match.group(year)), int(match.group(month)), int(match.group(day)),
+                                  int(match.group(4)), int(match.group(5)), int(match.group(6) or 0))
+            except ValueError:
+                return None
+
+            # Erfolgreiches Format nach vorne - die Seite nutzt praktisch immer dasselbe
+            if i:
+                self.patterns.insert(0, self.patterns.pop(i))
+            return self._localize(parsed)
+        return None
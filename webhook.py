@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import queue
+import threading
+import logging
+
+# Ergebnis eines Zustellversuchs
+DELIVERED = 'delivered'
+RETRYABLE = 'retryable'   # 429, 5xx, Netzwerkfehler - in den Spool
+REJECTED = 'rejected'     # übrige 4xx - erneutes Senden ändert nichts, Dead-Letter-Datei
+
+
+class WebhookNotifier:
+    """Versendet Discord-Embeds im Hintergrund: gebündelt, über eine Keep-Alive-Session, mit 429-Handling und Retry-Spool"""
+
+    # Discord erlaubt maximal 10 Embeds pro Nachricht
+    MAX_EMBEDS = 10
+
+    def __init__(self, url, queue_size=1000, spool_path=os.path.join('data', 'webhook_spool.jsonl'),
+                 batch_wait=1.0, timeout=10, max_retries=5, spool_retry_interval=300,
+                 dead_letter_path=os.path.join('data', 'webhook_dead.jsonl'), metrics=None):
+        self.url = url
+        self.spool_path = spool_path
+        self.dead_letter_path = dead_letter_path
+        # Dauer jeder Zustellung (inkl. Retries und Rate-Limit-Wartezeit) als Phase 'webhook_send'
+        self.metrics = metrics
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.spool_retry_interval = spool_retry_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        # requests erst beim ersten Versand importieren (Kaltstart)
+        self._session = None
+        self._spool_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_spool_retry = 0
+
+        # Metriken
+        self.sent = 0
+        self.batches = 0
+        self.rate_limited = 0
+        self.spooled = 0
+        self.dead_lettered = 0
+        self.latencies = []
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='webhook-notifier', daemon=True)
+            self._thread.start()
+
+    def send(self, embed):
+        """Embed einreihen - blockiert nie; bei voller Queue direkt in den Spool"""
+        try:
+            self._queue.put_nowait((embed, time.monotonic()))
+        except queue.Full:
+            logging.warning("📨 Webhook-Queue voll - Embed wird im Spool abgelegt")
+            self._spool([embed])
+
+    def _next_batch(self):
+        """Bis zu MAX_EMBEDS Embeds sammeln, dabei max. batch_wait Sekunden auf weitere warten"""
+        try:
+            first = self._queue.get(timeout=1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.MAX_EMBEDS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            if time.monotonic() - self._last_spool_retry >= self.spool_retry_interval:
+                self._last_spool_retry = time.monotonic()
+                self._retry_spool()
+
+            batch = self._next_batch()
+            if not batch:
+                continue
+
+            embeds = [embed for embed, _ in batch]
+            start = time.monotonic()
+            try:
+                result, status = self._deliver(embeds)
+            except Exception as e:
+                logging.error(f"Fehler beim Senden der Discord Webhook: {e}")
+                result, status = RETRYABLE, None
+            if self.metrics is not None:
+                self.metrics.observe('webhook_send', time.monotonic() - start)
+
+            if result == DELIVERED:
+                now = time.monotonic()
+                self.latencies.extend(now - enqueued_at for _, enqueued_at in batch)
+                if len(self.latencies) > 1000:
+                    del self.latencies[:-1000]
+            elif result == REJECTED:
+                self._dead_letter(embeds, status)
+            else:
+                self._spool(embeds)
+
+            for _ in batch:
+                self._queue.task_done()
+
+    def _deliver(self, embeds):
+        """Eine Nachricht mit bis zu 10 Embeds senden - (DELIVERED/RETRYABLE/REJECTED, letzter HTTP-Status)"""
+        import requests
+        if self._session is None:
+            self._session = requests.Session()
+        attempt = 0
+        rate_limit_waits = 0
+        while attempt <= self.max_retries and rate_limit_waits <= 3 * self.max_retries:
+            try:
+                response = self._session.post(self.url, json={'embeds': embeds}, timeout=self.timeout)
+            except requests.RequestException as e:
+                logging.warning(f"Discord Webhook Fehler: {e}")
+                response = None
+
+            if response is not None and response.status_code in (200, 204):
+                self.sent += len(embeds)
+                self.batches += 1
+                logging.info(f"Discord Webhook erfolgreich gesendet ({len(embeds)} Embed(s))")
+                return DELIVERED, response.status_code
+
+            if response is not None and response.status_code == 429:
+                # Rate-Limit: Discord nennt die Wartezeit - zählt nicht als Fehlversuch
+                self.rate_limited += 1
+                rate_limit_waits += 1
+                retry_after = self._retry_after(response)
+                logging.warning(f"Discord Webhook Rate-Limit - warte {retry_after:.2f}s")
+                time.sleep(retry_after)
+                continue
+
+            if response is not None:
+                logging.warning(f"Discord Webhook Fehler: Status {response.status_code}")
+                if 400 <= response.status_code < 500:
+                    return REJECTED, response.status_code
+
+            attempt += 1
+            time.sleep(min(2 ** attempt, 30))
+        return RETRYABLE, response.status_code if response is not None else None
+
+    def _retry_after(self, response):
+        try:
+            return float(response.json().get('retry_after', 1))
+        except ValueError:
+            return float(response.headers.get('Retry-After', 1))
+
+    def _spool(self, embeds):
+        """Nicht zustellbare Embeds auf Platte ablegen"""
+        with self._spool_lock:
+            directory = os.path.dirname(self.spool_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.spool_path, 'a') as f:
+                f.write(json.dumps({'failed_at': time.time(), 'embeds': embeds}) + '\n')
+            self.spooled += len(embeds)
+        logging.warning(f"📨 {len(embeds)} Embed(s) im Webhook-Spool abgelegt")
+
+    def _dead_letter(self, embeds, status):
+        """Von Discord abgelehnte Embeds (4xx außer 429) zur Analyse ablegen - werden nicht erneut gesendet"""
+        with self._spool_lock:
+            directory = os.path.dirname(self.dead_letter_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.dead_letter_path, 'a') as f:
+                f.write(json.dumps({'failed_at': time.time(), 'status': status, 'embeds': embeds}) + '\n')
+            self.dead_lettered += len(embeds)
+        logging.error(f"📨 {len(embeds)} Embed(s) von Discord abgelehnt (Status {status}) - in '{self.dead_letter_path}' abgelegt")
+
+    def _retry_spool(self):
+        """Embeds aus dem Spool erneut zustellen - die Datei bleibt liegen, bis jeder Batch zugestellt ist
+
+        Der Spool wird zuerst nach replay_path umbenannt; neue Fehlschläge (auch von send() bei voller Queue)
+        landen dadurch in einer frischen Spool-Datei und werden erst nach den älteren Embeds gesendet.
+        Nach jedem zugestellten Batch wird replay_path mit dem Rest überschrieben - bei Absturz oder stop()
+        geht nichts verloren, höchstens der gerade laufende Batch wird ein zweites Mal gesendet.
+        """
+        while True:
+            with self._spool_lock:
+                if not os.path.exists(self.replay_path):
+                    if not os.path.exists(self.spool_path):
+                        return
+                    os.replace(self.spool_path, self.replay_path)
+            embeds = self._read_spool(self.replay_path)
+            if embeds:
+                logging.info(f"📨 {len(embeds)} Embed(s) aus dem Webhook-Spool werden erneut gesendet")
+
+            while embeds:
+                batch = embeds[:self.MAX_EMBEDS]
+                try:
+                    result, status = self._deliver(batch)
+                except Exception as e:
+                    logging.error(f"Fehler beim Senden der Discord Webhook: {e}")
+                    result, status = RETRYABLE, None
+                if result == RETRYABLE:
+                    logging.warning(f"📨 Discord weiterhin nicht erreichbar - {len(embeds)} Embed(s) bleiben im Spool")
+                    return
+                if result == REJECTED:
+                    self._dead_letter(batch, status)
+                embeds = embeds[self.MAX_EMBEDS:]
+                self._write_replay(embeds)
+            self._write_replay([])
+
+    @property
+    def replay_path(self):
+        return self.spool_path + '.replay'
+
+    def _read_spool(self, path):
+        embeds = []
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    embeds.extend(json.loads(line)['embeds'])
+                except (ValueError, KeyError):
+                    # Abgerissene letzte Zeile nach Absturz
+                    continue
+        return embeds
+
+    def _write_replay(self, embeds):
+        """Rest des laufenden Replays atomar ablegen - leer: Replay abgeschlossen"""
+        if not embeds:
+            if os.path.exists(self.replay_path):
+                os.remove(self.replay_path)
+            return
+        tmp_path = self.replay_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'failed_at': time.time(), 'embeds': embeds}) + '\n')
+        os.replace(tmp_path, self.replay_path)
+
+    def flush(self, timeout=30):
+        """Warten bis die Queue abgearbeitet ist"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def stop(self, timeout=30):
+        """Restliche Embeds senden und Hintergrund-Thread beenden"""
+        self.flush(timeout)
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._session is not None:
+            self._session.close()
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            'queue_depth': self._queue.qsize(),
+            'sent': self.sent,
+            'batches': self.batches,
+            'rate_limited': self.rate_limited,
+            'spooled': self.spooled,
+            'dead_lettered': self.dead_lettered,
+            'latency_avg_seconds': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p95_seconds': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+        }